@@ -724,28 +724,40 @@ class ColorMappedByFuncScene(Scene):
             self.input_to_pos_func = lambda p : p
             self.pos_to_color_func = self.func
 
-        self.pixel_pos_to_color_func = lambda (x, y) : self.pos_to_color_func(
-            self.num_plane.point_to_coords_cheap(np.array([x, y, 0]))
+        # These close over the plane and functions rather than over self,
+        # so that the camera can fingerprint them
+        num_plane = self.num_plane
+        pos_to_color_func = self.pos_to_color_func
+        pixel_pos_to_color_func = lambda (x, y) : pos_to_color_func(
+            num_plane.point_to_coords_cheap(np.array([x, y, 0]))
+        )
+        self.pixel_pos_to_color_func = pixel_pos_to_color_func
+        self.background_func = lambda (x, y): point_to_rgba(
+            pixel_pos_to_color_func((x, y))
         )
 
         jitter_val = 0.1
         line_coords = np.linspace(-10, 10) + jitter_val
-        func_hash_points = it.product(line_coords, line_coords)
-        def mini_hasher(p):
-            rgba = point_to_rgba(self.pixel_pos_to_color_func(p))
+        for p in it.product(line_coords, line_coords):
+            rgba = self.background_func(p)
             if rgba[3] != 1.0:
                 print "Warning! point_to_rgba assigns fractional alpha", rgba[3]
-            return tuple(rgba)
-        to_hash = tuple(mini_hasher(p) for p in func_hash_points)
-        func_hash = hash(to_hash)
-        # We hash just based on output image
-        # Thus, multiple scenes with same output image can re-use it
+
+        # We hash the function giving the background, together with the camera
+        # Thus, multiple scenes coloring by the same function can re-use it
         # without recomputation
-        full_hash = hash((func_hash, self.camera.pixel_shape))
-        self.background_image_file = self.short_path_to_long_path(
-            "color_mapped_bg_hash_" + str(full_hash) + ".png"
-        )
-        self.in_background_pass = not os.path.exists(self.background_image_file)
+        full_hash = self.camera.get_background_func_key(self.background_func)
+        if full_hash is None:
+            # The function cannot be fingerprinted, so it is recomputed every time
+            self.background_image_file = self.short_path_to_long_path(
+                "color_mapped_bg_" + self.name + ".png"
+            )
+            self.in_background_pass = True
+        else:
+            self.background_image_file = self.short_path_to_long_path(
+                "color_mapped_bg_hash_" + full_hash + ".png"
+            )
+            self.in_background_pass = not os.path.exists(self.background_image_file)
 
         print "Background file: " + self.background_image_file
         if self.in_background_pass:
@@ -755,13 +767,7 @@ class ColorMappedByFuncScene(Scene):
 
     def construct(self):
         if self.in_background_pass:
-            self.camera.set_background_from_func(
-                lambda (x, y): point_to_rgba(
-                    self.pixel_pos_to_color_func(
-                        (x, y)
-                    )
-                )
-            )
+            self.camera.set_background_from_func(self.background_func)
             self.save_image(self.background_image_file, mode = "RGBA")
 
         if self.hide_background:
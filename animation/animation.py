@@ -22,21 +22,46 @@ class Animation(object):
         #one_at_a_time, all_at_once
         "submobject_mode" : "all_at_once",
         "lag_factor" : 2,
+        #Set by LaggedStart to the number of families in each of a
+        #sequence of groups, which then play one after the other,
+        #each starting lag_ratio of the run time after the previous
+        "lag_group_sizes" : None,
+        "lag_ratio" : 0.5,
         # Used by EmptyAnimation to announce itself ignorable
         # in Successions and AnimationGroups
         "empty" : False
     }
+    #Whether animating a group amounts to animating each of its
+    #submobjects on its own, in which case LaggedStart runs a single
+    #animation over the whole group rather than one per submobject
+    animates_submobjects_separately = False
     def __init__(self, mobject, **kwargs):
         mobject = instantiate(mobject)
         assert(isinstance(mobject, Mobject))
         digest_config(self, kwargs, locals())
-        self.starting_mobject = self.mobject.copy()
         if self.rate_func is None:
             self.rate_func = (lambda x : x)
         if self.name is None:
             self.name = self.__class__.__name__ + str(self.mobject)
+        self.has_begun = False
+
+    def begin(self):
+        """
+        Captures the starting state of the animation and sets it to
+        its start.  Scene.play calls this right before the animation
+        plays, and update does if nothing has yet, so that building
+        an animation costs nothing until it is needed.  Anything
+        calling update_mobject directly should call begin first.
+        """
+        if not self.has_begun:
+            self.has_begun = True
+            self.init_starting_state()
+            self.update(0)
+        return self
+
+    def init_starting_state(self):
+        self.starting_mobject = self.mobject.copy()
         self.all_families_zipped = self.get_all_families_zipped()
-        self.update(0)
 
     def update_config(self, **kwargs):
         digest_config(self, kwargs)
@@ -51,13 +76,24 @@ class Animation(object):
         return deepcopy(self)
 
     def update(self, alpha):
+        self.begin()
         alpha = np.clip(alpha, 0, 1)
-        self.update_mobject(self.rate_func(alpha))
+        if self.lag_group_sizes is None:
+            self.update_mobject(self.rate_func(alpha))
+        else:
+            self.update_submobjects(self.get_lag_group_sub_alphas(alpha))
 
     def update_mobject(self, alpha):
-        families = self.all_families_zipped
-        for i, mobs in enumerate(families):
-            sub_alpha = self.get_sub_alpha(alpha, i, len(families))
+        num_families = len(self.all_families_zipped)
+        self.update_submobjects(self.get_sub_alphas(alpha, num_families))
+        return self
+
+    def update_submobjects(self, sub_alphas):
+        """
+        Updates each family in all_families_zipped to
+        the corresponding alpha in sub_alphas.
+        """
+        for mobs, sub_alpha in zip(self.all_families_zipped, sub_alphas):
             self.update_submobject(*list(mobs) + [sub_alpha])
         return self
 
@@ -78,20 +114,57 @@ class Animation(object):
         ))
 
     def get_sub_alpha(self, alpha, index, num_submobjects):
-        if self.submobject_mode in ["lagged_start", "smoothed_lagged_start"]:
-            prop = float(index)/num_submobjects
-            if self.submobject_mode is "smoothed_lagged_start":
-                prop = smooth(prop)
+        return self.get_lagged_alphas(alpha, index, num_submobjects)
+
+    def get_sub_alphas(self, alpha, num_submobjects):
+        return self.get_lagged_alphas(
+            alpha, np.arange(num_submobjects), num_submobjects
+        )
+
+    def get_lagged_alphas(self, alphas, indices, num_submobjects):
+        """
+        Alphas of the submobjects at indices, out of num_submobjects,
+        according to submobject_mode when the whole animation is at
+        alphas.  Each argument is either one value or an array.
+        """
+        mode = self.submobject_mode
+        if mode in ["lagged_start", "smoothed_lagged_start"]:
+            props = np.true_divide(indices, num_submobjects)
+            if mode == "smoothed_lagged_start":
+                props = smooth(props)
             lf = self.lag_factor
-            return np.clip(lf*alpha - (lf-1)*prop, 0, 1)
-        elif self.submobject_mode == "one_at_a_time":
-            lower = float(index)/num_submobjects
-            upper = float(index+1)/num_submobjects
-            return np.clip((alpha-lower)/(upper-lower), 0, 1)
-        elif self.submobject_mode == "all_at_once":
-            return alpha
+            return np.clip(lf*alphas - (lf-1)*props, 0, 1)
+        elif mode == "one_at_a_time":
+            lower = np.true_divide(indices, num_submobjects)
+            upper = np.true_divide(np.add(indices, 1), num_submobjects)
+            return np.clip((alphas-lower)/(upper-lower), 0, 1)
+        elif mode == "all_at_once":
+            return alphas + np.zeros(np.shape(indices))
         raise Exception("Invalid submobject mode")
 
+    def get_lag_group_sub_alphas(self, alpha):
+        """
+        Alphas of all families, with each group of lag_group_sizes
+        going through rate_func over its own interval, exactly as
+        squish_rate_func would, and submobject_mode applying within
+        each group.
+        """
+        sizes = self.lag_group_sizes
+        lower = np.linspace(0, 1-self.lag_ratio, len(sizes))
+        upper = lower + self.lag_ratio
+        with np.errstate(divide = "ignore", invalid = "ignore"):
+            ts = (alpha - lower)/(upper - lower)
+        ts = np.where(alpha < lower, 0, np.where(alpha > upper, 1, ts))
+        #Groups not started yet, or already done, share their value
+        unique_ts, inverse = np.unique(ts, return_inverse = True)
+        rates = np.array(map(self.rate_func, unique_ts), dtype = 'float')
+        group_alphas = np.where(lower == upper, lower, rates[inverse])
+        return self.get_lagged_alphas(
+            np.repeat(group_alphas, sizes),
+            np.concatenate(map(np.arange, sizes)),
+            np.repeat(sizes, sizes),
+        )
+
     def filter_out(self, *filter_functions):
         self.filter_functions += filter_functions
         return self
@@ -11,6 +11,15 @@ from animation import Animation
 from transform import Transform
 
 class LaggedStart(Animation):
+    """
+    Plays AnimationClass on each submobject of mobject, each one
+    starting lag_ratio of the run time after the previous one.
+
+    When AnimationClass animates submobjects separately, and no
+    arg_creator is given, this is done with a single animation of
+    the whole mobject, which staggers its families by submobject
+    through lag_group_sizes, rather than one animation for each.
+    """
     CONFIG = {
         "run_time" : 2,
         "lag_ratio" : 0.5,
@@ -20,32 +29,89 @@ class LaggedStart(Animation):
         for key in "rate_func", "run_time", "lag_ratio":
             if key in kwargs:
                 kwargs.pop(key)
-        if arg_creator is None:
-            arg_creator = lambda mobject : (mobject,)
-        self.subanimations = [
-            AnimationClass(
-                *arg_creator(submob),
+        self.subanimations = []
+        self.group_animation = None
+        if arg_creator is None and self.can_animate_as_group(AnimationClass, mobject):
+            self.group_animation = AnimationClass(
+                mobject,
                 run_time = self.run_time,
-                rate_func = squish_rate_func(
-                    self.rate_func, beta, beta + self.lag_ratio
-                ),
+                rate_func = self.rate_func,
+                lag_ratio = self.lag_ratio,
+                lag_group_sizes = [
+                    len(submob.family_members_with_points())
+                    for submob in mobject
+                ],
                 **kwargs
             )
-            for submob, beta in zip(
-                mobject, 
-                np.linspace(0, 1-self.lag_ratio, len(mobject))
-            )
-        ]
+        else:
+            if arg_creator is None:
+                arg_creator = lambda mobject : (mobject,)
+            self.subanimations = [
+                AnimationClass(
+                    *arg_creator(submob),
+                    run_time = self.run_time,
+                    rate_func = squish_rate_func(
+                        self.rate_func, beta, beta + self.lag_ratio
+                    ),
+                    **kwargs
+                )
+                for submob, beta in zip(
+                    mobject, 
+                    np.linspace(0, 1-self.lag_ratio, len(mobject))
+                )
+            ]
         Animation.__init__(self, mobject, **kwargs)
 
+    def can_animate_as_group(self, AnimationClass, mobject):
+        """
+        Besides AnimationClass animating submobjects separately, the
+        families of the submobjects must make up that of mobject,
+        and the submobjects must all be VMobjects exactly when mobject
+        is, as animations may treat those differently.
+        """
+        if not AnimationClass.animates_submobjects_separately:
+            return False
+        submobjects = list(mobject)
+        if len(submobjects) == 0:
+            return False
+        is_vmobject = isinstance(mobject, VMobject)
+        if any([isinstance(sm, VMobject) != is_vmobject for sm in submobjects]):
+            return False
+        group_members = sum([
+            sm.family_members_with_points()
+            for sm in submobjects
+        ], [])
+        return group_members == mobject.family_members_with_points()
+
+    def init_starting_state(self):
+        #The mobject itself is never interpolated, so needs no copy
+        if self.group_animation is not None:
+            self.group_animation.begin()
+        for anim in self.subanimations:
+            anim.begin()
+
     def update(self, alpha):
+        self.begin()
+        if self.group_animation is not None:
+            self.group_animation.update(alpha)
         for anim in self.subanimations:
             anim.update(alpha)
         return self
 
-    def clean_up(self, *args, **kwargs):
-        for anim in self.subanimations:
-            anim.clean_up(*args, **kwargs)
+    def clean_up(self, surrounding_scene = None):
+        if self.group_animation is None:
+            for anim in self.subanimations:
+                anim.clean_up(surrounding_scene)
+            return self
+        #As the animations of each submobject would have
+        self.group_animation.clean_up()
+        if surrounding_scene is not None:
+            for submob in self.mobject:
+                if self.group_animation.is_remover():
+                    surrounding_scene.remove(submob)
+                else:
+                    surrounding_scene.add(submob)
+        return self
 
 class Succession(Animation):
     CONFIG = {
@@ -97,8 +163,6 @@ class Succession(Animation):
             else:
                 state["curr_class_args"].append(arg)
         invoke_curr_class(state)
-        for anim in animations:
-            anim.update(0)
 
         animations = filter (lambda x : not(x.empty), animations)
 
@@ -138,6 +202,10 @@ class Succession(Animation):
 
         Animation.__init__(self, self.mobject, run_time = run_time, **kwargs)
 
+    def init_starting_state(self):
+        #Subanimations have all been updated, and so begun, above
+        pass
+
     # Beware: This does NOT take care of calling update(0) on the subanimation.
     # This was important to avoid a pernicious possibility in which subanimations were called
     # with update twice, which could in turn call a sub-Succession with update four times,
@@ -212,7 +280,12 @@ class AnimationGroup(Animation):
         everything = Mobject(*[a.mobject for a in sub_anims])
         Animation.__init__(self, everything, **kwargs)
 
+    def init_starting_state(self):
+        for anim in self.sub_anims:
+            anim.begin()
+
     def update(self, alpha):
+        self.begin()
         for anim in self.sub_anims:
             anim.update(alpha * self.run_time / anim.run_time)
 
@@ -50,6 +50,7 @@ class ShowCreation(ShowPartial):
     CONFIG = {
         "submobject_mode" : "one_at_a_time",
     }
+    animates_submobjects_separately = True
     def get_bounds(self, alpha):
         return (0, alpha)
 
@@ -64,6 +65,8 @@ class Write(ShowCreation):
         "rate_func" : None,
         "submobject_mode" : "lagged_start",
     }
+    #Its run time and lag factor depend on the whole mobject
+    animates_submobjects_separately = False
     def __init__(self, mob_or_text, **kwargs):
         digest_config(self, kwargs)        
         if isinstance(mob_or_text, str):
@@ -132,6 +135,7 @@ class ShowPassingFlash(ShowPartial):
         "time_width" : 0.1,
         "remover" : True,
     }
+    animates_submobjects_separately = True
     def get_bounds(self, alpha):
         alpha *= (1+self.time_width)
         alpha -= self.time_width/2.0
@@ -278,7 +282,7 @@ class WiggleOutThenIn(Animation):
         Animation.__init__(self, mobject, **kwargs)
 
     def update_submobject(self, submobject, starting_sumobject, alpha):
-        submobject.points[:,:] = starting_sumobject.points
+        submobject.points = np.array(starting_sumobject.points)
         submobject.scale(
             interpolate(1, self.scale_value, there_and_back(alpha)),
             about_point = self.scale_about_point
@@ -301,6 +305,10 @@ class ApplyToCenters(Animation):
         Animation.__init__(self, Mobject(*mobjects), **full_kwargs)
         self.name = str(self) + AnimationClass.__name__
 
+    def init_starting_state(self):
+        self.centers_container.begin()
+        Animation.init_starting_state(self)
+
     def update_mobject(self, alpha):
         self.centers_container.update_mobject(alpha)
         center_mobs = self.centers_container.mobject.split()
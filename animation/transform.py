@@ -22,14 +22,23 @@ class Transform(Animation):
         #Copy target_mobject so as to not mess with caller
         self.original_target_mobject = target_mobject
         target_mobject = target_mobject.copy()
-        mobject.align_data(target_mobject)
         self.target_mobject = target_mobject
         digest_config(self, kwargs)
         self.init_path_func()
+        self.interpolation_plan = None
 
         Animation.__init__(self, mobject, **kwargs)
         self.name += "To" + str(target_mobject)  
 
+    def init_starting_state(self):
+        is_packed = self.mobject.get_packed_family_points() is not None
+        self.mobject.align_data(self.target_mobject)
+        if is_packed:
+            #Alignment reassigns points, so pack both anew
+            self.mobject.pack_family_points()
+            self.target_mobject.pack_family_points()
+        Animation.init_starting_state(self)
+
     def update_config(self, **kwargs):
         Animation.update_config(self, **kwargs)
         if "path_arc" in kwargs:
@@ -52,6 +61,42 @@ class Transform(Animation):
     def get_all_mobjects(self):
         return self.mobject, self.starting_mobject, self.target_mobject
 
+    def update_mobject(self, alpha):
+        plan = self.get_interpolation_plan()
+        if plan is not None and self.submobject_mode == "all_at_once":
+            #A single alpha suits any path_func
+            plan.interpolate(alpha, self.path_func)
+        else:
+            Animation.update_mobject(self, alpha)
+        return self
+
+    def update_submobjects(self, sub_alphas):
+        plan = None
+        if self.path_func == straight_path:
+            #Only a straight path takes one alpha per point
+            plan = self.get_interpolation_plan()
+        if plan is None:
+            Animation.update_submobjects(self, sub_alphas)
+        else:
+            plan.interpolate(np.array(sub_alphas), self.path_func)
+        return self
+
+    def get_interpolation_plan(self):
+        """
+        Returns the InterpolationPlan for the family, compiled anew
+        whenever the starting or target family has changed, or None
+        if the family can not be interpolated in a batch.
+        """
+        if self.__class__.update_submobject != Transform.update_submobject:
+            return None
+        plan = self.interpolation_plan
+        if plan is None or not plan.is_valid():
+            plan = InterpolationPlan(self.mobject, self.all_families_zipped)
+            self.interpolation_plan = plan
+        if not plan.is_applicable:
+            return None
+        return plan
+
     def update_submobject(self, submob, start, end, alpha):
         submob.interpolate(start, end, alpha, self.path_func)
         return self
@@ -63,6 +108,127 @@ class Transform(Animation):
             if not self.remover:
                 surrounding_scene.add(self.original_target_mobject)
 
+class InterpolationPlan(object):
+    """
+    What Transform needs to interpolate a whole family with a few
+    array operations per frame rather than a few calls per submobject:
+    the points of the starting and target families, stacked in the
+    layout of the mobject's packed points, and the style attributes of
+    its VMobjects, stacked attribute by attribute.  Results are written
+    into the packed points, and handed to each VMobject as views into
+    the interpolated styles.  A plan stays valid for as long as the
+    starting and target families keep their points and style versions.
+    """
+    def __init__(self, mobject, families_zipped):
+        self.mobject = mobject
+        self.is_applicable = False
+        if len(families_zipped) == 0:
+            return
+        members, starts, ends = map(list, zip(*families_zipped))
+        self.sources = starts + ends
+        self.source_versions = self.get_source_versions()
+        if mobject.family_members_with_points() != members:
+            return
+        for member, start, end in families_zipped:
+            if member.__class__.interpolate != Mobject.interpolate:
+                return
+            if not len(member.points) == len(start.points) == len(end.points):
+                return
+        if mobject.get_packed_family_point_counts() is None:
+            mobject.pack_family_points()
+        self.points = mobject.get_packed_family_points()
+        self.point_counts = mobject.get_packed_family_point_counts()
+        self.start_points = np.concatenate([start.points for start in starts])
+        self.end_points = np.concatenate([end.points for end in ends])
+        if not self.init_styles(families_zipped):
+            return
+        self.is_applicable = True
+
+    def init_styles(self, families_zipped):
+        """
+        Splits the family into VMobjects, whose styles are interpolated
+        together, and other mobjects with their own interpolate_color.
+        Returns False if the styles can not be stacked.
+        """
+        self.vmobject_indices = []
+        self.other_indices = []
+        for index, (member, start, end) in enumerate(families_zipped):
+            if member.__class__.interpolate_color == Mobject.interpolate_color:
+                continue
+            is_vmobject = all([
+                isinstance(mob, VMobject)
+                for mob in (member, start, end)
+            ])
+            if is_vmobject and \
+            member.__class__.interpolate_color == VMobject.interpolate_color:
+                self.vmobject_indices.append(index)
+            else:
+                self.other_indices.append(index)
+        self.families_zipped = families_zipped
+        self.style_attrs = []
+        if len(self.vmobject_indices) > 0:
+            first_vmobject = families_zipped[self.vmobject_indices[0]][0]
+            self.style_attrs = first_vmobject.get_style_attrs()
+        self.style_arrays = []
+        for attr in self.style_attrs:
+            start_values, end_values = [
+                [getattr(family[index], attr) for index in self.vmobject_indices]
+                for family in zip(*families_zipped)[1:]
+            ]
+            shapes = set(map(np.shape, start_values + end_values))
+            if len(shapes) > 1:
+                return False
+            self.style_arrays.append((
+                np.array(start_values, dtype = 'float'),
+                np.array(end_values, dtype = 'float'),
+            ))
+        return True
+
+    def get_source_versions(self):
+        return [
+            (mob.points_version, mob.style_version)
+            for mob in self.sources
+        ]
+
+    def is_valid(self):
+        if self.get_source_versions() != self.source_versions:
+            return False
+        if self.is_applicable:
+            return self.mobject.get_packed_family_points() is self.points
+        return True
+
+    def interpolate(self, alphas, path_func):
+        """
+        alphas is either a single alpha for the whole family,
+        or an array of one alpha per member.
+        """
+        if np.ndim(alphas) == 0:
+            point_alphas = alphas
+            vmobject_alphas = alphas
+            alphas = [alphas]*len(self.families_zipped)
+        else:
+            point_alphas = np.repeat(alphas, self.point_counts)[:,np.newaxis]
+            vmobject_alphas = alphas[self.vmobject_indices]
+        self.points[:] = path_func(self.start_points, self.end_points, point_alphas)
+        self.mobject.mark_packed_points_changed()
+
+        columns = []
+        for start_values, end_values in self.style_arrays:
+            value_alphas = np.reshape(
+                vmobject_alphas,
+                np.shape(vmobject_alphas) + (1,)*(start_values.ndim - 1)
+            )
+            columns.append(list(interpolate(start_values, end_values, value_alphas)))
+        for index, values in zip(self.vmobject_indices, zip(*columns)):
+            member, start, end = self.families_zipped[index]
+            if alphas[index] == 1.0:
+                values = [getattr(end, attr) for attr in self.style_attrs]
+            member.set_style_attributes(zip(self.style_attrs, values))
+        for index in self.other_indices:
+            member, start, end = self.families_zipped[index]
+            member.interpolate_color(start, end, alphas[index])
+        return self
+
 class ReplacementTransform(Transform):
     CONFIG = {
         "replace_mobject_with_target_in_scene" : True,
@@ -165,6 +331,7 @@ class FadeOut(Transform):
     CONFIG = {
         "remover" : True, 
     }
+    animates_submobjects_separately = True
     def __init__(self, mobject, **kwargs):
         target = mobject.copy()
         target.fade(1)
@@ -175,9 +342,13 @@ class FadeOut(Transform):
         self.update(0)
 
 class FadeIn(Transform):
+    animates_submobjects_separately = True
     def __init__(self, mobject, **kwargs):
         target = mobject.copy()
         Transform.__init__(self, mobject, target, **kwargs)
+
+    def init_starting_state(self):
+        Transform.init_starting_state(self)
         self.starting_mobject.fade(1)
         if isinstance(self.starting_mobject, VMobject):
             self.starting_mobject.set_stroke(width = 0)
@@ -307,6 +478,7 @@ class TransformAnimations(Transform):
             self.run_time = max(start_anim.run_time, end_anim.run_time)
         for anim in start_anim, end_anim:
             anim.set_run_time(self.run_time)
+            anim.begin()
             
         if start_anim.starting_mobject.get_num_points() != end_anim.starting_mobject.get_num_points():
             start_anim.starting_mobject.align_data(end_anim.starting_mobject)
@@ -315,6 +487,7 @@ class TransformAnimations(Transform):
                     anim.starting_mobject.align_data(anim.target_mobject)
 
         Transform.__init__(self, start_anim.mobject, end_anim.mobject, **kwargs)
+        self.begin()
         #Rewire starting and ending mobjects
         start_anim.mobject = self.starting_mobject
         end_anim.mobject = self.target_mobject
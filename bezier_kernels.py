@@ -0,0 +1,118 @@
+"""
+Batched Bezier curve operations.  Curves are given as an array of
+control points of shape (num_curves, degree+1, dim), and all of them
+are evaluated, split or subdivided with a fixed number of numpy
+operations, rather than with a python loop over curves.
+"""
+
+import numpy as np
+
+#Caches for get_bernstein_matrix, keyed by degree and parameters
+BERNSTEIN_MATRICES = {}
+MAX_NUM_CACHED_BERNSTEIN_MATRICES = 256
+
+def get_binomial_coefficients(n):
+    result = np.ones(n+1)
+    for k in range(1, n+1):
+        result[k] = result[k-1]*(n-k+1)/k
+    return result
+
+def get_bernstein_weights(n, t):
+    """
+    Array of shape t.shape + (n+1,), whose last axis holds the
+    weights of the n+1 control points of a degree n Bezier curve
+    at each parameter t.
+    """
+    t = np.array(t, dtype = 'float')[..., np.newaxis]
+    k = np.arange(n+1)
+    return get_binomial_coefficients(n)*(t**k)*((1-t)**(n-k))
+
+def get_bernstein_matrix(n, ts):
+    """
+    Same as get_bernstein_weights for a 1d array of parameters,
+    but cached, as the same parameters tend to be used repeatedly.
+    """
+    ts = np.array(ts, dtype = 'float')
+    key = (n, ts.tostring())
+    if key not in BERNSTEIN_MATRICES:
+        if len(BERNSTEIN_MATRICES) >= MAX_NUM_CACHED_BERNSTEIN_MATRICES:
+            BERNSTEIN_MATRICES.clear()
+        BERNSTEIN_MATRICES[key] = get_bernstein_weights(n, ts)
+    return BERNSTEIN_MATRICES[key]
+
+def evaluate_beziers(control_points, ts):
+    """
+    Points on each curve of control_points, of shape
+    (num_curves, degree+1, dim), at parameters ts.  If ts is 1d
+    every curve is evaluated at all of them, otherwise ts has shape
+    (num_curves, num_ts) and gives parameters curve by curve.
+    Returns an array of shape (num_curves, num_ts, dim).
+    """
+    control_points = np.array(control_points, dtype = 'float')
+    n = control_points.shape[1] - 1
+    ts = np.array(ts, dtype = 'float')
+    if ts.ndim == 1:
+        weights = get_bernstein_matrix(n, ts)
+        return np.einsum('tk,ckd->ctd', weights, control_points)
+    weights = get_bernstein_weights(n, ts)
+    return np.einsum('ctk,ckd->ctd', weights, control_points)
+
+def blossom_beziers(control_points, params):
+    """
+    Blossom of each curve, evaluated at the degree many parameters
+    in params, each an array with one value per curve, by running
+    one de Casteljau step per parameter.
+    """
+    points = control_points
+    for t in params:
+        t = t[:, np.newaxis, np.newaxis]
+        points = (1-t)*points[:, :-1] + t*points[:, 1:]
+    return points[:, 0]
+
+def partial_beziers(control_points, a, b):
+    """
+    Control points of the portions of each curve between the
+    parameters a and b, which are either numbers, or arrays with
+    one value per curve.
+    """
+    control_points = np.array(control_points, dtype = 'float')
+    num_curves = control_points.shape[0]
+    n = control_points.shape[1] - 1
+    a = np.ones(num_curves)*a
+    b = np.ones(num_curves)*b
+    #The i-th control point of the portion is the blossom of
+    #the curve at (n-i) copies of a and i copies of b
+    return np.array([
+        blossom_beziers(control_points, [a]*(n-i) + [b]*i)
+        for i in range(n+1)
+    ]).transpose(1, 0, 2)
+
+def subdivide_beziers(control_points, num_pieces):
+    """
+    Splits each curve into num_pieces[i] portions over parameter
+    intervals of equal length, and returns the control points of
+    all portions, in order, as one array of shape
+    (sum(num_pieces), degree+1, dim).
+    """
+    num_pieces = np.array(num_pieces, dtype = 'int')
+    curve_indices = np.repeat(np.arange(len(num_pieces)), num_pieces)
+    #Index of each piece within its own curve
+    piece_starts = np.cumsum(num_pieces) - num_pieces
+    piece_indices = np.arange(len(curve_indices)) - piece_starts[curve_indices]
+    piece_counts = num_pieces[curve_indices].astype('float')
+    return partial_beziers(
+        np.array(control_points, dtype = 'float')[curve_indices],
+        piece_indices/piece_counts,
+        (piece_indices+1)/piece_counts,
+    )
+
+def get_cubic_control_points(points):
+    """
+    Reshapes the points of a path of cubic curves, each sharing its
+    first anchor with the previous curve's last, into an array of
+    shape (num_curves, 4, dim).
+    """
+    points = np.array(points)
+    num_curves = (len(points) - 1)/3
+    indices = 3*np.arange(num_curves)[:, np.newaxis] + np.arange(4)
+    return points[indices]
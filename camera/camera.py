@@ -1,15 +1,22 @@
 import numpy as np
 import itertools as it
+import multiprocessing as mp
+import weakref
 import os
 
 from PIL import Image
 from colour import Color
+from tqdm import tqdm as ProgressDisplay
 import aggdraw
 import copy
 
 from helpers import *
 from mobject import Mobject, PMobject, VMobject, \
     ImageMobject, Group
+from rasterizer import ArrayCanvas, MITER_LIMIT
+from compositing import AlphaCompositor
+from point_cloud import PointCloudRasterizer
+from image_sampling import *
 
 import time
 
@@ -39,6 +46,25 @@ class Camera(object):
         # z_buff_func is only used if the flag above is set to True.
         # round z coordinate to nearest hundredth when comparring
         "z_buff_func" : lambda m : np.round(m.get_center()[2], 2),
+        # Either "aggdraw", or "numpy" to rasterize vectorized
+        # mobjects from their point arrays directly.  The numpy
+        # rasterizer is not a speedup: it runs two to four times
+        # slower than aggdraw, most of all on frames full of small
+        # paths like TeX
+        "vectorized_rasterizer" : "aggdraw",
+        # How overlapping points of point cloud mobjects combine,
+        # either "overwrite", "alpha" or "additive"
+        "point_cloud_blend_mode" : "overwrite",
+        "sort_point_clouds_by_depth" : False,
+        # How image mobjects are resampled, either "nearest",
+        # "bilinear", or "mipmap" for bilinear sampling of a
+        # prefiltered copy of the image, which suits images
+        # drawn much smaller than their size
+        "image_sampling" : "nearest",
+        # Used by make_background_from_func
+        "background_func_cache_dir" : BACKGROUND_CACHE_DIR,
+        "background_func_rows_per_chunk" : 16,
+        "num_background_func_processes" : None, #Defaults to number of cpus
     }
 
     def __init__(self, background = None, **kwargs):
@@ -101,10 +127,7 @@ class Camera(object):
     def convert_pixel_array(self, pixel_array, convert_from_floats = False):
         retval = np.array(pixel_array)
         if convert_from_floats:
-            retval = np.apply_along_axis(
-                lambda f : (f * self.rgb_max_val).astype(self.pixel_array_dtype),
-                2,
-                retval)
+            retval = (retval * self.rgb_max_val).astype(self.pixel_array_dtype)
         return retval
 
     def set_pixel_array(self, pixel_array, convert_from_floats = False):
@@ -118,26 +141,135 @@ class Camera(object):
     def set_background(self, pixel_array, convert_from_floats = False):
         self.background = self.convert_pixel_array(pixel_array, convert_from_floats)
 
-    def make_background_from_func(self, coords_to_colors_func):
+    def make_background_from_func(
+        self, coords_to_colors_func, 
+        vectorized = False, 
+        use_cache = True
+        ):
         """
         Sets background by using coords_to_colors_func to determine each pixel's color. Each input 
         to coords_to_colors_func is an (x, y) pair in space (in ordinary space coordinates; not 
         pixel coordinates), and each output is expected to be an RGBA array of 4 floats.
+
+        If vectorized is True, coords_to_colors_func is instead called on whole
+        arrays of coordinates, of shape (..., 2), and should return an array of
+        shape (..., 4).  Otherwise it is called pixel by pixel, with the rows of
+        the image split among a pool of processes.
+
+        If use_cache is True, results are cached on disk, keyed by a fingerprint
+        of coords_to_colors_func, meaning its code, constants, defaults, closure
+        and the globals it reads, together with the shape and extent of the
+        camera's space.  Functions which cannot be fingerprinted are not cached.
         """
+        cache_file = None
+        if use_cache:
+            cache_file = self.get_background_func_cache_file(
+                coords_to_colors_func, vectorized
+            )
+        if cache_file is not None and os.path.exists(cache_file):
+            return np.load(cache_file)
 
-        print "Starting set_background; for reference, the current time is ", time.strftime("%H:%M:%S")
         coords = self.get_coords_of_all_pixels()
-        new_background = np.apply_along_axis(
-            coords_to_colors_func,
-            2,
-            coords
+        height = self.pixel_shape[0]
+        chunk_size = self.background_func_rows_per_chunk
+        row_ranges = [
+            (y0, min(y0 + chunk_size, height))
+            for y0 in range(0, height, chunk_size)
+        ]
+        new_background = np.zeros(
+            list(self.pixel_shape)+[self.n_rgb_coords],
+            dtype = self.pixel_array_dtype
         )
-        print "Ending set_background; for reference, the current time is ", time.strftime("%H:%M:%S")
-
-        return self.convert_pixel_array(new_background, convert_from_floats = True)
+        progress_display = ProgressDisplay(total = height)
+        progress_display.set_description("Computing background")
+        row_chunks = self.get_background_row_chunks(
+            coords_to_colors_func, vectorized, coords, row_ranges
+        )
+        try:
+            for (y0, y1), rows in zip(row_ranges, row_chunks):
+                new_background[y0:y1] = rows
+                progress_display.update(y1 - y0)
+        finally:
+            progress_display.close()
+
+        if cache_file is not None:
+            temp_file = cache_file + ".%d.temp"%os.getpid()
+            with open(temp_file, "wb") as outfile:
+                np.save(outfile, new_background)
+            os.rename(temp_file, cache_file)
+        return new_background
+
+    def get_background_row_chunks(self, func, vectorized, coords, row_ranges):
+        """
+        Iterator over the converted colors of each range of rows.
+        Scalar functions are spread over forked processes, which
+        inherit func and coords rather than having them pickled.
+        """
+        num_processes = self.num_background_func_processes or mp.cpu_count()
+        if vectorized or num_processes == 1 or len(row_ranges) == 1 or not hasattr(os, "fork"):
+            for y0, y1 in row_ranges:
+                yield self.evaluate_background_func(func, vectorized, coords[y0:y1])
+            return
+        BACKGROUND_FUNC_STATE["args"] = (self, func, coords)
+        pool = mp.Pool(num_processes)
+        try:
+            for rows in pool.imap(evaluate_background_rows_in_worker, row_ranges):
+                yield rows
+            pool.close()
+        except:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+            BACKGROUND_FUNC_STATE.clear()
+
+    def evaluate_background_func(self, func, vectorized, coords):
+        if vectorized:
+            colors = np.array(func(coords), dtype = 'float')
+        else:
+            colors = np.apply_along_axis(func, coords.ndim - 1, coords)
+        expected_shape = coords.shape[:-1] + (self.n_rgb_coords,)
+        if colors.shape != expected_shape:
+            raise Exception(
+                "Background func returned colors of shape %s, expected %s"%(
+                    str(colors.shape), str(expected_shape)
+                )
+            )
+        return self.convert_pixel_array(colors, convert_from_floats = True)
 
-    def set_background_from_func(self, coords_to_colors_func):
-        self.set_background(self.make_background_from_func(coords_to_colors_func))
+    def get_background_func_key(self, func, vectorized = False):
+        """
+        Fingerprint of func, hashed the way the render cache hashes
+        functions, together with everything else the background
+        depends on, or None if func reaches values which cannot be
+        hashed.
+        """
+        from scene.render_cache import get_state_hash, UnhashableStateException
+        try:
+            return get_state_hash(
+                func,
+                vectorized,
+                tuple(self.pixel_shape),
+                tuple(self.space_shape),
+                tuple(self.space_center),
+                self.pixel_array_dtype,
+                self.n_rgb_coords,
+            )
+        except UnhashableStateException:
+            return None
+
+    def get_background_func_cache_file(self, func, vectorized = False):
+        key = self.get_background_func_key(func, vectorized)
+        if key is None:
+            return None
+        if not os.path.exists(self.background_func_cache_dir):
+            os.makedirs(self.background_func_cache_dir)
+        return os.path.join(self.background_func_cache_dir, key + ".npy")
+
+    def set_background_from_func(self, coords_to_colors_func, **kwargs):
+        self.set_background(self.make_background_from_func(
+            coords_to_colors_func, **kwargs
+        ))
 
     def reset(self):
         self.set_pixel_array(self.background)
@@ -213,16 +345,85 @@ class Camera(object):
                 if batch_type == mobject_type:
                     func(batch)
 
+    def get_pixel_bounding_box(self, mobjects, **kwargs):
+        """
+        Returns (y0, y1, x0, x1), clipped to the frame, such that
+        capture_mobjects, called with the same arguments and the camera
+        in its current state, leaves every pixel outside of
+        pixel_array[y0:y1, x0:x1] untouched.  The box is empty when
+        nothing would be drawn, and None is returned by cameras which
+        cannot tell.
+        """
+        mobjects = self.get_mobjects_to_display(mobjects, **kwargs)
+        coords_and_margins = []
+        for mobject in mobjects:
+            if isinstance(mobject, VMobject):
+                if mobject.is_subpath:
+                    continue
+                margin = self.get_vectorized_margin(mobject)
+                for coords in self.get_subpath_pixel_coords(mobject):
+                    coords_and_margins.append((coords, margin))
+            elif isinstance(mobject, PMobject):
+                if len(mobject.points) == 0:
+                    continue
+                coords = self.points_to_pixel_coords(
+                    self.align_points_to_camera(mobject.points)
+                )
+                margin = self.adjusted_thickness(mobject.stroke_width)/2 + 2
+                coords_and_margins.append((coords, margin))
+            elif isinstance(mobject, ImageMobject):
+                ul, ur, dl = self.points_to_pixel_coords(mobject.points)
+                coords = np.array([ul, ur, dl, ur + dl - ul])
+                coords_and_margins.append((coords, 2))
+        return self.get_coords_bounding_box(coords_and_margins)
+
+    def get_coords_bounding_box(self, coords_and_margins):
+        """
+        Box (y0, y1, x0, x1) of the pixels within the given margin
+        of the pixel coordinates paired with it, clipped to the frame.
+        """
+        ph, pw = self.pixel_shape
+        if len(coords_and_margins) == 0:
+            return (0, 0, 0, 0)
+        mins = np.min([
+            coords.min(0) - margin
+            for coords, margin in coords_and_margins
+        ], 0)
+        maxs = np.max([
+            coords.max(0) + margin + 1
+            for coords, margin in coords_and_margins
+        ], 0)
+        x0, y0 = np.clip(np.floor(mins).astype('int'), 0, [pw, ph])
+        x1, y1 = np.clip(np.ceil(maxs).astype('int'), 0, [pw, ph])
+        return (y0, max(y0, y1), x0, max(x0, x1))
+
+    def set_pixel_array_region(self, pixel_array, bounding_box):
+        """
+        Copies pixel_array[y0:y1, x0:x1] into the same region of
+        the camera's pixel array, leaving the rest as it is.
+        """
+        y0, y1, x0, x1 = bounding_box
+        self.pixel_array[y0:y1, x0:x1] = pixel_array[y0:y1, x0:x1]
+
     ## Methods associated with svg rendering
 
-    def get_aggdraw_canvas(self):
+    def get_canvas(self):
         if not hasattr(self, "canvas") or not self.canvas:
-            self.reset_aggdraw_canvas()
+            self.reset_canvas()
         return self.canvas
 
-    def reset_aggdraw_canvas(self):
-        image = Image.fromarray(self.pixel_array, mode = self.image_mode)
-        self.canvas = aggdraw.Draw(image)
+    def reset_canvas(self):
+        self.canvas = self.get_canvas_for(self.pixel_array)
+
+    def get_canvas_for(self, pixel_array):
+        if self.vectorized_rasterizer == "numpy":
+            return ArrayCanvas(pixel_array)
+        elif self.vectorized_rasterizer == "aggdraw":
+            image = Image.fromarray(pixel_array, mode = self.image_mode)
+            return aggdraw.Draw(image)
+        raise Exception(
+            "Unknown vectorized_rasterizer: %s"%str(self.vectorized_rasterizer)
+        )
 
     def display_multiple_vectorized_mobjects(self, vmobjects):
         if len(vmobjects) == 0:
@@ -238,20 +439,64 @@ class Camera(object):
                 self.display_multiple_non_background_colored_vmobjects(batch)
 
     def display_multiple_non_background_colored_vmobjects(self, vmobjects):
-        self.reset_aggdraw_canvas()
-        canvas = self.get_aggdraw_canvas()
-        for vmobject in vmobjects:
-            self.display_vectorized(vmobject, canvas)
+        """
+        With aggdraw, the canvas only covers the region of the pixel
+        array the batch can draw in, so that drawing small paths does
+        not cost as much as handing the whole frame to aggdraw.  The
+        numpy rasterizer only ever touches the pixels paths cover,
+        and is left to work in the coordinates of the full frame.
+        """
+        vmobjects = [vm for vm in vmobjects if not vm.is_subpath]
+        all_subpath_coords = map(self.get_subpath_pixel_coords, vmobjects)
+        if self.vectorized_rasterizer == "numpy":
+            y0, x0 = 0, 0
+            y1, x1 = self.pixel_array.shape[:2]
+        else:
+            y0, y1, x0, x1 = self.get_coords_bounding_box([
+                (coords, self.get_vectorized_margin(vmobject))
+                for vmobject, subpath_coords in zip(vmobjects, all_subpath_coords)
+                for coords in subpath_coords
+            ])
+        if y0 == y1 or x0 == x1:
+            return
+        region = self.pixel_array[y0:y1, x0:x1]
+        region_array = np.ascontiguousarray(region)
+        canvas = self.get_canvas_for(region_array)
+        offset = np.array([x0, y0])
+        for vmobject, subpath_coords in zip(vmobjects, all_subpath_coords):
+            self.display_vectorized(vmobject, canvas, [
+                coords - offset for coords in subpath_coords
+            ])
         canvas.flush()
+        if region_array is not region:
+            region[:] = region_array
+
+    def get_vectorized_margin(self, vmobject):
+        #Enough for miter joins, with a pixel for antialiasing
+        #and one for coordinates being rounded
+        return MITER_LIMIT*max(vmobject.get_stroke_width(), 0)/2 + 2
 
-    def display_vectorized(self, vmobject, canvas = None):
+    def display_vectorized(self, vmobject, canvas = None, subpath_coords = None):
         if vmobject.is_subpath:
             #Subpath vectorized mobjects are taken care
             #of by their parent
             return
-        canvas = canvas or self.get_aggdraw_canvas()
+        canvas = canvas or self.get_canvas()
+        if subpath_coords is None:
+            subpath_coords = self.get_subpath_pixel_coords(vmobject)
+        if self.vectorized_rasterizer == "numpy":
+            stroke_width, stroke_rgba, fill_rgba = \
+                self.get_stroke_and_fill_rgbas(vmobject)
+            canvas.draw_path(
+                subpath_coords,
+                closed = vmobject.mark_paths_closed,
+                stroke_width = stroke_width,
+                stroke_rgba = stroke_rgba,
+                fill_rgba = fill_rgba,
+            )
+            return
         pen, fill = self.get_pen_and_fill(vmobject)
-        pathstring = self.get_pathstring(vmobject)
+        pathstring = self.get_pathstring(vmobject, subpath_coords)
         symbol = aggdraw.Symbol(pathstring)
         canvas.symbol((0, 0), symbol, pen, fill)
 
@@ -274,6 +519,27 @@ class Camera(object):
 
         return (pen, fill)
 
+    def get_stroke_and_fill_rgbas(self, vmobject):
+        #Integer colors, rounded the same way as in get_pen_and_fill
+        stroke_width = max(vmobject.get_stroke_width(), 0)
+        if stroke_width == 0:
+            stroke_rgba = None
+        else:
+            stroke_rgb = self.get_stroke_rgb(vmobject)
+            stroke_rgba = self.rgb_to_int_rgba(stroke_rgb, 255)
+
+        fill_opacity = int(self.rgb_max_val*vmobject.get_fill_opacity())
+        if fill_opacity == 0:
+            fill_rgba = None
+        else:
+            fill_rgb = self.get_fill_rgb(vmobject)
+            fill_rgba = self.rgb_to_int_rgba(fill_rgb, fill_opacity)
+
+        return (stroke_width, stroke_rgba, fill_rgba)
+
+    def rgb_to_int_rgba(self, rgb, alpha):
+        return [int(255*x) for x in rgb] + [alpha]
+
     def color_to_hex_l(self, color):
         try:
             return color.get_hex_l()
@@ -286,15 +552,22 @@ class Camera(object):
     def get_fill_rgb(self, vmobject):
         return vmobject.get_fill_rgb()
 
-    def get_pathstring(self, vmobject):
-        result = ""
+    def get_subpath_pixel_coords(self, vmobject):
+        result = []
         for mob in [vmobject]+vmobject.get_subpath_mobjects():
             points = mob.points
             # points = self.adjust_out_of_range_points(points)            
             if len(points) == 0:
                 continue
             aligned_points = self.align_points_to_camera(points)
-            coords = self.points_to_pixel_coords(aligned_points)
+            result.append(self.points_to_pixel_coords(aligned_points))
+        return result
+
+    def get_pathstring(self, vmobject, subpath_coords = None):
+        if subpath_coords is None:
+            subpath_coords = self.get_subpath_pixel_coords(vmobject)
+        result = ""
+        for coords in subpath_coords:
             coord_strings = coords.flatten().astype(str)
             #Start new path string with M
             coord_strings[0] = "M" + coord_strings[0]
@@ -323,117 +596,194 @@ class Camera(object):
     ## Methods for other rendering
 
     def display_multiple_point_cloud_mobjects(self, pmobjects):
-        for pmobject in pmobjects:
-            self.display_point_cloud(
-                pmobject.points,
-                pmobject.rgbas,
-                self.adjusted_thickness(pmobject.stroke_width)
-            )
+        """
+        All points of the batch are drawn in one pass, each
+        pmobject as its own layer, with its own thickness.
+        """
+        pmobjects = [pm for pm in pmobjects if len(pm.points) > 0]
+        if len(pmobjects) == 0:
+            return
+        num_points = [len(pm.points) for pm in pmobjects]
+        self.display_point_cloud(
+            np.concatenate([pm.points for pm in pmobjects]),
+            np.concatenate([pm.rgbas for pm in pmobjects]),
+            np.repeat([
+                self.adjusted_thickness(pm.stroke_width)
+                for pm in pmobjects
+            ], num_points),
+            layers = np.repeat(np.arange(len(pmobjects)), num_points),
+        )
 
-    def display_point_cloud(self, points, rgbas, thickness):
+    def display_point_cloud(self, points, rgbas, thickness, layers = None):
+        """
+        thickness is either one value for all points, or one
+        value per point.
+        """
         if len(points) == 0:
             return
         points = self.align_points_to_camera(points)
         pixel_coords = self.points_to_pixel_coords(points)
-        pixel_coords = self.thickened_coordinates(
-            pixel_coords, thickness
+        self.pixel_array = self.get_point_cloud_rasterizer().draw(
+            self.pixel_array, pixel_coords, rgbas, thickness,
+            layers = layers,
+            depths = self.get_point_depths(points),
         )
-        rgba_len = self.pixel_array.shape[2]
 
-        rgbas = (self.rgb_max_val*rgbas).astype(self.pixel_array_dtype)
-        target_len = len(pixel_coords)
-        factor = target_len/len(rgbas)
-        rgbas = np.array([rgbas]*factor).reshape((target_len, rgba_len))
+    def get_point_cloud_rasterizer(self):
+        return PointCloudRasterizer(
+            blend_mode = self.point_cloud_blend_mode,
+            depth_sort = self.sort_point_clouds_by_depth,
+        )
 
-        on_screen_indices = self.on_screen_pixels(pixel_coords)        
-        pixel_coords = pixel_coords[on_screen_indices]        
-        rgbas = rgbas[on_screen_indices]
-
-        ph, pw = self.pixel_shape
-
-        flattener = np.array([1, pw], dtype = 'int')
-        flattener = flattener.reshape((2, 1))
-        indices = np.dot(pixel_coords, flattener)[:,0]
-        indices = indices.astype('int')
-        
-        new_pa = self.pixel_array.reshape((ph*pw, rgba_len))
-        new_pa[indices] = rgbas
-        self.pixel_array = new_pa.reshape((ph, pw, rgba_len))
+    def get_point_depths(self, points):
+        #Larger values are closer to the viewer
+        return points[:,2]
 
     def display_multiple_image_mobjects(self, image_mobjects):
         for image_mobject in image_mobjects:
             self.display_image_mobject(image_mobject)
 
     def display_image_mobject(self, image_mobject):
+        """
+        Only the pixels within the bounding box of the image's
+        quadrilateral on screen are sampled, then blended straight
+        into that region of the pixel array.
+        """
         corner_coords = self.points_to_pixel_coords(image_mobject.points)
         ul_coords, ur_coords, dl_coords = corner_coords
         right_vect = ur_coords - ul_coords
         down_vect = dl_coords - ul_coords
-
         impa = image_mobject.pixel_array
 
-        oh, ow = self.pixel_array.shape[:2] #Outer width and height
-        ih, iw = impa.shape[:2] #inner with and height
-        rgb_len = self.pixel_array.shape[2]
-
-        image = np.zeros((oh, ow, rgb_len), dtype = self.pixel_array_dtype)
-
-        if right_vect[1] == 0 and down_vect[0] == 0:
-            rv0 = right_vect[0]
-            dv1 = down_vect[1]
-            x_indices = np.arange(rv0, dtype = 'int')*iw/rv0
-            y_indices = np.arange(dv1, dtype = 'int')*ih/dv1
-            stretched_impa = impa[y_indices][:,x_indices]
-
-            x0, x1 = ul_coords[0], ur_coords[0] 
-            y0, y1 = ul_coords[1], dl_coords[1]
-            if x0 >= ow or x1 < 0 or y0 >= oh or y1 < 0:
-                return
-            siy0 = max(-y0, 0) #stretched_impa y0
-            siy1 = dv1 - max(y1-oh, 0)
-            six0 = max(-x0, 0)
-            six1 = rv0 - max(x1-ow, 0)
-            x0 = max(x0, 0)
-            y0 = max(y0, 0)
-            image[y0:y1, x0:x1] = stretched_impa[siy0:siy1, six0:six1]
+        if right_vect[1] == 0 and down_vect[0] == 0 and self.image_sampling == "nearest":
+            region, image = self.get_axis_aligned_image(
+                impa, ul_coords, right_vect[0], down_vect[1]
+            )
         else:
-            # Alternate (slower) tactic if image is tilted
-            # List of all coordinates of pixels, given as (x, y), 
-            # which matches the return type of points_to_pixel_coords,
-            # even though np.array indexing naturally happens as (y, x)
-            all_pixel_coords = np.zeros((oh*ow, 2), dtype = 'int')
-            a = np.arange(oh*ow, dtype = 'int')
-            all_pixel_coords[:,0] = a%ow
-            all_pixel_coords[:,1] = a/ow
-
-            recentered_coords = all_pixel_coords - ul_coords
-            coord_norms = np.linalg.norm(recentered_coords, axis = 1)
-
-            with np.errstate(divide = 'ignore'):
-                ix_coords, iy_coords = [
-                    np.divide(
-                        dim*np.dot(recentered_coords, vect),
-                        np.dot(vect, vect),
-                    )
-                    for vect, dim in (right_vect, iw), (down_vect, ih)
-                ]
-            to_change = reduce(op.and_, [
-                ix_coords >= 0, ix_coords < iw,
-                iy_coords >= 0, iy_coords < ih,
-            ])
-            n_to_change = np.sum(to_change)
-            inner_flat_coords = iw*iy_coords[to_change] + ix_coords[to_change]
-            flat_impa = impa.reshape((iw*ih, rgb_len))
-            target_rgbas = flat_impa[inner_flat_coords, :]
-
-            image = image.reshape((ow*oh, rgb_len))
-            image[to_change] = target_rgbas
-            image = image.reshape((oh, ow, rgb_len))
-        self.overlay_rgba_array(image)
-
-    def overlay_rgba_array(self, arr):
-        fg = arr
-        bg = self.pixel_array
+            region, image = self.get_warped_image(
+                impa, ul_coords, right_vect, down_vect
+            )
+        if region is not None:
+            self.overlay_rgba_array_region(image, region)
+
+    def clip_region(self, x0, x1, y0, y1):
+        oh, ow = self.pixel_array.shape[:2]
+        x0, x1 = max(x0, 0), min(x1, ow)
+        y0, y1 = max(y0, 0), min(y1, oh)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return (y0, y1, x0, x1)
+
+    def get_axis_aligned_image(self, impa, ul_coords, width, height):
+        """
+        Returns the region (y0, y1, x0, x1) of the pixel array which
+        an upright image covers, and the image stretched over it.
+        """
+        ih, iw = impa.shape[:2]
+        x0, y0 = ul_coords
+        region = self.clip_region(x0, x0 + width, y0, y0 + height)
+        if region is None:
+            return None, None
+        cy0, cy1, cx0, cx1 = region
+        x_indices = np.arange(cx0 - x0, cx1 - x0, dtype = 'int')*iw/width
+        y_indices = np.arange(cy0 - y0, cy1 - y0, dtype = 'int')*ih/height
+        return region, impa[y_indices][:,x_indices]
+
+    def get_warped_image(self, impa, ul_coords, right_vect, down_vect):
+        """
+        Same as get_axis_aligned_image for images under any affine
+        transformation, by mapping each pixel of the region back to
+        the image through the inverse transformation.
+        """
+        ih, iw = impa.shape[:2]
+        corners = ul_coords + np.array([
+            0*right_vect, right_vect, down_vect, right_vect + down_vect
+        ])
+        region = self.clip_region(
+            int(np.floor(corners[:,0].min())), int(np.ceil(corners[:,0].max())) + 1,
+            int(np.floor(corners[:,1].min())), int(np.ceil(corners[:,1].max())) + 1,
+        )
+        det = np.cross(right_vect, down_vect)
+        if region is None or det == 0:
+            return None, None
+        y0, y1, x0, x1 = region
+        #Rows give the proportions along right_vect and down_vect
+        #of a displacement from the upper left corner
+        inverse = np.linalg.inv(
+            np.array([right_vect, down_vect], dtype = 'float').T
+        )
+
+        #Nearest sampling matches the upright case, where a pixel
+        #takes the texel its corner falls on, while filtering samples
+        #at pixel centers
+        offset = 0 if self.image_sampling == "nearest" else 0.5
+        xs = np.arange(x0, x1) + offset - ul_coords[0]
+        ys = np.arange(y0, y1) + offset - ul_coords[1]
+        us = inverse[0,0]*xs[np.newaxis,:] + inverse[0,1]*ys[:,np.newaxis]
+        vs = inverse[1,0]*xs[np.newaxis,:] + inverse[1,1]*ys[:,np.newaxis]
+        inside = (us >= 0) & (us < 1) & (vs >= 0) & (vs < 1)
+        if not np.any(inside):
+            return None, None
+        us, vs = us[inside], vs[inside]
+
+        if self.image_sampling == "nearest":
+            texels = sample_nearest(impa, us*iw, vs*ih)
+        elif self.image_sampling in ["bilinear", "mipmap"]:
+            if self.image_sampling == "mipmap":
+                #Texels of the full image covered by one step
+                #along either axis of the screen
+                texels_per_pixel = max([
+                    np.linalg.norm(inverse[:,i]*[iw, ih])
+                    for i in range(2)
+                ])
+                levels = get_mipmaps(impa)
+                impa = levels[get_mipmap_level(len(levels), texels_per_pixel)]
+                ih, iw = impa.shape[:2]
+            texels = sample_bilinear(impa, us*iw - 0.5, vs*ih - 0.5)
+        else:
+            raise Exception(
+                "Unknown image_sampling: %s"%str(self.image_sampling)
+            )
+        image = np.zeros(
+            (y1 - y0, x1 - x0, self.pixel_array.shape[2]),
+            dtype = self.pixel_array_dtype
+        )
+        image[inside] = texels
+        return region, image
+
+    def get_compositor(self):
+        if not hasattr(self, "compositor"):
+            self.compositor = AlphaCompositor()
+        return self.compositor
+
+    def overlay_rgba_array(self, arr, bounding_box = None):
+        """
+        Blends arr over the pixel array.  If bounding_box, given as
+        (y0, y1, x0, x1), is specified, arr should be fully transparent
+        outside of it.
+        """
+        if self.pixel_array.dtype == arr.dtype == np.uint8:
+            self.get_compositor().composite(
+                self.pixel_array, arr, bounding_box
+            )
+            return
+        self.overlay_float_rgba_array(self.pixel_array, arr)
+
+    def overlay_rgba_array_region(self, arr, region):
+        """
+        Blends arr over the region (y0, y1, x0, x1) of the
+        pixel array, which should have the same shape as arr.
+        """
+        y0, y1, x0, x1 = region
+        bg = self.pixel_array[y0:y1, x0:x1]
+        if bg.dtype == arr.dtype == np.uint8:
+            self.get_compositor().composite(
+                bg, arr, (0, y1 - y0, 0, x1 - x0)
+            )
+            return
+        self.overlay_float_rgba_array(bg, arr)
+
+    def overlay_float_rgba_array(self, bg, fg):
         # rgba_max_val = self.rgb_max_val
         src_rgb, src_a, dst_rgb, dst_a = [
             a.astype(np.float32)/self.rgb_max_val
@@ -452,8 +802,8 @@ class Camera(object):
             zero_over_zero_value = 0
         )
 
-        self.pixel_array[..., :3] = out_rgb*self.rgb_max_val
-        self.pixel_array[..., 3] = out_a*self.rgb_max_val
+        bg[..., :3] = out_rgb*self.rgb_max_val
+        bg[..., 3] = out_a*self.rgb_max_val
 
     def align_points_to_camera(self, points):
         ## This is where projection should live
@@ -539,6 +889,15 @@ class Camera(object):
 
         return centered_space_coords
 
+#Forked workers of make_background_from_func read the camera, the
+#function and the coordinates from here rather than having them pickled
+BACKGROUND_FUNC_STATE = {}
+
+def evaluate_background_rows_in_worker(row_range):
+    camera, func, coords = BACKGROUND_FUNC_STATE["args"]
+    y0, y1 = row_range
+    return camera.evaluate_background_func(func, False, coords[y0:y1])
+
 class BackgroundColoredVMobjectDisplayer(object):
     def __init__(self, camera):
         self.camera = camera
@@ -553,8 +912,7 @@ class BackgroundColoredVMobjectDisplayer(object):
         self.reset_canvas()
 
     def reset_canvas(self):
-        image = Image.fromarray(self.pixel_array, mode = self.camera.image_mode)
-        self.canvas = aggdraw.Draw(image)
+        self.canvas = self.camera.get_canvas_for(self.pixel_array)
 
     def resize_background_array(
         self, background_array, 
@@ -639,25 +997,147 @@ class MovingCamera(Camera):
 class MappingCamera(Camera):
     CONFIG = {
         "mapping_func" : lambda p : p,
+        # If True, mapping_func is called on (N, 3) arrays of
+        # points, and should return the (N, 3) array of their images
+        "vectorized_mapping_func" : False,
         "min_anchor_points" : 50,
+        # If True, each curve of a vectorized mobject is split into
+        # as many pieces as it takes for the mapped curve to stay
+        # within max_mapping_error pixels of the true image of the
+        # curve, rather than topping it up to min_anchor_points
+        "adaptive_anchor_insertion" : True,
+        "max_mapping_error" : 0.5,
+        "max_pieces_per_curve" : 64,
         "allow_object_intrusion" : False
     }
 
+    def __init__(self, *args, **kwargs):
+        Camera.__init__(self, *args, **kwargs)
+        #Maps id(vmobject) to (weak reference to vmobject, key,
+        #mapped points), with entries dropped as their vmobjects die
+        self.mapped_points_cache = {}
+
+    def map_points(self, points):
+        if len(points) == 0:
+            return points
+        if not self.vectorized_mapping_func:
+            return np.apply_along_axis(self.mapping_func, 1, points)
+        result = np.array(self.mapping_func(points), dtype = 'float')
+        if result.shape != points.shape:
+            raise Exception(
+                "Vectorized mapping_func returned shape %s for points of shape %s"%(
+                    str(result.shape), str(points.shape)
+                )
+            )
+        return result
+
     def points_to_pixel_coords(self, points):
-        return Camera.points_to_pixel_coords(self, np.apply_along_axis(self.mapping_func, 1, points))
-    
+        return Camera.points_to_pixel_coords(self, self.map_points(points))
+
+    def get_subpath_pixel_coords(self, vmobject):
+        #As in the unmapped case, only the vmobject itself, not
+        #its subpaths, has anchors inserted
+        result = []
+        for mob in [vmobject]+vmobject.get_subpath_mobjects():
+            if len(mob.points) == 0:
+                continue
+            mapped_points = self.get_mapped_points(
+                mob, insert_anchors = (mob is vmobject)
+            )
+            result.append(Camera.points_to_pixel_coords(self, mapped_points))
+        return result
+
+    def get_mapped_points(self, vmobject, insert_anchors = True):
+        """
+        Images under mapping_func of the points of vmobject, with
+        anchors inserted.  These are kept from one frame to the next
+        until the points of vmobject, the space center, the mapping
+        function or any setting of how anchors are inserted changes.
+        """
+        key = (
+            vmobject.points_version, tuple(self.space_center),
+            tuple(self.pixel_shape), tuple(self.space_shape),
+            self.mapping_func, self.vectorized_mapping_func,
+            insert_anchors, self.adaptive_anchor_insertion,
+            self.min_anchor_points, self.max_mapping_error,
+            self.max_pieces_per_curve,
+        )
+        entry = self.mapped_points_cache.get(id(vmobject))
+        if entry is not None and entry[0]() is vmobject and entry[1] == key:
+            return entry[2]
+        points = self.align_points_to_camera(vmobject.points)
+        if insert_anchors and len(points) % 3 == 1 and len(points) > 1:
+            mapped_points = self.map_with_inserted_anchors(points)
+        else:
+            mapped_points = self.map_points(points)
+        cache = self.mapped_points_cache
+        vmobject_id = id(vmobject)
+        def forget(ref):
+            if vmobject_id in cache and cache[vmobject_id][0] is ref:
+                cache.pop(vmobject_id)
+        cache[vmobject_id] = (weakref.ref(vmobject, forget), key, mapped_points)
+        return mapped_points
+
+    def map_with_inserted_anchors(self, points):
+        curves = get_cubic_control_points(points)
+        if self.adaptive_anchor_insertion:
+            mapped_points = self.map_points(points)
+            num_pieces = self.get_num_pieces_per_curve(
+                curves, get_cubic_control_points(mapped_points)
+            )
+            if np.all(num_pieces == 1):
+                return mapped_points
+        else:
+            num_curves = len(curves)
+            num_new_anchors = self.min_anchor_points
+            if num_curves + 1 >= num_new_anchors:
+                return self.map_points(points)
+            #Same allocation of new anchors as in insert_n_anchor_points
+            index_allocation = (np.arange(num_curves + num_new_anchors) * num_curves) / \
+                (num_curves + num_new_anchors)
+            num_pieces = np.bincount(index_allocation, minlength = num_curves)
+        new_curves = subdivide_beziers(curves, num_pieces)
+        return self.map_points(np.append(
+            points[:1],
+            new_curves[:,1:].reshape((-1, points.shape[1])),
+            axis = 0
+        ))
+
+    def get_num_pieces_per_curve(self, curves, mapped_curves):
+        """
+        The camera maps control points rather than curves, so the
+        mapped curves drift from the true images of the curves
+        wherever mapping_func is far from affine.  That drift is
+        measured at a few points along each curve, and as it shrinks
+        roughly with the square of the number of pieces a curve is
+        split into, that tells how many pieces each curve needs.
+        """
+        ts = np.array([0.25, 0.5, 0.75])
+        true_images = self.map_points(
+            evaluate_beziers(curves, ts).reshape((-1, curves.shape[2]))
+        ).reshape((len(curves), len(ts), -1))
+        drift = evaluate_beziers(mapped_curves, ts) - true_images
+        pixels_per_unit = np.array([
+            self.pixel_shape[1] / (2.0*self.space_shape[1]),
+            self.pixel_shape[0] / (2.0*self.space_shape[0]),
+        ])
+        errors = np.sqrt(
+            ((drift[:,:,:2]*pixels_per_unit)**2).sum(2)
+        ).max(1)
+        num_pieces = np.ceil(np.sqrt(errors / self.max_mapping_error))
+        return np.clip(num_pieces, 1, self.max_pieces_per_curve).astype('int')
+
     def capture_mobjects(self, mobjects, **kwargs):
         mobjects = self.get_mobjects_to_display(mobjects, **kwargs)
         if self.allow_object_intrusion:
-            mobject_copies = mobjects
-        else:
-            mobject_copies = [mobject.copy() for mobject in mobjects]
-        for mobject in mobject_copies:
-            if isinstance(mobject, VMobject) and \
-            0 < mobject.get_num_anchor_points() < self.min_anchor_points:
-                mobject.insert_n_anchor_points(self.min_anchor_points)
+            for mobject in mobjects:
+                if isinstance(mobject, VMobject) and \
+                0 < mobject.get_num_anchor_points() < self.min_anchor_points:
+                    mobject.insert_n_anchor_points(self.min_anchor_points)
+        #Mobjects are not copied, as anchors are only ever inserted
+        #into the cached mapped points
         Camera.capture_mobjects(
-            self, mobject_copies, 
+            self, mobjects, 
             include_submobjects = False,
             excluded_mobjects = None,
         )
@@ -715,6 +1195,10 @@ class MultiCamera(Camera):
         for shifted_camera in self.shifted_cameras:
             shifted_camera.camera.init_background()
 
+    def get_pixel_bounding_box(self, mobjects, **kwargs):
+        #Each camera draws into its own array, then copies all of it
+        return None
+
 # A MultiCamera which, when called with two full-size cameras, initializes itself
 # as a splitscreen, also taking care to resize each individual camera within it
 class SplitScreenCamera(MultiCamera):
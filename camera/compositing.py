@@ -0,0 +1,141 @@
+import numpy as np
+
+from helpers import *
+
+## Alpha compositing of uint8 rgba arrays in integer arithmetic.
+##
+## For straight (non premultiplied) colors s and d with alphas
+## sa and da, all out of 255, the source over operator gives
+##
+##   out_a*255   = den = sa*255 + da*(255-sa)
+##   out_rgb*den = num = s*sa*255 + d*da*(255-sa)
+##
+## that is, num is the premultiplied result and den its alpha, both
+## exact integers scaled by 255.  The results are floored, as the
+## float implementation this replaces truncated when casting back
+## to uint8.  Going back to straight colors divides by den, which is
+## either 0 or between 255 and 255**2, so that division is done by
+## multiplying by a precomputed fixed point reciprocal.
+
+RECIPROCAL_SHIFT = 40
+MAX_COMPOSITE_DENOMINATOR = 255*255
+
+def get_reciprocal_table():
+    """
+    ceil(2**40 / den) for every possible den, and 0 for den = 0.
+    For num < 2**24 and 255 <= den <= 255**2, the rounding error of
+    num*table[den] >> 40 stays below 2**-16, less than 1/den, so it
+    never changes floor(num/den).
+    """
+    dens = np.arange(MAX_COMPOSITE_DENOMINATOR + 1, dtype = 'uint64')
+    result = np.zeros(len(dens), dtype = 'uint64')
+    one = np.uint64(1) << np.uint64(RECIPROCAL_SHIFT)
+    result[1:] = (one + dens[1:] - np.uint64(1)) // dens[1:]
+    return result
+
+RECIPROCAL_TABLE = get_reciprocal_table()
+
+def get_alpha_bounding_box(rgba_array):
+    """
+    Returns (y0, y1, x0, x1) such that every pixel of rgba_array
+    with nonzero alpha lies in rgba_array[y0:y1, x0:x1], or None
+    if the array is fully transparent.
+    """
+    alpha = rgba_array[:,:,3]
+    rows = np.flatnonzero(alpha.any(axis = 1))
+    if len(rows) == 0:
+        return None
+    cols = np.flatnonzero(alpha[rows[0]:rows[-1]+1].any(axis = 0))
+    return rows[0], rows[-1]+1, cols[0], cols[-1]+1
+
+def clip_bounding_box(bounding_box, shape):
+    y0, y1, x0, x1 = bounding_box
+    height, width = shape[:2]
+    y0, x0 = max(y0, 0), max(x0, 0)
+    y1, x1 = min(y1, height), min(x1, width)
+    if y0 >= y1 or x0 >= x1:
+        return None
+    return y0, y1, x0, x1
+
+class AlphaCompositor(object):
+    """
+    Blends uint8 rgba arrays onto one another with the over
+    operator, only within the region where the foreground has
+    any opacity.  Intermediate arrays are kept and reused from
+    one call to the next, so that compositing a frame does not
+    allocate any full frame sized arrays.
+    """
+    CONFIG = {
+        "pixels_per_block" : 2**17,
+    }
+    def __init__(self, **kwargs):
+        digest_config(self, kwargs)
+        self.scratch_buffers = {}
+
+    def get_scratch(self, name, shape, dtype):
+        size = int(np.prod(shape))
+        buff = self.scratch_buffers.get(name)
+        if buff is None or buff.size < size or buff.dtype != dtype:
+            buff = np.empty(size, dtype = dtype)
+            self.scratch_buffers[name] = buff
+        return buff[:size].reshape(shape)
+
+    def composite(self, background, foreground, bounding_box = None):
+        """
+        Overlays foreground onto background, in place.  Only the pixels
+        within bounding_box, given as (y0, y1, x0, x1), are blended,
+        which should include all pixels of foreground with nonzero
+        alpha.  If it is not given, it is found by scanning the alpha
+        channel of foreground.
+        """
+        if bounding_box is None:
+            bounding_box = get_alpha_bounding_box(foreground)
+        else:
+            bounding_box = clip_bounding_box(bounding_box, background.shape)
+        if bounding_box is None:
+            return background
+        y0, y1, x0, x1 = bounding_box
+        #Work through the region a few rows at a time, so
+        #that the intermediate arrays stay in cache
+        rows_per_block = max(self.pixels_per_block/(x1 - x0), 1)
+        for block_y0 in range(y0, y1, rows_per_block):
+            block_y1 = min(block_y0 + rows_per_block, y1)
+            self.composite_region(
+                background[block_y0:block_y1, x0:x1],
+                foreground[block_y0:block_y1, x0:x1],
+            )
+        return background
+
+    def composite_region(self, bg, fg):
+        #Channels are handled one at a time, as numpy is much
+        #faster along long rows than along the last axis of size 4
+        shape = bg.shape[:2]
+        src_weight = self.get_scratch("src_weight", shape, 'uint32')
+        dst_weight = self.get_scratch("dst_weight", shape, 'uint32')
+        den = self.get_scratch("den", shape, 'uint32')
+        num = self.get_scratch("num", shape, 'uint32')
+        rgb_term = self.get_scratch("rgb_term", shape, 'uint32')
+        reciprocal = self.get_scratch("reciprocal", shape, 'uint64')
+        quotient = self.get_scratch("quotient", shape, 'uint64')
+
+        #dst_weight = da*(255-sa), src_weight = sa*255
+        np.subtract(255, fg[:,:,3], out = src_weight, dtype = 'uint32')
+        np.multiply(src_weight, bg[:,:,3], out = dst_weight)
+        np.multiply(fg[:,:,3], 255, out = src_weight, dtype = 'uint32')
+        np.add(src_weight, dst_weight, out = den)
+        np.take(RECIPROCAL_TABLE, den, out = reciprocal, mode = 'clip')
+
+        for channel in range(3):
+            np.multiply(fg[:,:,channel], src_weight, out = num)
+            np.multiply(bg[:,:,channel], dst_weight, out = rgb_term)
+            np.add(num, rgb_term, out = num)
+            np.multiply(num, reciprocal, out = quotient)
+            np.right_shift(quotient, np.uint64(RECIPROCAL_SHIFT), out = quotient)
+            bg[:,:,channel] = quotient
+
+        #floor(den/255), exact for den < 2**16
+        np.right_shift(den, 8, out = dst_weight)
+        np.add(den, dst_weight, out = dst_weight)
+        np.add(dst_weight, 1, out = dst_weight)
+        np.right_shift(dst_weight, 8, out = dst_weight)
+        bg[:,:,3] = dst_weight
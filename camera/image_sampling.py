@@ -0,0 +1,108 @@
+import numpy as np
+import weakref
+import zlib
+
+from helpers import *
+
+## Sampling of uint8 rgba images at arbitrary texel coordinates, as
+## needed to draw an ImageMobject under an affine transformation.
+## Filtering is done on premultiplied colors, so that transparent
+## texels do not bleed their color into their neighbors.
+
+#Maps id(pixel_array) to (weak reference to it, checksum, levels)
+MIPMAP_CACHE = {}
+
+def gather_texels(pixel_array, ys, xs):
+    """
+    pixel_array[ys, xs], moving rgba uint8 texels as single 32 bit
+    words where possible, which numpy gathers much faster.
+    """
+    if pixel_array.dtype == np.uint8 and pixel_array.shape[2] == 4 \
+    and pixel_array.flags.c_contiguous:
+        words = pixel_array.view('uint32')[:,:,0]
+        return words[ys, xs].view('uint8').reshape((len(ys), 4))
+    return pixel_array[ys, xs]
+
+def sample_nearest(pixel_array, tx, ty):
+    """
+    Texels containing the texel coordinates (tx, ty), with texel
+    (i, j) covering [i, i+1) x [j, j+1).
+    """
+    h, w = pixel_array.shape[:2]
+    xs = np.clip(tx.astype('int'), 0, w-1)
+    ys = np.clip(ty.astype('int'), 0, h-1)
+    return gather_texels(pixel_array, ys, xs)
+
+def sample_bilinear(pixel_array, tx, ty):
+    """
+    Bilinear interpolation of the texels around (tx, ty), with
+    texel centers at integer coordinates and edges clamped.
+    """
+    h, w = pixel_array.shape[:2]
+    x0 = np.floor(tx)
+    y0 = np.floor(ty)
+    fx = (tx - x0)[:,np.newaxis]
+    fy = (ty - y0)[:,np.newaxis]
+    x0 = x0.astype('int')
+    y0 = y0.astype('int')
+    xs = [np.clip(x0, 0, w-1), np.clip(x0+1, 0, w-1)]
+    ys = [np.clip(y0, 0, h-1), np.clip(y0+1, 0, h-1)]
+    premultiplied = np.zeros((len(tx), 4))
+    for y_index, y_weight in (ys[0], 1-fy), (ys[1], fy):
+        for x_index, x_weight in (xs[0], 1-fx), (xs[1], fx):
+            texels = gather_texels(pixel_array, y_index, x_index).astype('float')
+            texels[:,:3] *= texels[:,3:]/255.0
+            premultiplied += (x_weight*y_weight)*texels
+    return unpremultiply(premultiplied)
+
+def unpremultiply(premultiplied):
+    result = np.zeros(premultiplied.shape, dtype = 'uint8')
+    alphas = premultiplied[:,3:]
+    visible = alphas[:,0] > 0
+    rgbs = premultiplied[visible,:3]*255.0/alphas[visible]
+    result[visible,:3] = np.clip(rgbs + 0.5, 0, 255)
+    result[:,3] = np.clip(alphas[:,0] + 0.5, 0, 255)
+    return result
+
+def downsample(pixel_array):
+    """
+    Halves an rgba image by averaging each 2x2 block of premultiplied
+    texels, repeating the last row or column when a side is odd.
+    """
+    h, w = pixel_array.shape[:2]
+    padded = np.pad(
+        pixel_array, ((0, h%2), (0, w%2), (0, 0)), mode = "edge"
+    ).astype('float')
+    padded[:,:,:3] *= padded[:,:,3:]/255.0
+    averaged = (
+        padded[0::2, 0::2] + padded[1::2, 0::2] + \
+        padded[0::2, 1::2] + padded[1::2, 1::2]
+    )/4
+    ah, aw = averaged.shape[:2]
+    return unpremultiply(averaged.reshape((ah*aw, 4))).reshape((ah, aw, 4))
+
+def get_mipmaps(pixel_array):
+    """
+    List of the image at full size, half size, and so on down
+    to a single texel, kept until pixel_array is modified or
+    garbage collected.
+    """
+    checksum = zlib.adler32(np.ascontiguousarray(pixel_array).data)
+    key = id(pixel_array)
+    entry = MIPMAP_CACHE.get(key)
+    if entry is not None and entry[0]() is pixel_array and entry[1] == checksum:
+        return entry[2]
+    levels = [pixel_array]
+    while max(levels[-1].shape[:2]) > 1:
+        levels.append(downsample(levels[-1]))
+    cache = MIPMAP_CACHE
+    def forget(ref):
+        if key in cache and cache[key][0] is ref:
+            cache.pop(key)
+    cache[key] = (weakref.ref(pixel_array, forget), checksum, levels)
+    return levels
+
+def get_mipmap_level(num_levels, texels_per_pixel):
+    if texels_per_pixel <= 1:
+        return 0
+    return min(int(np.log2(texels_per_pixel)), num_levels - 1)
@@ -0,0 +1,249 @@
+import numpy as np
+import itertools as it
+
+from helpers import *
+
+def get_splat_nudges(thickness):
+    """
+    Offsets of the pixels covered by a point drawn with the given
+    thickness, the same as Camera.get_thickening_nudges, down to
+    how range truncates the bounds for non integer thicknesses.
+    """
+    _range = range(int(-thickness/2+1), int(thickness/2+1))
+    return np.array(list(it.product(_range, _range)), dtype = 'int')
+
+def get_group_starts(sorted_values):
+    return np.append(0, np.flatnonzero(np.diff(sorted_values)) + 1)
+
+def get_sums_after(values, starts, group_ids):
+    """
+    For values grouped in runs beginning at starts, the sum of
+    the values coming after each one within its own run.
+    """
+    cumulative = np.cumsum(values)
+    totals = np.add.reduceat(values, starts)
+    return totals[group_ids] - (cumulative - (cumulative - values)[starts][group_ids])
+
+def write_pixels(flat_pixel_array, pixel_indices, colors, color_indices):
+    """
+    flat_pixel_array[pixel_indices] = colors[color_indices], with
+    later writes to the same pixel winning.  Pixels of four bytes
+    are moved as single 32 bit words, which numpy gathers and
+    scatters much faster than rows of four.
+    """
+    row_bytes = flat_pixel_array.dtype.itemsize*flat_pixel_array.shape[1]
+    if row_bytes == 4 and flat_pixel_array.flags.c_contiguous:
+        words = np.ascontiguousarray(colors).view('uint32')[:,0]
+        flat_pixel_array.view('uint32')[pixel_indices, 0] = words[color_indices]
+    else:
+        flat_pixel_array[pixel_indices] = colors[color_indices]
+
+def get_runs(values):
+    """
+    (start, end) of each run of equal consecutive values
+    """
+    starts = get_group_starts(values)
+    return zip(starts, np.append(starts[1:], len(values)))
+
+class PointCloudRasterizer(object):
+    """
+    Draws many points at once onto a pixel array.  Each point covers
+    a square of thickness by thickness pixels, and all of those
+    splats are blended into the array with whole array operations.
+
+    blend_mode is one of
+      "overwrite" : the last splat on a pixel replaces it, alpha
+                    channel included.
+      "alpha"     : splats are composited over the pixel one after
+                    the other with the over operator.
+      "additive"  : premultiplied colors and alphas of all splats
+                    on a pixel are summed, then clipped.
+
+    Points are drawn in order of their layer, then in the order
+    given, unless depth_sort is set, in which case they are drawn
+    from the deepest to the shallowest, with larger depths being
+    closer to the viewer.
+    """
+    CONFIG = {
+        "blend_mode" : "overwrite",
+        "depth_sort" : False,
+    }
+    def __init__(self, **kwargs):
+        digest_config(self, kwargs)
+
+    def draw(
+        self, pixel_array, pixel_coords, rgbas, thicknesses,
+        layers = None, depths = None,
+        ):
+        """
+        pixel_coords is an integer array of (x, y) pairs, rgbas
+        holds floats between 0 and 1, and thicknesses is either one
+        value, or one value per point.  Returns pixel_array,
+        drawn into in place when it is contiguous.
+        """
+        if self.blend_mode not in ["overwrite", "alpha", "additive"]:
+            raise Exception("Unknown blend_mode: %s"%str(self.blend_mode))
+        num_points = len(pixel_coords)
+        if num_points == 0:
+            return pixel_array
+        rgbas = np.array(rgbas)
+        thicknesses = np.array(thicknesses)
+        thicknesses = np.zeros(num_points, dtype = thicknesses.dtype) + thicknesses
+        if layers is None:
+            layers = np.zeros(num_points, dtype = 'int')
+        #From here on, points are drawn in the order of their indices
+        if self.depth_sort and depths is not None:
+            order = np.argsort(depths, kind = "mergesort")
+        elif np.any(layers[1:] < layers[:-1]):
+            order = np.argsort(layers, kind = "mergesort")
+        else:
+            order = None
+        if order is not None:
+            pixel_coords, rgbas = pixel_coords[order], rgbas[order]
+            thicknesses, layers = thicknesses[order], layers[order]
+
+        ph, pw, rgba_len = pixel_array.shape
+        flat_pixel_array = pixel_array.reshape((ph*pw, rgba_len))
+        if self.blend_mode == "overwrite" and not self.depth_sort:
+            #Layer by layer, each one a nudge of every point at a
+            #time, as Camera.display_point_cloud always drew them
+            for start, end in get_runs(layers):
+                self.overwrite(
+                    flat_pixel_array, pw, ph,
+                    pixel_coords[start:end], rgbas[start:end],
+                    thicknesses[start:end],
+                )
+        else:
+            self.draw_in_point_order(
+                flat_pixel_array, pw, ph, pixel_coords, rgbas, thicknesses
+            )
+        return flat_pixel_array.reshape(pixel_array.shape)
+
+    def get_splats(self, pixel_coords, thicknesses, pw, ph):
+        """
+        Returns the point index and the flattened pixel index of
+        every splat falling on screen.  Points sharing a thickness
+        are handled together, one nudge at a time.
+        """
+        point_indices = []
+        pixel_indices = []
+        if np.all(thicknesses == thicknesses[0]):
+            unique_thicknesses = thicknesses[:1]
+        else:
+            unique_thicknesses = np.unique(thicknesses)
+        for thickness in unique_thicknesses:
+            if len(unique_thicknesses) == 1:
+                indices = np.arange(len(thicknesses))
+            else:
+                indices = np.flatnonzero(thicknesses == thickness)
+            nudges = get_splat_nudges(thickness)
+            coords = pixel_coords[indices]
+            xs = (coords[:,0][np.newaxis,:] + nudges[:,0,np.newaxis]).flatten()
+            ys = (coords[:,1][np.newaxis,:] + nudges[:,1,np.newaxis]).flatten()
+            on_screen = (xs >= 0) & (xs < pw) & (ys >= 0) & (ys < ph)
+            point_indices.append(np.tile(indices, len(nudges))[on_screen])
+            pixel_indices.append(ys[on_screen]*pw + xs[on_screen])
+        return np.concatenate(point_indices), np.concatenate(pixel_indices)
+
+    def overwrite(self, flat_pixel_array, pw, ph, pixel_coords, rgbas, thicknesses):
+        point_indices, pixel_indices = self.get_splats(
+            pixel_coords, thicknesses, pw, ph
+        )
+        rgb_max_val = np.iinfo(flat_pixel_array.dtype).max
+        int_rgbas = (rgb_max_val*rgbas).astype(flat_pixel_array.dtype)
+        write_pixels(flat_pixel_array, pixel_indices, int_rgbas, point_indices)
+
+    def draw_in_point_order(self, flat_pixel_array, pw, ph, pixel_coords, rgbas, thicknesses):
+        point_indices, pixel_indices = self.get_splats(
+            pixel_coords, thicknesses, pw, ph
+        )
+        if len(point_indices) == 0:
+            return
+        rgb_max_val = np.iinfo(flat_pixel_array.dtype).max
+        if self.blend_mode == "additive":
+            #Order makes no difference to sums
+            self.add(flat_pixel_array, pixel_indices, rgbas, point_indices, rgb_max_val)
+            return
+        #Group the splats by pixel, and within each pixel put them
+        #in drawing order.  The splats of one point never share a
+        #pixel, so the point index alone gives that order.
+        keys = pixel_indices.astype('int64')*len(pixel_coords) + point_indices
+        order = np.argsort(keys)
+        point_indices = point_indices[order]
+        pixel_indices = pixel_indices[order]
+        if self.blend_mode == "overwrite":
+            #Only the last splat on each pixel shows
+            ends = np.append(get_group_starts(pixel_indices)[1:], len(pixel_indices)) - 1
+            int_rgbas = (rgb_max_val*rgbas).astype(flat_pixel_array.dtype)
+            write_pixels(
+                flat_pixel_array, pixel_indices[ends], int_rgbas, point_indices[ends]
+            )
+        else:
+            self.blend(
+                flat_pixel_array, pixel_indices,
+                np.array(rgbas, dtype = 'float')[point_indices],
+                rgb_max_val,
+            )
+
+    def add(self, flat_pixel_array, pixel_indices, rgbas, point_indices, rgb_max_val):
+        rgbas = np.array(rgbas, dtype = 'float')
+        alphas = np.clip(rgbas[:,3], 0, 1)
+        weights = np.append(rgbas[:,:3]*alphas[:,np.newaxis], alphas[:,np.newaxis], 1)
+        #Sum over the splats of each pixel
+        num_pixels = len(flat_pixel_array)
+        pixels = np.flatnonzero(np.bincount(pixel_indices, minlength = num_pixels))
+        sums = np.array([
+            np.bincount(
+                pixel_indices, weights[point_indices, i], minlength = num_pixels
+            )[pixels]
+            for i in range(4)
+        ]).T
+        background = flat_pixel_array[pixels].astype('float')/rgb_max_val
+        premultiplied = sums[:,:3] + background[:,:3]*background[:,3:]
+        new_alphas = np.clip(background[:,3] + sums[:,3], 0, 1)
+        self.write_premultiplied(
+            flat_pixel_array, pixels, premultiplied, new_alphas, rgb_max_val
+        )
+
+    def blend(self, flat_pixel_array, pixel_indices, rgbas, rgb_max_val):
+        """
+        Composites splats, which should come grouped by pixel and
+        in drawing order, over the pixels they fall on.
+        """
+        starts = get_group_starts(pixel_indices)
+        pixels = pixel_indices[starts]
+        group_ids = np.repeat(
+            np.arange(len(starts)),
+            np.diff(np.append(starts, len(pixel_indices)))
+        )
+        alphas = np.clip(rgbas[:,3], 0, 1)
+        background = flat_pixel_array[pixels].astype('float')/rgb_max_val
+
+        #Over a pixel, each splat is seen through all the ones drawn
+        #after it, so its weight is its alpha times the product of
+        #(1 - alpha) over those later splats.  Products are taken
+        #as sums of logs, with fully opaque splats counted apart.
+        opaque = alphas >= 1
+        log_transparencies = np.log1p(-np.where(opaque, 0, alphas))
+        after = get_sums_after(log_transparencies, starts, group_ids)
+        opaque_after = get_sums_after(opaque.astype('int'), starts, group_ids)
+        weights = np.where(opaque_after > 0, 0, alphas*np.exp(after))
+        group_totals = np.add.reduceat(log_transparencies, starts)
+        any_opaque = np.add.reduceat(opaque.astype('int'), starts) > 0
+        transparency = np.where(any_opaque, 0, np.exp(group_totals))
+
+        premultiplied = np.add.reduceat(rgbas[:,:3]*weights[:,np.newaxis], starts)
+        premultiplied += background[:,:3]*(background[:,3]*transparency)[:,np.newaxis]
+        new_alphas = 1 - (1 - background[:,3])*transparency
+        self.write_premultiplied(
+            flat_pixel_array, pixels, premultiplied, new_alphas, rgb_max_val
+        )
+
+    def write_premultiplied(self, flat_pixel_array, pixels, premultiplied, alphas, rgb_max_val):
+        rgbs = np.zeros(premultiplied.shape)
+        visible = alphas > 0
+        rgbs[visible] = premultiplied[visible]/alphas[visible,np.newaxis]
+        result = np.zeros((len(pixels), flat_pixel_array.shape[1]))
+        result[:,:3] = np.clip(rgbs, 0, 1)
+        result[:,3] = alphas
+        flat_pixel_array[pixels] = (rgb_max_val*result).astype(flat_pixel_array.dtype)
@@ -0,0 +1,560 @@
+import numpy as np
+import itertools as it
+
+from helpers import *
+
+# These mirror the agg defaults aggdraw renders with, so that the two
+# backends agree up to rounding
+SUBPIXEL_SCALE = 256
+MITER_LIMIT = 4.0
+INTERSECTION_EPSILON = 1e-8
+
+## Contours are stored as one array of points, laid end to end,
+## together with an array of the number of points in each
+
+def split_ranges(starts, ends):
+    """
+    For integer arrays starts and ends, returns the index i and
+    the value j for every j in range(starts[i], ends[i])
+    """
+    lengths = np.maximum(ends - starts, 0)
+    indices = np.repeat(np.arange(len(starts)), lengths)
+    offsets = np.cumsum(lengths) - lengths
+    values = starts[indices] + np.arange(len(indices)) - offsets[indices]
+    return indices, values
+
+def get_contour_starts(lengths):
+    return np.cumsum(lengths) - lengths
+
+def get_contour_neighbors(lengths):
+    """
+    Index of the point before and after each point,
+    wrapping around within its contour
+    """
+    contour_ids = np.repeat(np.arange(len(lengths)), lengths)
+    indices = np.arange(len(contour_ids))
+    firsts = get_contour_starts(lengths)[contour_ids]
+    lasts = firsts + lengths[contour_ids] - 1
+    prev_indices = np.where(indices == firsts, lasts, indices - 1)
+    next_indices = np.where(indices == lasts, firsts, indices + 1)
+    return prev_indices, next_indices
+
+def select_contours(points, lengths, to_keep):
+    return points[np.repeat(to_keep, lengths)], lengths[to_keep]
+
+def flatten_cubic_bezier_paths(subpaths):
+    """
+    Replaces each cubic bezier curve in the subpaths, laid out as
+    anchors and handles the way VMobject stores them, by evenly
+    spaced samples along it.  As in agg, the number of steps is a
+    quarter of the length of the curve's control polygon, and at
+    least 2.
+    """
+    lengths = np.array(map(len, subpaths))
+    points = np.concatenate(subpaths).astype('float')
+    starts = get_contour_starts(lengths)
+    n_curves = np.maximum((lengths - 1)/3, 0)
+    subpath_ids, curve_nums = split_ranges(
+        np.zeros(len(subpaths), dtype = 'int'), n_curves
+    )
+    first_indices = starts[subpath_ids] + 3*curve_nums
+    controls = [points[first_indices + k] for k in range(4)]
+    polygon_lengths = sum([
+        np.linalg.norm(p2 - p1, axis = 1)
+        for p1, p2 in zip(controls, controls[1:])
+    ])
+    num_steps = np.maximum((polygon_lengths*0.25).astype('int'), 2)
+    curve_ids, steps = split_ranges(
+        np.ones(len(num_steps), dtype = 'int'), num_steps + 1
+    )
+    t = (steps.astype('float')/num_steps[curve_ids])[:,None]
+    samples = sum([
+        coefficient*(1-t)**(3-k)*t**k*control[curve_ids]
+        for k, coefficient, control in zip(it.count(), [1, 3, 3, 1], controls)
+    ])
+    #Land exactly on the anchors
+    at_end = steps == num_steps[curve_ids]
+    samples[at_end] = controls[3][curve_ids[at_end]]
+
+    #Each subpath is its first point followed by its samples
+    sample_subpath_ids = subpath_ids[curve_ids]
+    new_lengths = 1 + np.bincount(sample_subpath_ids, minlength = len(subpaths))
+    result = np.zeros((np.sum(new_lengths), 2))
+    result[get_contour_starts(new_lengths)] = points[starts]
+    result[np.arange(len(samples)) + sample_subpath_ids + 1] = samples
+    return result, new_lengths
+
+def remove_repeated_points(points, lengths):
+    contour_ids = np.repeat(np.arange(len(lengths)), lengths)
+    to_keep = np.ones(len(points), dtype = 'bool')
+    to_keep[1:] = np.any(points[1:] != points[:-1], axis = 1)
+    to_keep[get_contour_starts(lengths)] = True
+    new_lengths = np.bincount(contour_ids[to_keep], minlength = len(lengths))
+    return points[to_keep], new_lengths
+
+def remove_closing_points(points, lengths, closed):
+    """
+    Drops the last point of each closed contour if it
+    coincides with the first
+    """
+    starts = get_contour_starts(lengths)
+    ends = starts + lengths - 1
+    to_drop = reduce(op.and_, [
+        closed, lengths > 1,
+        np.all(points[ends] == points[starts], axis = 1),
+    ])
+    to_keep = np.ones(len(points), dtype = 'bool')
+    to_keep[ends[to_drop]] = False
+    return points[to_keep], lengths - to_drop
+
+## Outlines
+
+def get_offset_joins(prev_points, points, next_points, widths):
+    """
+    For each vertex, the join between the segment coming from
+    prev_points and the one going to next_points, once both are
+    offset by width to their right.  Returns an array of shape
+    (n, 2, 2), where both points coincide unless the miter had
+    to be cut at the miter limit.
+    """
+    widths = widths[:,None]
+    d1 = points - prev_points
+    d2 = next_points - points
+    offset1 = widths*np.array([d1[:,1], -d1[:,0]]).T
+    offset1 /= np.linalg.norm(d1, axis = 1)[:,None]
+    offset2 = widths*np.array([d2[:,1], -d2[:,0]]).T
+    offset2 /= np.linalg.norm(d2, axis = 1)[:,None]
+
+    #Intersect the two offset lines
+    a = prev_points + offset1
+    b = points + offset1
+    c = points + offset2
+    d = next_points + offset2
+    num = (a[:,1]-c[:,1])*(d[:,0]-c[:,0]) - (a[:,0]-c[:,0])*(d[:,1]-c[:,1])
+    den = (b[:,0]-a[:,0])*(d[:,1]-c[:,1]) - (b[:,1]-a[:,1])*(d[:,0]-c[:,0])
+    parallel = np.abs(den) < INTERSECTION_EPSILON
+    den[parallel] = 1
+    intersections = a + (num/den)[:,None]*(b - a)
+
+    result = np.zeros((len(points), 2, 2))
+    result[:,0] = intersections
+    result[:,1] = intersections
+
+    dists = np.linalg.norm(intersections - points, axis = 1)
+    limits = np.abs(widths[:,0])*MITER_LIMIT
+    to_cut = np.logical_and(dists > limits, np.logical_not(parallel))
+    if np.any(to_cut):
+        ratios = (limits[to_cut]/dists[to_cut])[:,None]
+        for i, start in enumerate([b, c]):
+            start = start[to_cut]
+            result[to_cut, i] = start + ratios*(intersections[to_cut] - start)
+    result[parallel, 0] = b[parallel]
+    result[parallel, 1] = b[parallel]
+    return result
+
+def get_butt_caps(points, next_points, widths):
+    direction = next_points - points
+    offset = widths[:,None]*np.array([direction[:,1], -direction[:,0]]).T
+    offset /= np.linalg.norm(direction, axis = 1)[:,None]
+    return np.array([points - offset, points + offset]).transpose(1, 0, 2)
+
+def get_fill_contours(points, lengths, widths):
+    """
+    Each contour, as a closed polygon, pushed outward by
+    the corresponding width
+    """
+    prev_indices, next_indices = get_contour_neighbors(lengths)
+    contour_ids = np.repeat(np.arange(len(lengths)), lengths)
+    areas = np.bincount(
+        contour_ids,
+        weights = points[:,0]*points[next_indices,1] - \
+                  points[:,1]*points[next_indices,0],
+        minlength = len(lengths),
+    )
+    widths = np.where(areas > 0, widths, -widths)[contour_ids]
+    joins = get_offset_joins(
+        points[prev_indices], points, points[next_indices], widths
+    )
+    return joins.reshape((-1, 2)), 2*lengths
+
+def get_closed_stroke_contours(points, lengths, widths):
+    """
+    Outlines on either side of each closed contour, with miter
+    joins.  Contour i gives rise to contours 2i and 2i+1.
+    """
+    prev_indices, next_indices = get_contour_neighbors(lengths)
+    contour_ids = np.repeat(np.arange(len(lengths)), lengths)
+    widths = widths[contour_ids]
+    starts = get_contour_starts(lengths)[contour_ids]
+    ends = starts + lengths[contour_ids] - 1
+    reverse = starts + ends - np.arange(len(points))
+    outer = get_offset_joins(
+        points[prev_indices], points, points[next_indices], widths
+    )
+    inner = get_offset_joins(
+        points[next_indices[reverse]], points[reverse],
+        points[prev_indices[reverse]], widths[reverse]
+    )
+    #Interleave the outer and inner contours
+    new_lengths = np.repeat(2*lengths, 2)
+    new_starts = get_contour_starts(new_lengths)
+    result = np.zeros((4*len(points), 2))
+    for side, side_starts in (outer, new_starts[0::2]), (inner, new_starts[1::2]):
+        __, indices = split_ranges(side_starts, side_starts + 2*lengths)
+        result[indices] = side.reshape((-1, 2))
+    return result, new_lengths
+
+def get_open_stroke_contours(points, lengths, widths):
+    """
+    Outline of each open contour, going down one side and back up
+    the other, with miter joins and butt caps
+    """
+    starts = get_contour_starts(lengths)
+    n_records = 2*lengths - 2
+    contour_ids, records = split_ranges(
+        np.zeros(len(lengths), dtype = 'int'), n_records
+    )
+    contour_lengths = lengths[contour_ids]
+    is_backward = records >= contour_lengths
+    offsets = np.where(is_backward, 2*contour_lengths - 2 - records, records)
+    indices = starts[contour_ids] + offsets
+    steps = np.where(is_backward, -1, 1)
+    widths = widths[contour_ids]
+    is_cap = np.logical_or(records == 0, records == contour_lengths - 1)
+    is_join = np.logical_not(is_cap)
+
+    result = np.zeros((len(records), 2, 2))
+    cap_indices = indices[is_cap]
+    cap_neighbors = np.where(records[is_cap] == 0, cap_indices + 1, cap_indices - 1)
+    result[is_cap] = get_butt_caps(
+        points[cap_indices], points[cap_neighbors], widths[is_cap]
+    )
+    join_indices = indices[is_join]
+    join_steps = steps[is_join]
+    result[is_join] = get_offset_joins(
+        points[join_indices - join_steps],
+        points[join_indices],
+        points[join_indices + join_steps],
+        widths[is_join],
+    )
+    return result.reshape((-1, 2)), 2*n_records
+
+## Coverage
+
+def get_coverage(points, lengths, shape_ids, pixel_shape):
+    """
+    For each shape, the area of each pixel covered by the closed
+    polygons of that shape, under the nonzero winding rule, as
+    integers out of 255.  Contours must be ordered by shape_ids.
+
+    Only each shape's bounding box on screen is computed, so this
+    returns those blocks laid end to end, each with an extra column
+    on the right, along with the ids, starting index in the flat
+    array, upper left corner and block width for each shape.
+    """
+    height, width = pixel_shape
+    contour_ids = np.repeat(np.arange(len(lengths)), lengths)
+    __, next_indices = get_contour_neighbors(lengths)
+    #Snap to the same fixed point grid agg works on
+    points = np.trunc(points*SUBPIXEL_SCALE)/SUBPIXEL_SCALE
+    starts, ends = points, points[next_indices]
+    edge_shape_ids = shape_ids[contour_ids]
+
+    #Orient every edge downward, remembering its direction
+    not_horizontal = starts[:,1] != ends[:,1]
+    starts, ends = starts[not_horizontal], ends[not_horizontal]
+    edge_shape_ids = edge_shape_ids[not_horizontal]
+    going_down = ends[:,1] > starts[:,1]
+    directions = np.where(going_down, 1, -1)
+    tops = np.where(going_down[:,None], starts, ends)
+    bottoms = np.where(going_down[:,None], ends, starts)
+
+    #Cut edges into pieces lying within a single row
+    first_rows = np.maximum(np.floor(tops[:,1]), 0).astype('int')
+    end_rows = np.minimum(np.ceil(bottoms[:,1]), height).astype('int')
+    edge_indices, rows = split_ranges(first_rows, end_rows)
+    if len(rows) == 0:
+        return None
+    tops, bottoms = tops[edge_indices], bottoms[edge_indices]
+    directions = directions[edge_indices]
+    piece_shape_ids = edge_shape_ids[edge_indices]
+    slopes = (bottoms[:,0] - tops[:,0])/(bottoms[:,1] - tops[:,1])
+    y0 = np.maximum(tops[:,1], rows)
+    y1 = np.minimum(bottoms[:,1], rows + 1)
+    x0 = tops[:,0] + (y0 - tops[:,1])*slopes
+    x1 = tops[:,0] + (y1 - tops[:,1])*slopes
+
+    #Cut those pieces into ones lying within a single column, where
+    #column -1 holds everything left of the screen and column width
+    #everything right of it
+    x_min, x_max = np.minimum(x0, x1), np.maximum(x0, x1)
+    first_cols = np.clip(np.floor(x_min), -1, width).astype('int')
+    end_cols = np.clip(np.ceil(x_max), first_cols + 1, width + 1).astype('int')
+    piece_indices, cols = split_ranges(first_cols, end_cols)
+    x0, x1, y0, y1 = [a[piece_indices] for a in x0, x1, y0, y1]
+    x_min, x_max = x_min[piece_indices], x_max[piece_indices]
+    rows, directions = rows[piece_indices], directions[piece_indices]
+    piece_shape_ids = piece_shape_ids[piece_indices]
+    left = np.where(cols >= 0, np.maximum(x_min, cols), x_min)
+    right = np.where(cols < width, np.minimum(x_max, cols + 1), x_max)
+    dx = x1 - x0
+    sloped = np.abs(dx) > 0
+    dx[np.logical_not(sloped)] = 1
+    covers = np.where(
+        sloped,
+        (right - left)*np.abs((y1 - y0)/dx),
+        y1 - y0,
+    )*directions
+    middles = np.clip((left + right)/2 - cols, 0, 1)
+    middles[cols < 0] = 0
+    cols = np.clip(cols, 0, width)
+
+    #Bounding box of each shape on screen
+    breaks = np.append(0, np.flatnonzero(np.diff(piece_shape_ids)) + 1)
+    shapes = piece_shape_ids[breaks]
+    boxes = np.array([
+        np.minimum.reduceat(rows, breaks),
+        np.maximum.reduceat(rows, breaks),
+        np.minimum.reduceat(cols, breaks),
+        np.minimum(np.maximum.reduceat(cols, breaks), width - 1),
+    ]).T
+
+    #Spread each piece's cover over its cell and the next, where
+    #column width takes in everything right of the screen, and
+    #accumulate along rows.  Cells are keyed by shape, row and
+    #column, and as each row of a shape sums to zero, one running
+    #sum over the sorted keys resets at every row.
+    row_size = width + 1
+    shape_size = height*row_size
+    keys = piece_shape_ids*shape_size + rows*row_size + cols
+    next_keys = keys + (cols < width)
+    cell_keys, cell_indices = np.unique(
+        np.append(keys, next_keys), return_inverse = True
+    )
+    cell_covers = np.cumsum(np.bincount(
+        cell_indices,
+        weights = np.append(covers*(1 - middles), covers*middles),
+    ))
+    cell_alphas = np.minimum(
+        np.floor(np.abs(cell_covers)*SUBPIXEL_SCALE + 1e-6), 255
+    ).astype('int64')
+
+    #Coverage is constant from each of these cells up to the next
+    to_keep = cell_alphas[:-1] > 0
+    span_keys = cell_keys[:-1][to_keep]
+    span_lengths = np.diff(cell_keys)[to_keep]
+    span_shapes = span_keys/shape_size
+    span_rows = (span_keys%shape_size)/row_size
+    span_cols = span_keys%row_size
+    spans = {
+        "shapes" : span_shapes,
+        "starts" : span_rows*width + span_cols,
+        "lengths" : span_lengths,
+        "alphas" : cell_alphas[:-1][to_keep],
+    }
+    return spans, shapes, boxes
+
+## Compositing
+
+def blend_solid_color_spans(pixel_array, starts, lengths, alphas, rgbas):
+    """
+    Blends integer rgba colors into runs of pixels of pixel_array,
+    given by their flat starting index and length, weighted by
+    alphas, with the same integer arithmetic as agg's rgba32 pixel
+    format.  The runs must not overlap.
+    """
+    n_channels = pixel_array.shape[2]
+    flat_pixels = pixel_array.reshape((-1, n_channels))
+    alphas = alphas*rgbas[:,3]
+
+    #Fully covered runs of opaque colors are simply overwritten
+    opaque = alphas == 255*255
+    span_ids, indices = split_ranges(
+        starts[opaque], starts[opaque] + lengths[opaque]
+    )
+    colors = rgbas[opaque, :n_channels].astype(pixel_array.dtype)
+    if n_channels == 4 and pixel_array.dtype == np.uint8:
+        #Write each pixel as a single 32 bit word
+        flat_pixels = flat_pixels.view('uint32')[:,0]
+        colors = colors.view('uint32')[:,0]
+    flat_pixels[indices] = colors[span_ids]
+
+    partial = np.logical_not(opaque)
+    span_ids, indices = split_ranges(
+        starts[partial], starts[partial] + lengths[partial]
+    )
+    alphas = alphas[partial][span_ids]
+    rgbas = rgbas[partial][span_ids]
+    flat_pixels = pixel_array.reshape((-1, n_channels))
+    pixels = flat_pixels[indices].astype('int64')
+    for i in range(min(3, n_channels)):
+        value = pixels[:,i]
+        pixels[:,i] = ((rgbas[:,i] - value)*alphas + (value << 16)) >> 16
+    if n_channels > 3:
+        value = pixels[:,3]
+        pixels[:,3] = ((alphas + (value << 8)) - ((alphas*value) >> 8)) >> 8
+    flat_pixels[indices] = pixels
+
+def get_disjoint_batches(boxes):
+    """
+    Splits a sequence of (row_min, row_max, col_min, col_max) boxes
+    into consecutive runs in which no two boxes overlap, returning
+    the index at which each run starts
+    """
+    batch_starts = [0]
+    for i in range(1, len(boxes)):
+        previous = boxes[batch_starts[-1]:i]
+        overlaps = reduce(op.and_, [
+            previous[:,0] <= boxes[i,1], boxes[i,0] <= previous[:,1],
+            previous[:,2] <= boxes[i,3], boxes[i,2] <= previous[:,3],
+        ])
+        if np.any(overlaps):
+            batch_starts.append(i)
+    return batch_starts
+
+def render_paths(pixel_array, paths):
+    """
+    Draws each path, given as a dict with the keys of
+    ArrayCanvas.draw_path, into pixel_array, in order.
+    """
+    #Each path gives shape 2i for its fill and 2i+1 for its stroke
+    subpath_path_ids = np.array([
+        i
+        for i, path in enumerate(paths)
+        for points in path["subpaths"]
+        if len(points) > 0
+    ], dtype = 'int')
+    if len(subpath_path_ids) == 0:
+        return
+    points, lengths = flatten_cubic_bezier_paths([
+        points
+        for path in paths
+        for points in path["subpaths"]
+        if len(points) > 0
+    ])
+    points, lengths = remove_repeated_points(points, lengths)
+
+    def get_path_values(key, default = 0):
+        return np.array([
+            path[key] if path[key] is not None else default
+            for path in paths
+        ])
+    has_fill = get_path_values("fill_rgba", [0]*4)[:,3] > 0
+    has_stroke = np.logical_and(
+        get_path_values("stroke_rgba", [0]*4)[:,3] > 0,
+        get_path_values("stroke_width") > 0,
+    )
+    closed = get_path_values("closed").astype('bool')
+    stroke_widths = get_path_values("stroke_width").astype('float')
+    fill_offsets = np.where(has_stroke, stroke_widths/4., 0.25)
+
+    all_contours = []
+    #Fill
+    fill_points, fill_lengths = remove_closing_points(
+        points, lengths, np.ones(len(lengths), dtype = 'bool')
+    )
+    to_fill = np.logical_and(has_fill[subpath_path_ids], fill_lengths >= 3)
+    fill_points, fill_lengths = select_contours(fill_points, fill_lengths, to_fill)
+    path_ids = subpath_path_ids[to_fill]
+    all_contours.append(get_fill_contours(
+        fill_points, fill_lengths, fill_offsets[path_ids]
+    ) + (2*path_ids,))
+    #Closed strokes
+    stroke_points, stroke_lengths = remove_closing_points(
+        points, lengths, closed[subpath_path_ids]
+    )
+    to_stroke = has_stroke[subpath_path_ids]
+    for is_closed, min_length, func in [
+        (True, 3, get_closed_stroke_contours),
+        (False, 2, get_open_stroke_contours),
+        ]:
+        to_keep = reduce(op.and_, [
+            to_stroke,
+            closed[subpath_path_ids] == is_closed,
+            stroke_lengths >= min_length,
+        ])
+        path_ids = subpath_path_ids[to_keep]
+        contours = func(
+            *select_contours(stroke_points, stroke_lengths, to_keep),
+            widths = stroke_widths[path_ids]/2.
+        )
+        if is_closed:
+            path_ids = np.repeat(path_ids, 2)
+        all_contours.append(contours + (2*path_ids+1,))
+
+    #Put contours in drawing order
+    contour_points = np.concatenate([c[0] for c in all_contours])
+    contour_lengths = np.concatenate([c[1] for c in all_contours])
+    shape_ids = np.concatenate([c[2] for c in all_contours])
+    order = np.argsort(shape_ids, kind = 'mergesort')
+    starts = get_contour_starts(contour_lengths)
+    __, point_order = split_ranges(
+        starts[order], starts[order] + contour_lengths[order]
+    )
+    coverage_data = get_coverage(
+        contour_points[point_order], contour_lengths[order],
+        shape_ids[order], pixel_array.shape[:2]
+    )
+    if coverage_data is None:
+        return
+    spans, shapes, boxes = coverage_data
+
+    #Shapes whose boxes don't overlap can be blended all at once
+    shape_rgbas = np.zeros((2*len(paths), 4), dtype = 'int64')
+    for i, path in enumerate(paths):
+        for j, key in enumerate(["fill_rgba", "stroke_rgba"]):
+            if path[key] is not None:
+                shape_rgbas[2*i+j] = path[key]
+    batch_starts = shapes[get_disjoint_batches(boxes)]
+    span_batch_starts = np.searchsorted(
+        spans["shapes"], np.append(batch_starts, len(shape_rgbas))
+    )
+    for start, end in zip(span_batch_starts, span_batch_starts[1:]):
+        if start == end:
+            continue
+        blend_solid_color_spans(
+            pixel_array,
+            spans["starts"][start:end],
+            spans["lengths"][start:end],
+            spans["alphas"][start:end],
+            shape_rgbas[spans["shapes"][start:end]],
+        )
+
+class ArrayCanvas(object):
+    """
+    Rasterizes paths straight into a pixel array, without building
+    path strings.  Each subpath is an array of pixel coordinates of
+    anchors and handles.  As with aggdraw, curves are flattened into
+    polylines, the fill is pushed out by a quarter of the stroke
+    width, strokes use miter joins and butt caps, and nothing is
+    written to the pixel array until flush is called.
+
+    Being pure numpy, this is slower than aggdraw, so aggdraw
+    remains the default.
+    """
+    def __init__(self, pixel_array):
+        self.pixel_array = pixel_array
+        self.paths = []
+
+    def draw_path(self, subpaths, closed = False,
+                  stroke_width = 0, stroke_rgba = None,
+                  fill_rgba = None):
+        self.paths.append({
+            "subpaths" : subpaths,
+            "closed" : closed,
+            "stroke_width" : stroke_width,
+            "stroke_rgba" : stroke_rgba,
+            "fill_rgba" : fill_rgba,
+        })
+        return self
+
+    def flush(self):
+        if len(self.paths) > 0:
+            if self.pixel_array.flags.c_contiguous:
+                render_paths(self.pixel_array, self.paths)
+            else:
+                pixel_array = np.ascontiguousarray(self.pixel_array)
+                render_paths(pixel_array, self.paths)
+                self.pixel_array[:] = pixel_array
+        self.paths = []
+        return self
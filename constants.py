@@ -82,6 +82,9 @@ TEX_IMAGE_DIR     = TEX_DIR #TODO, What is this doing?
 #These two may be depricated now.
 MOBJECT_DIR       = os.path.join(FILE_DIR, "mobjects")
 IMAGE_MOBJECT_DIR = os.path.join(MOBJECT_DIR, "image")
+RENDER_CACHE_DIR  = os.path.join(FILE_DIR, "render_cache")
+SVG_CACHE_DIR     = os.path.join(FILE_DIR, "svg_cache")
+BACKGROUND_CACHE_DIR = os.path.join(FILE_DIR, "background_cache")
 
 if not os.path.exists(MEDIA_DIR):
     raise Exception("""
@@ -91,7 +94,8 @@ if not os.path.exists(MEDIA_DIR):
     """)
 for folder in [FILE_DIR, RASTER_IMAGE_DIR, SVG_IMAGE_DIR, ANIMATIONS_DIR, TEX_DIR,
                TEX_IMAGE_DIR, MOBJECT_DIR, IMAGE_MOBJECT_DIR,
-               STAGED_SCENES_DIR]:
+               STAGED_SCENES_DIR, RENDER_CACHE_DIR, SVG_CACHE_DIR,
+               BACKGROUND_CACHE_DIR]:
     if not os.path.exists(folder):
         os.makedirs(folder)
 
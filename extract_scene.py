@@ -13,6 +13,7 @@ import subprocess as sp
 
 from helpers import *
 from scene import Scene
+from scene.render_cache import RenderCache
 from camera import Camera
 
 HELP_MESSAGE = """
@@ -27,6 +28,10 @@ HELP_MESSAGE = """
    -q don't print progress
    -f when writing to a movie file, export the frames in png sequence
    -t use transperency when exporting images
+   -c reuse frames of unchanged animations from the render cache
+   --clear_render_cache empty the render cache before rendering
+   --write_partial_movies write each animation to its own movie file,
+      reusing those which have not changed, then combine them
 """
 SCENE_NOT_FOUND_MESSAGE = """
    That scene is not in the script
@@ -61,10 +66,13 @@ def get_configuration():
          ("-f", "--show_file_in_finder"),
          ("-t", "--transparent"),
          ("-q", "--quiet"),
-         ("-a", "--write_all")
+         ("-a", "--write_all"),
+         ("-c", "--use_render_cache"),
       ]
       for short_arg, long_arg in optional_args:
          parser.add_argument(short_arg, long_arg, action = "store_true")
+      parser.add_argument("--clear_render_cache", action = "store_true")
+      parser.add_argument("--write_partial_movies", action = "store_true")
       parser.add_argument("-o", "--output_name")
       parser.add_argument("-n", "--start_at_animation_number")
       args = parser.parse_args()
@@ -100,6 +108,9 @@ def get_configuration():
       "output_name"     : output_name,
       "start_at_animation_number" : args.start_at_animation_number,
       "end_at_animation_number" : None,
+      "use_render_cache" : args.use_render_cache,
+      "clear_render_cache" : args.clear_render_cache,
+      "write_partial_movies" : args.write_partial_movies,
    }
    if args.low_quality:
       config["camera_config"] = LOW_QUALITY_CAMERA_CONFIG
@@ -239,9 +250,14 @@ def main():
          "movie_file_extension",
          "start_at_animation_number",
          "end_at_animation_number",
+         "use_render_cache",
+         "write_partial_movies",
       ]
    ])
    
+   if config["clear_render_cache"]:
+      RenderCache().clear()
+
    scene_kwargs["name"] = config["output_name"]
    if config["save_pngs"]:
       print "We are going to save a PNG sequence as well..."
@@ -11,6 +11,7 @@ import os
 from scipy import linalg
 
 from constants import *
+from bezier_kernels import *
 
 CLOSED_THRESHOLD = 0.01
 STRAIGHT_PATH_THRESHOLD = 0.01
@@ -178,23 +179,14 @@ def partial_bezier_points(points, a, b):
     describes the portion of the original bezier
     curve on the interval [a, b].
 
-    This algorithm is pretty nifty, and pretty dense.
+    See partial_beziers to do this for many curves at once.
     """
-    a_to_1 = np.array([
-        bezier(points[i:])(a)
-        for i in range(len(points))
-    ])
-    return np.array([
-        bezier(a_to_1[:i+1])((b-a)/(1.-a))
-        for i in range(len(points))
-    ])
+    return partial_beziers([points], a, b)[0]
 
 def bezier(points):
     n = len(points) - 1
-    return lambda t : sum([
-        ((1-t)**(n-k))*(t**k)*choose(n, k)*point
-        for k, point in enumerate(points)
-    ])
+    points = np.array(points)
+    return lambda t : np.dot(get_bernstein_weights(n, t), points)
 
 def remove_list_redundancies(l):
     """
@@ -215,9 +207,15 @@ def list_update(l1, l2):
     Used instead of list(set(l1).update(l2)) to maintain order,
     making sure duplicates are removed from l1, not l2.
     """
-    return filter(lambda e : e not in l2, l1) + list(l2)
+    l2 = list(l2)
+    return list_difference_update(l1, l2) + l2
 
 def list_difference_update(l1, l2):
+    """
+    Elements of l1 not in l2, which, as with
+    remove_list_redundancies, must be hashable
+    """
+    l2 = set(l2)
     return filter(lambda e : e not in l2, l1)
 
 def all_elements_are_instances(iterable, Class):
@@ -290,34 +288,101 @@ def filtered_locals(caller_locals):
         result.pop(arg, caller_locals)
     return result
 
-def digest_config(obj, kwargs, caller_locals = {}):
-    """
-    Sets init args and CONFIG values as local variables
+#Maps each class to its resolved CONFIG, as returned by
+#get_static_config.  CONFIG dicts are assumed not to change
+#once a class has been instantiated.
+STATIC_CONFIG_CACHE = {}
 
-    The purpose of this function is to ensure that all 
-    configuration of any object is inheritable, able to 
-    be easily passed into instantiation, and is attached
-    as an attribute of the object.
+def get_static_configs(Class):
     """
-
-    # Assemble list of CONFIGs from all super classes
-    classes_in_hierarchy = [obj.__class__]
+    CONFIGs of Class and all of its super classes, with
+    those of higher priority first
+    """
+    classes_in_hierarchy = [Class]
     static_configs = []
     while len(classes_in_hierarchy) > 0:
         Class = classes_in_hierarchy.pop()
         classes_in_hierarchy += Class.__bases__
         if hasattr(Class, "CONFIG"):
             static_configs.append(Class.CONFIG)
+    return static_configs
+
+def get_static_config(Class):
+    """
+    Returns (static_configs, static_config, merged_values), where
+    static_config is merge_config(static_configs), except that the
+    dicts which merging would build, listed in merged_values along
+    with the dicts they are built from, are left to build anew for
+    each object.  static_config is None when merging it ahead of
+    the values given for an object would give a different result.
+    """
+    if Class not in STATIC_CONFIG_CACHE:
+        static_configs = get_static_configs(Class)
+        static_config = None
+        merged_values = {}
+        if not has_shadowed_dicts(static_configs):
+            static_config = merge_config(static_configs)
+            for key in static_config:
+                values = [
+                    config[key] for config in static_configs
+                    if isinstance(config.get(key), dict)
+                ]
+                if len(values) > 1:
+                    merged_values[key] = values
+        STATIC_CONFIG_CACHE[Class] = (static_configs, static_config, merged_values)
+    return STATIC_CONFIG_CACHE[Class]
+
+def has_shadowed_dicts(all_dicts):
+    """
+    Whether some value which merge_config would merge dicts into
+    is, among all_dicts, first given as something other than a
+    dict.  Merging those dicts in advance would then lose them.
+    """
+    values_by_key = {}
+    for d in all_dicts:
+        for key, value in d.items():
+            values_by_key.setdefault(key, []).append(value)
+    for values in values_by_key.values():
+        dict_values = filter(lambda v : isinstance(v, dict), values)
+        if len(dict_values) == 0:
+            continue
+        if not isinstance(values[0], dict) or has_shadowed_dicts(dict_values):
+            return True
+    return False
+
+def digest_config(obj, kwargs, caller_locals = {}):
+    """
+    Sets init args and CONFIG values as local variables
 
+    The purpose of this function is to ensure that all 
+    configuration of any object is inheritable, able to 
+    be easily passed into instantiation, and is attached
+    as an attribute of the object.
+
+    CONFIGs of the class hierarchy are merged once per class.
+    Objects configured with track_initial_config also keep their
+    configuration upon instantiation as initial_config.
+    """
+    static_configs, static_config, merged_values = \
+        get_static_config(obj.__class__)
     #Order matters a lot here, first dicts have higher priority
     caller_locals = filtered_locals(caller_locals)
-    all_dicts = [kwargs, caller_locals, obj.__dict__]
-    all_dicts += static_configs
-    all_new_dicts = [kwargs, caller_locals] + static_configs
-    obj.__dict__ = merge_config(all_dicts)
-    #Keep track of the configuration of objects upon 
-    #instantiation
-    obj.initial_config = merge_config(all_new_dicts)
+    if static_config is None:
+        obj.__dict__ = merge_config(
+            [kwargs, caller_locals, obj.__dict__] + static_configs
+        )
+    else:
+        config = dict(static_config)
+        for key, values in merged_values.items():
+            #Built anew so that no two objects share them
+            config[key] = merge_config(values)
+        obj.__dict__ = merge_config(
+            [kwargs, caller_locals, obj.__dict__, config]
+        )
+    if obj.__dict__.get("track_initial_config", False):
+        obj.initial_config = merge_config(
+            [kwargs, caller_locals] + static_configs
+        )
 
 def merge_config(all_dicts):
     all_config = reduce(op.add, [d.items() for d in all_dicts])
@@ -5,7 +5,7 @@ from PIL import Image
 from random import random
 
 from helpers import *
-from mobject import Mobject
+from mobject import Mobject, style_attribute
 from point_cloud_mobject import PMobject
 
 class ImageMobject(Mobject):
@@ -20,6 +20,8 @@ class ImageMobject(Mobject):
         "image_mode" : "RGBA",
         "pixel_array_dtype" : "uint8",
     }
+    pixel_array = style_attribute("pixel_array")
+
     def __init__(self, filename_or_array, **kwargs):
         digest_config(self, kwargs)
         if isinstance(filename_or_array, str):
@@ -52,6 +54,7 @@ class ImageMobject(Mobject):
         self.pixel_array[:,:,:3] = rgb
         if alpha is not None:
             self.pixel_array[:,:,3] = int(255*alpha)
+        self.mark_style_changed()
         for submob in self.submobjects:
             submob.highlight(color, alpha, family)
         return self
@@ -71,6 +74,7 @@ class ImageMobject(Mobject):
 
     def set_opacity(self, alpha):
         self.pixel_array[:,:,3] = int(255*alpha)
+        self.mark_style_changed()
         return self
 
     def fade(self, darkness = 0.5):
@@ -83,7 +87,4 @@ class ImageMobject(Mobject):
             mobject1.pixel_array, mobject2.pixel_array, alpha
         ).astype(self.pixel_array_dtype)
 
-    def copy(self):
-        return self.deepcopy()
-
 
@@ -11,6 +11,21 @@ from container import *
 
 #TODO: Explain array_attrs
 
+def style_attribute(name):
+    """
+    Property kept in the instance dict, as digest_config expects,
+    which notes any change to it through mark_style_changed.
+    """
+    def get_value(mobject):
+        try:
+            return mobject.__dict__[name]
+        except KeyError:
+            raise AttributeError(name)
+    def set_value(mobject, value):
+        mobject.__dict__[name] = value
+        mobject.mark_style_changed()
+    return property(get_value, set_value)
+
 class Mobject(Container):
     """
     Mathematical Object
@@ -22,6 +37,7 @@ class Mobject(Container):
         "dim" : 3,
         "target" : None,
     }
+    stroke_width = style_attribute("stroke_width")
     def __init__(self, *submobjects, **kwargs):
         Container.__init__(self, *submobjects, **kwargs)
         if not all(map(lambda m : isinstance(m, Mobject), submobjects)):
@@ -30,6 +46,10 @@ class Mobject(Container):
         self.color = Color(self.color)
         if self.name is None:
             self.name = self.__class__.__name__
+        self.packed_family_points = None
+        self.own_bounding_box = None
+        self.family_bounding_box = None
+        self.mark_style_changed()
         self.init_points()
         self.generate_points()
         self.init_colors()
@@ -37,6 +57,81 @@ class Mobject(Container):
     def __str__(self):
         return str(self.name)
 
+    #Both points and submobjects live in the instance dict, but go
+    #through these properties so that any change to them is noted
+    #by mark_points_changed.  Mobjects keep a read only view of the
+    #points array they are given, so in place changes have to go
+    #through write_points instead.
+
+    @property
+    def points(self):
+        return self.__dict__["points"]
+
+    @points.setter
+    def points(self, points):
+        if isinstance(points, np.ndarray):
+            #The array passed in stays writeable for its owner
+            points = points.view()
+            points.flags.writeable = False
+        self.__dict__["points"] = points
+        self.mark_points_changed()
+
+    def __setstate__(self, state):
+        #Copies and unpickled mobjects own their points, which can
+        #be made read only directly
+        self.__dict__.update(state)
+        points = state.get("points")
+        if isinstance(points, np.ndarray):
+            points.flags.writeable = False
+
+    @property
+    def submobjects(self):
+        return self.__dict__["submobjects"]
+
+    @submobjects.setter
+    def submobjects(self, submobjects):
+        if not isinstance(submobjects, SubmobjectList):
+            submobjects = SubmobjectList(submobjects)
+        self.__dict__["submobjects"] = submobjects
+        mark_families_changed()
+
+    def mark_points_changed(self):
+        """
+        Notes that the points changed, so that cached bounding boxes
+        are recomputed.  Assigning points and write_points call it.
+        """
+        self.points_version = mark_mobjects_changed()
+        return self
+
+    def write_points(self, index, values):
+        """
+        Same as points[index] = values, which the points being read
+        only forbids.  The values are written into a copy, since the
+        array the points view may be shared with other mobjects.
+        """
+        points = np.array(self.points)
+        points[index] = values
+        self.points = points
+        return self
+
+    def mark_style_changed(self):
+        """
+        Must be called after writing into an array setting how a
+        mobject is drawn, like the rgbas of a PMobject, in place.
+        Assigning to the attributes subclasses declare with
+        style_attribute calls it already.
+        """
+        self.style_version = get_next_style_version()
+        return self
+
+    def set_style_attributes(self, items):
+        """
+        Assigns (name, value) pairs of style attributes, marking
+        the style as changed once rather than once per attribute.
+        """
+        self.__dict__.update(items)
+        return self.mark_style_changed()
+
     def init_points(self):
         self.points = np.zeros((0, self.dim))
 
@@ -101,19 +196,22 @@ class Mobject(Container):
         )
 
     def copy(self):
-        #TODO, either justify reason for shallow copy, or
-        #remove this redundancy everywhere
-        return self.deepcopy()
-
-        copy_mobject = copy.copy(self)
-        copy_mobject.points = np.array(self.points)
-        copy_mobject.submobjects = [
-            submob.copy() for submob in self.submobjects
-        ]
-        family = self.submobject_family()
-        for attr, value in self.__dict__.items():
-            if isinstance(value, Mobject) and value in family and value is not self:
-                setattr(copy_mobject, attr, value.copy())
+        """
+        Copies each member of the family once, along with its arrays,
+        containers and colors, so that references between members of
+        the family point to the corresponding copies.  Mobjects held
+        in attributes outside the family, like saved_state, target or
+        a PiCreature's bubble, are copied the same way, sharing one
+        memo so that cycles and shared references are preserved.
+        Other objects, like config values and functions, are shared
+        with the original rather than deep copied.
+        """
+        copied_roots = []
+        copy_mobject = copy_family(self, {}, copied_roots)
+        #Packing waits until every copy has its attributes
+        for mobject, mobject_copy in copied_roots:
+            if mobject.get_packed_family_points() is not None:
+                mobject_copy.pack_family_points()
         return copy_mobject
 
     def deepcopy(self):
@@ -135,9 +233,13 @@ class Mobject(Container):
 
     def shift(self, *vectors):
         total_vector = reduce(op.add, vectors)
+        packed_points = self.get_packed_family_points()
+        if packed_points is not None:
+            packed_points += total_vector
+            self.mark_packed_points_changed()
+            return self
         for mob in self.family_members_with_points():
-           mob.points = mob.points.astype('float')
-           mob.points += total_vector
+           mob.points = np.add(mob.points, total_vector, dtype = 'float')
         return self
 
     def scale(self, scale_factor, **kwargs):
@@ -211,7 +313,7 @@ class Mobject(Container):
             alphas -= min(alphas)
             alphas /= max(alphas)
             alphas = alphas**wag_factor
-            mob.points += np.dot(
+            mob.points = mob.points + np.dot(
                 alphas.reshape((len(alphas), 1)),
                 np.array(direction).reshape((1, mob.dim))
             )
@@ -244,12 +346,99 @@ class Mobject(Container):
     def apply_points_function_about_point(self, func, about_point = None, about_edge = ORIGIN):
         if about_point is None:
             about_point = self.get_critical_point(about_edge)
+        packed_points = self.get_packed_family_points()
+        if packed_points is not None:
+            packed_points -= about_point
+            packed_points[:] = func(packed_points)
+            packed_points += about_point
+            self.mark_packed_points_changed()
+            return self
         for mob in self.family_members_with_points():
-            mob.points -= about_point
-            mob.points = func(mob.points)
-            mob.points += about_point
+            mob.points = func(mob.points - about_point) + about_point
+        return self
+
+    #### Packed points ####
+
+    def pack_family_points(self):
+        """
+        Moves the points of every member of the family into one
+        contiguous array, leaving each member with a view into it,
+        so that transformations of the whole family become single
+        numpy operations.  The packing silently stops applying as
+        soon as the points of a member are reassigned, or the family
+        changes.
+        """
+        members = self.family_members_with_points()
+        if len(members) == 0:
+            self.packed_family_points = None
+            return self
+        buff = np.concatenate([mob.points for mob in members]).astype('float')
+        views = []
+        start = 0
+        for mob in members:
+            end = start + len(mob.points)
+            mob.points = buff[start:end]
+            views.append(mob.points)
+            start = end
+        self.packed_family_points = (
+            buff, members, views,
+            self.get_packed_boundary_indices(buff, members),
+        )
+        return self
+
+    def get_packed_boundary_indices(self, buff, members):
+        """
+        Rows of buff holding the points which define the boundaries
+        of members, or None unless every member's boundary points are
+        a strided view of its own points.
+        """
+        indices = []
+        for mob in members:
+            boundary = mob.get_points_defining_boundary()
+            if boundary.base is not buff:
+                return None
+            row_size = buff.strides[0]
+            start = (boundary.ctypes.data - buff.ctypes.data) / row_size
+            step = boundary.strides[0] / row_size
+            indices.append(start + step*np.arange(len(boundary)))
+        return np.concatenate(indices)
+
+    def get_packed_family_points(self):
+        """
+        Returns the array holding the points of the whole family if
+        pack_family_points was called and the packing still applies,
+        otherwise None.
+        """
+        if self.packed_family_points is None:
+            return None
+        buff, members, views, boundary_indices = self.packed_family_points
+        is_valid = members == self.family_members_with_points() and all([
+            mob.points is view and view.base is buff
+            for mob, view in zip(members, views)
+        ])
+        if not is_valid:
+            self.packed_family_points = None
+            return None
+        return buff
+
+    def get_packed_boundary_points(self):
+        if self.get_packed_family_points() is None:
+            return None
+        buff, members, views, boundary_indices = self.packed_family_points
+        if boundary_indices is None:
+            return None
+        return buff[boundary_indices]
+
+    def mark_packed_points_changed(self):
+        for mob in self.packed_family_points[1]:
+            mob.mark_points_changed()
         return self
 
+    def get_packed_family_point_counts(self):
+        if self.get_packed_family_points() is None:
+            return None
+        return [len(view) for view in self.packed_family_points[2]]
+
     def rotate_in_place(self, angle, axis = OUT):
         # redundant with default behavior of rotate now.
         return self.rotate(angle, axis = axis)
@@ -606,6 +795,9 @@ class Mobject(Container):
         return result
 
     def get_all_points(self):
+        packed_points = self.get_packed_family_points()
+        if packed_points is not None:
+            return np.array(packed_points)
         return self.get_merged_array("points")
 
     ### Getters ###
@@ -616,20 +808,71 @@ class Mobject(Container):
     def get_num_points(self):
         return len(self.points)
 
+    def get_own_bounding_box(self):
+        """
+        Array [min_point, max_point] of this mobject's own points
+        defining its boundary, or None if it has none.  Cached until
+        its points change.
+        """
+        if self.own_bounding_box is not None:
+            version, bounding_box = self.own_bounding_box
+            if version == self.points_version:
+                return bounding_box
+        points = self.get_points_defining_boundary()
+        if len(points) == 0:
+            bounding_box = None
+        else:
+            bounding_box = np.array([points.min(0), points.max(0)])
+        self.own_bounding_box = (self.points_version, bounding_box)
+        return bounding_box
+
+    def get_bounding_box(self):
+        """
+        Array [min_point, max_point] over the whole family, cached
+        until the points of one of its members or the family itself
+        change.  As with reduce_across_dimension, members without
+        points or submobjects count as a point at the origin.
+        """
+        family = self.submobject_family()
+        #Points versions only ever grow, so the latest one in the
+        #family changes whenever the points of any member do
+        version = max([mob.points_version for mob in family])
+        if self.family_bounding_box is not None:
+            cached_family, cached_version, bounding_box = self.family_bounding_box
+            if cached_version == version and cached_family == family:
+                return bounding_box
+        boxes = [
+            np.zeros((2, self.dim))
+            for mob in family
+            if len(mob.submobjects) == 0 and mob.get_num_points() == 0
+        ]
+        packed_boundary_points = self.get_packed_boundary_points()
+        if packed_boundary_points is not None:
+            boxes.append(np.array([
+                packed_boundary_points.min(0),
+                packed_boundary_points.max(0),
+            ]))
+        else:
+            boxes += filter(
+                lambda box : box is not None,
+                [mob.get_own_bounding_box() for mob in family]
+            )
+        boxes = np.array(boxes)
+        bounding_box = np.array([
+            boxes[:,0].min(0),
+            boxes[:,1].max(0),
+        ])
+        self.family_bounding_box = (family, version, bounding_box)
+        return bounding_box
+
     def get_critical_point(self, direction):
-        result = np.zeros(self.dim)
+        min_point, max_point = self.get_bounding_box()
+        result = (max_point + min_point)/2
         for dim in range(self.dim):
-            if direction[dim] <= 0:
-                min_point = self.reduce_across_dimension(np.min, np.min, dim)
-            if direction[dim] >= 0:
-                max_point = self.reduce_across_dimension(np.max, np.max, dim)
-
-            if direction[dim] == 0:
-                result[dim] = (max_point+min_point)/2
-            elif direction[dim] < 0:
-                result[dim] = min_point
-            else:
-                result[dim] = max_point
+            if direction[dim] < 0:
+                result[dim] = min_point[dim]
+            elif direction[dim] > 0:
+                result[dim] = max_point[dim]
         return result
 
     # Pseudonyms for more general get_critical_point method
@@ -668,10 +911,8 @@ class Mobject(Container):
         return self.get_edge_center(IN)
 
     def length_over_dim(self, dim):
-        return (
-            self.reduce_across_dimension(np.max, np.max, dim) -
-            self.reduce_across_dimension(np.min, np.min, dim)
-        )
+        min_point, max_point = self.get_bounding_box()
+        return max_point[dim] - min_point[dim]
 
     def get_width(self):
         return self.length_over_dim(0)
@@ -709,9 +950,22 @@ class Mobject(Container):
         return result + self.submobjects
 
     def submobject_family(self):
-        sub_families = map(Mobject.submobject_family, self.submobjects)
-        all_mobjects = [self] + list(it.chain(*sub_families))
-        return remove_list_redundancies(all_mobjects)
+        """
+        self, then its submobjects, their submobjects and so on,
+        depth first, with each member listed where it last occurs.
+        Cached until the submobjects of any mobject change.
+        """
+        if id(self) in FAMILY_CACHE:
+            return list(FAMILY_CACHE[id(self)][1])
+        all_mobjects = []
+        to_visit = [self]
+        while len(to_visit) > 0:
+            mob = to_visit.pop()
+            all_mobjects.append(mob)
+            to_visit += reversed(mob.submobjects)
+        family = remove_list_redundancies(all_mobjects)
+        FAMILY_CACHE[id(self)] = (self, family)
+        return list(family)
 
     def family_members_with_points(self):
         return filter(
@@ -866,6 +1120,121 @@ class Mobject(Container):
     def pointwise_become_partial(self, mobject, a, b):
         pass #To implement in subclass
 
+class SubmobjectList(list):
+    """
+    List which calls mark_families_changed whenever it is modified,
+    so that no change to the structure of a family goes unnoticed.
+    """
+    pass
+
+def noting_changes(list_method):
+    def method(self, *args, **kwargs):
+        mark_families_changed()
+        return list_method(self, *args, **kwargs)
+    return method
+
+for method_name in [
+    "append", "extend", "insert", "remove", "pop", "sort", "reverse",
+    "__setitem__", "__delitem__", "__setslice__", "__delslice__",
+    "__iadd__", "__imul__",
+    ]:
+    setattr(
+        SubmobjectList, method_name,
+        noting_changes(getattr(list, method_name))
+    )
+
+#Increased every time the points or submobjects of any mobject
+#change, and used as the version of the new points
+MOBJECTS_VERSION = [0]
+
+def mark_mobjects_changed():
+    MOBJECTS_VERSION[0] += 1
+    return MOBJECTS_VERSION[0]
+
+#Increased every time the submobjects of any mobject change
+FAMILIES_VERSION = [0]
+
+#Maps id(mobject) to (mobject, its submobject_family), emptied
+#whenever FAMILIES_VERSION increases.  Keeping the mobject alive
+#guarantees its id is not reused.
+FAMILY_CACHE = {}
+
+def mark_families_changed():
+    FAMILIES_VERSION[0] += 1
+    FAMILY_CACHE.clear()
+    return mark_mobjects_changed()
+
+def get_latest_families_version():
+    return FAMILIES_VERSION[0]
+
+#Increased every time the style of any mobject changes, apart from
+#MOBJECTS_VERSION, which only points and submobjects advance
+STYLES_VERSION = [0]
+
+def get_next_style_version():
+    STYLES_VERSION[0] += 1
+    return STYLES_VERSION[0]
+
+#Attribute values of these types are shared between copies
+SHARED_ATTRIBUTE_TYPES = set([
+    type(None), bool, int, long, float, str, unicode,
+])
+
+def copy_family(mobject, family_copies, copied_roots):
+    family = [
+        mob for mob in mobject.submobject_family()
+        if id(mob) not in family_copies
+    ]
+    #Every copy exists before any attribute is filled in, so that
+    #references back into the family resolve to the copies
+    for mob in family:
+        family_copies[id(mob)] = mob.__class__.__new__(mob.__class__)
+    copied_roots.append((mobject, family_copies[id(mobject)]))
+    for mob in family:
+        family_copies[id(mob)].__setstate__(dict([
+            (key, copy_attribute(value, family_copies, copied_roots))
+            for key, value in mob.__dict__.iteritems()
+        ]))
+    return family_copies[id(mobject)]
+
+def copy_attribute(value, family_copies, copied_roots):
+    value_type = type(value)
+    if value_type in SHARED_ATTRIBUTE_TYPES:
+        return value
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if isinstance(value, Color):
+        #Colors are mutable through set_rgb, set_hex and the like
+        return copy.deepcopy(value)
+    if isinstance(value, Mobject):
+        if id(value) in family_copies:
+            return family_copies[id(value)]
+        return copy_family(value, family_copies, copied_roots)
+    if type(value) is tuple:
+        return tuple([
+            copy_attribute(item, family_copies, copied_roots)
+            for item in value
+        ])
+    if isinstance(value, (list, set, dict)):
+        #Shallow copying first keeps the type of subclasses
+        result = copy.copy(value)
+        if isinstance(value, list):
+            result[:] = [
+                copy_attribute(item, family_copies, copied_roots)
+                for item in value
+            ]
+        elif isinstance(value, set):
+            result.clear()
+            result.update([
+                copy_attribute(item, family_copies, copied_roots)
+                for item in value
+            ])
+        else:
+            for key, item in value.items():
+                result[key] = copy_attribute(item, family_copies, copied_roots)
+        return result
+    return value
+
 class Group(Mobject):
     #Alternate name to improve readibility in cases where
     #the mobject is used primarily for its submobject housing
@@ -1,7 +1,9 @@
-from .mobject import Mobject
+from .mobject import Mobject, style_attribute
 from helpers import *
 
 class PMobject(Mobject):
+    rgbas = style_attribute("rgbas")
+
     def init_points(self):
         self.rgbas = np.zeros((0, 4))
         self.points = np.zeros((0, 3))
@@ -35,6 +37,7 @@ class PMobject(Mobject):
         mobs = self.family_members_with_points() if family else [self]
         for mob in mobs:
             mob.rgbas[:,:] = rgba
+            mob.mark_style_changed()
         return self
 
     # def gradient_highlight(self, start_color, end_color):
@@ -1,5 +1,8 @@
 from xml.dom import minidom
 import warnings
+import cPickle
+import cStringIO
+import hashlib
 
 from vectorized_mobject import VMobject, VGroup
 from topics.geometry import Rectangle, Circle
@@ -26,11 +29,19 @@ class SVGMobject(VMobject):
         "fill_opacity" : 1,
         # "fill_color" : LIGHT_GREY,
         "propagate_style_to_family" : True,
+        # Keep the points of all paths in one array, see
+        # Mobject.pack_family_points
+        "pack_points" : False,
+        # Reuse the parsed geometry of files already loaded, either
+        # earlier in this process or, through SVG_CACHE_DIR, earlier runs
+        "use_geometry_cache" : True,
     }
     def __init__(self, **kwargs):
         digest_config(self, kwargs, locals())
         self.ensure_valid_file()
         VMobject.__init__(self, **kwargs)
+        if self.pack_points:
+            self.pack_family_points()
         self.move_into_position()
 
     def ensure_valid_file(self):
@@ -48,6 +59,20 @@ class SVGMobject(VMobject):
         raise IOError("No file matching %s in image directory"%self.file_name)
 
     def generate_points(self):
+        if self.use_geometry_cache:
+            key = self.get_geometry_cache_key()
+            mobjects = get_cached_svg_geometry(key)
+            if mobjects is None:
+                self.parse_file()
+                mobjects = self.submobjects
+                cache_svg_geometry(key, mobjects)
+            else:
+                self.ref_to_element = {}
+                self.add(*mobjects)
+        else:
+            self.parse_file()
+
+    def parse_file(self):
         doc = minidom.parse(self.file_path)
         self.ref_to_element = {}
         for svg in doc.getElementsByTagName("svg"):
@@ -55,6 +80,24 @@ class SVGMobject(VMobject):
             if self.unpack_groups: self.add(*mobjects)
             else: self.add(*mobjects[0].submobjects)
         doc.unlink()
+        #Elements are of no use once the document is unlinked
+        self.ref_to_element = {}
+
+    def get_geometry_cache_key(self):
+        """
+        Everything the result of parse_file depends on.  The class
+        is included since subclasses may override how elements
+        are turned into mobjects.
+        """
+        stat = os.stat(self.file_path)
+        return (
+            self.__class__.__module__ + "." + self.__class__.__name__,
+            os.path.realpath(self.file_path),
+            stat.st_mtime,
+            stat.st_size,
+            self.unpack_groups,
+            self.dim,
+        )
 
     def get_mobjects_from(self, element):
         result = []
@@ -224,6 +267,101 @@ class SVGMobject(VMobject):
 
 
 
+#Bump whenever parsing changes, so that stale files are not used
+SVG_CACHE_VERSION = 1
+
+#Maps cache keys to lists of mobjects, kept aside as they were
+#right after parsing, and only ever handed out as copies
+SVG_GEOMETRY_CACHE = {}
+
+def get_cached_svg_geometry(key):
+    """
+    Copies of the mobjects parsed for key, looked up in memory and
+    then on disk, or None if the file has not been parsed yet.
+    """
+    if key not in SVG_GEOMETRY_CACHE:
+        mobjects = load_svg_geometry(get_svg_geometry_file(key))
+        if mobjects is None:
+            return None
+        SVG_GEOMETRY_CACHE[key] = mobjects
+    return [mob.copy() for mob in SVG_GEOMETRY_CACHE[key]]
+
+def cache_svg_geometry(key, mobjects):
+    mobjects = [mob.copy() for mob in mobjects]
+    SVG_GEOMETRY_CACHE[key] = mobjects
+    save_svg_geometry(get_svg_geometry_file(key), mobjects)
+
+def get_svg_geometry_file(key):
+    digest = hashlib.sha1(repr((SVG_CACHE_VERSION,) + key)).hexdigest()
+    return os.path.join(SVG_CACHE_DIR, digest + ".npz")
+
+def save_svg_geometry(file_name, mobjects):
+    """
+    Writes the bytes of all arrays of mobjects (points, colors and
+    the like) into one buffer of an npz file, alongside a pickle of
+    everything else which refers to those arrays by offset, so that
+    loading them takes a couple of reads rather than one per array.
+    Colors, which can't be pickled, are stored by their rgb values.
+    """
+    buffers = []
+    array_ids = {}
+    offset = [0]
+    def persistent_id(value):
+        if isinstance(value, Color):
+            return ("color",) + value.get_rgb()
+        if type(value) is not np.ndarray or value.dtype == object:
+            return None
+        if id(value) not in array_ids:
+            data = np.ascontiguousarray(value).tostring()
+            array_ids[id(value)] = ("array", value.dtype.str, value.shape, offset[0])
+            buffers.append(data)
+            offset[0] += len(data)
+        return array_ids[id(value)]
+    structure_file = cStringIO.StringIO()
+    pickler = cPickle.Pickler(structure_file, 2)
+    pickler.persistent_id = persistent_id
+    temp_file_name = file_name + ".%d.temp.npz"%os.getpid()
+    try:
+        pickler.dump(mobjects)
+        np.savez(
+            temp_file_name,
+            structure = np.frombuffer(structure_file.getvalue(), dtype = np.uint8),
+            data = np.frombuffer("".join(buffers), dtype = np.uint8),
+        )
+        os.rename(temp_file_name, file_name)
+    except (IOError, OSError, TypeError, cPickle.PicklingError):
+        #Only the in memory cache is used then
+        if os.path.exists(temp_file_name):
+            os.remove(temp_file_name)
+
+def load_svg_geometry(file_name):
+    if not os.path.exists(file_name):
+        return None
+    try:
+        with np.load(file_name) as npz_file:
+            structure = npz_file["structure"].tostring()
+            data = npz_file["data"].tostring()
+        arrays = {}
+        def persistent_load(persistent_id):
+            if persistent_id[0] == "color":
+                return Color(rgb = persistent_id[1:])
+            if persistent_id not in arrays:
+                kind, dtype, shape, offset = persistent_id
+                dtype = np.dtype(dtype)
+                arrays[persistent_id] = np.frombuffer(
+                    data, dtype = dtype,
+                    count = int(np.prod(shape)),
+                    offset = offset,
+                ).reshape(shape).copy()
+            return arrays[persistent_id]
+        unpickler = cPickle.Unpickler(cStringIO.StringIO(structure))
+        unpickler.persistent_load = persistent_load
+        return unpickler.load()
+    except (IOError, ValueError, KeyError, EOFError, AttributeError,
+            ImportError, cPickle.UnpicklingError):
+        #Unreadable, or written by an incompatible version
+        return None
+
 class VMobjectFromSVGPathstring(VMobject):
     def __init__(self, path_string, **kwargs):
         digest_locals(self)
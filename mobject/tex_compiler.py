@@ -0,0 +1,309 @@
+import hashlib
+import re
+import os
+import subprocess as sp
+import multiprocessing as mp
+from multiprocessing.pool import ThreadPool
+
+from helpers import *
+
+#Bump whenever the way tex files are generated changes
+TEX_CACHE_VERSION = 1
+
+#Command used to ask each tool for its version, whose first
+#line of output goes into the hash of every expression
+TEX_TOOL_VERSION_COMMANDS = [
+    ["latex", "--version"],
+    ["dvisvgm", "--version"],
+]
+
+#Filled in lazily by get_tex_tool_versions and get_template_contents
+TEX_TOOL_VERSIONS = []
+TEMPLATE_CONTENTS = {}
+
+TEX_COMPILER = None
+
+class TexCompiler(object):
+    """
+    Turns tex expressions into svg files, cached on disk under
+    a stable hash of the expression, the contents of its template
+    and the versions of latex and dvisvgm.
+
+    Expressions missing from the cache are compiled in batches: all
+    expressions sharing a template are written to a single multi-page
+    document, so that latex runs once per batch rather than once per
+    expression, then each page is converted to its own svg by dvisvgm.
+    Independent latex and dvisvgm runs are spread over a pool of
+    worker threads.  If a batch fails to compile, its expressions are
+    compiled one at a time, so that errors point at the culprit.
+    """
+    CONFIG = {
+        "tex_dir" : TEX_DIR,
+        "num_workers" : None, #Defaults to number of cpus
+        "max_expressions_per_batch" : 64,
+    }
+    def __init__(self, **kwargs):
+        digest_config(self, kwargs)
+        if self.num_workers is None:
+            self.num_workers = mp.cpu_count()
+
+    def get_file_base(self, expression, template_tex_file):
+        return os.path.join(
+            self.tex_dir,
+            tex_hash(expression, template_tex_file)
+        )
+
+    def get_svg_file(self, expression, template_tex_file):
+        return self.get_file_base(expression, template_tex_file) + ".svg"
+
+    def compile(self, expression, template_tex_file):
+        return self.compile_all([(expression, template_tex_file)])[0]
+
+    def prefetch(self, expressions_and_templates):
+        """
+        Makes sure every (expression, template_tex_file) pair has
+        an svg on disk, without loading any of them.
+        """
+        self.compile_all(expressions_and_templates)
+        return self
+
+    def compile_all(self, expressions_and_templates):
+        """
+        Returns the svg files of a list of (expression, template_tex_file)
+        pairs, compiling all those which are not cached yet.
+        """
+        svg_files = [
+            self.get_svg_file(expression, template_tex_file)
+            for expression, template_tex_file in expressions_and_templates
+        ]
+        missing = {}
+        for (expression, template_tex_file), svg_file in zip(expressions_and_templates, svg_files):
+            if not os.path.exists(svg_file):
+                missing.setdefault(template_tex_file, {})[svg_file] = expression
+        batches = []
+        for template_tex_file, svg_files_to_expressions in missing.items():
+            expressions = svg_files_to_expressions.values()
+            size = self.max_expressions_per_batch
+            batches += [
+                (template_tex_file, expressions[i:i+size])
+                for i in range(0, len(expressions), size)
+            ]
+        if len(batches) > 0:
+            pages = self.map(self.compile_batch, batches)
+            self.map(self.convert_page, sum(pages, []))
+        return svg_files
+
+    def map(self, function, jobs):
+        if len(jobs) == 1 or self.num_workers == 1:
+            return map(function, jobs)
+        pool = ThreadPool(min(len(jobs), self.num_workers))
+        try:
+            return pool.map(function, jobs)
+        finally:
+            pool.close()
+            pool.join()
+
+    def compile_batch(self, batch):
+        """
+        Runs latex on a batch of expressions sharing a template, and
+        returns (dvi_file, page, svg_file) for each of them.
+        """
+        template_tex_file, expressions = batch
+        if len(expressions) > 1 and is_batchable_template(template_tex_file):
+            dvi_file = self.compile_batch_document(template_tex_file, expressions)
+            if dvi_file is not None:
+                return [
+                    (dvi_file, page, self.get_svg_file(expression, template_tex_file))
+                    for page, expression in enumerate(expressions, 1)
+                ]
+        return [
+            (self.compile_single_document(expression, template_tex_file), 1,
+             self.get_svg_file(expression, template_tex_file))
+            for expression in expressions
+        ]
+
+    def compile_single_document(self, expression, template_tex_file):
+        tex_file = self.get_file_base(expression, template_tex_file) + ".tex"
+        if not os.path.exists(tex_file):
+            print("Writing \"%s\" to %s"%(expression, tex_file))
+            write_file_atomically(tex_file, generate_tex_body(
+                expression, template_tex_file
+            ))
+        return tex_to_dvi(tex_file, self.tex_dir)
+
+    def compile_batch_document(self, template_tex_file, expressions):
+        """
+        Returns the dvi file holding one page per expression, or
+        None if latex fails on the batch.
+        """
+        batch_hash = tex_hash("\n".join(expressions), template_tex_file)
+        tex_file = os.path.join(self.tex_dir, "batch_" + batch_hash + ".tex")
+        dvi_file = tex_file.replace(".tex", ".dvi")
+        if not os.path.exists(dvi_file):
+            print("Writing %d expressions to %s"%(len(expressions), tex_file))
+            write_file_atomically(tex_file, generate_batch_tex_body(
+                expressions, template_tex_file
+            ))
+            exit_code = run_latex(tex_file, self.tex_dir)
+            if exit_code != 0 or get_num_dvi_pages(tex_file) != len(expressions):
+                if os.path.exists(dvi_file):
+                    os.remove(dvi_file)
+                return None
+        return dvi_file
+
+    def convert_page(self, page_info):
+        dvi_file, page, svg_file = page_info
+        dvi_to_svg(dvi_file, svg_file, page)
+        return svg_file
+
+def get_tex_compiler():
+    global TEX_COMPILER
+    if TEX_COMPILER is None:
+        TEX_COMPILER = TexCompiler()
+    return TEX_COMPILER
+
+def prefetch_tex(expressions_and_templates):
+    get_tex_compiler().prefetch(expressions_and_templates)
+
+def get_tex_tool_versions():
+    if len(TEX_TOOL_VERSIONS) == 0:
+        for command in TEX_TOOL_VERSION_COMMANDS:
+            try:
+                output = sp.check_output(command, stderr = sp.STDOUT)
+                TEX_TOOL_VERSIONS.append(output.split("\n")[0])
+            except (OSError, sp.CalledProcessError):
+                TEX_TOOL_VERSIONS.append("")
+    return TEX_TOOL_VERSIONS
+
+def get_template_contents(template_tex_file):
+    key = (template_tex_file, os.path.getmtime(template_tex_file))
+    if key not in TEMPLATE_CONTENTS:
+        with open(template_tex_file, "r") as infile:
+            TEMPLATE_CONTENTS[key] = infile.read()
+    return TEMPLATE_CONTENTS[key]
+
+def tex_hash(expression, template_tex_file):
+    hasher = hashlib.sha1()
+    for string in [
+        str(TEX_CACHE_VERSION),
+        expression,
+        get_template_contents(template_tex_file),
+    ] + get_tex_tool_versions():
+        #Length prefixes keep the boundaries between parts unambiguous
+        hasher.update("%d:%s"%(len(string), string))
+    return hasher.hexdigest()
+
+def generate_tex_body(expression, template_tex_file):
+    return get_template_contents(template_tex_file).replace(
+        TEX_TEXT_TO_REPLACE, expression
+    )
+
+def split_template(template_tex_file):
+    """
+    Returns the preamble of a template, and the part
+    of its body surrounding the text to replace.
+    """
+    body = get_template_contents(template_tex_file)
+    preamble, body = body.split("\\begin{document}", 1)
+    body = body.split("\\end{document}", 1)[0]
+    return preamble, body
+
+def is_batchable_template(template_tex_file):
+    body = get_template_contents(template_tex_file)
+    return all([
+        re.search(r"\\documentclass(\[[^\]]*\])?\{standalone\}", body),
+        body.count("\\begin{document}") == 1,
+        body.count("\\end{document}") == 1,
+        TEX_TEXT_TO_REPLACE in body,
+    ])
+
+def generate_batch_tex_body(expressions, template_tex_file):
+    """
+    With the multi option, the standalone class puts each
+    standalone environment on its own page, cropped just as
+    a document on its own would be.
+    """
+    preamble, body = split_template(template_tex_file)
+    return "".join([
+        "\\PassOptionsToClass{multi}{standalone}\n",
+        preamble,
+        "\\begin{document}\n",
+    ] + [
+        "\\begin{standalone}%s\\end{standalone}\n"%(
+            body.replace(TEX_TEXT_TO_REPLACE, expression)
+        )
+        for expression in expressions
+    ] + [
+        "\\end{document}\n",
+    ])
+
+def write_file_atomically(file_name, contents):
+    temp_file_name = file_name + ".%d.temp"%os.getpid()
+    with open(temp_file_name, "w") as outfile:
+        outfile.write(contents)
+    os.rename(temp_file_name, file_name)
+
+def get_null():
+    if os.name == "nt":
+        return "NUL"
+    return "/dev/null"
+
+def run_latex(tex_file, output_directory):
+    commands = [
+        "latex",
+        "-interaction=batchmode",
+        "-halt-on-error",
+        "-output-directory=" + output_directory,
+        tex_file,
+    ]
+    with open(get_null(), "w") as null:
+        try:
+            return sp.call(commands, stdout = null, stderr = null)
+        except OSError:
+            return -1
+
+def get_num_dvi_pages(tex_file):
+    log_file = tex_file.replace(".tex", ".log")
+    if not os.path.exists(log_file):
+        return 0
+    with open(log_file, "r") as infile:
+        match = re.search(r"Output written on .*\((\d+) page", infile.read())
+    if match is None:
+        return 0
+    return int(match.group(1))
+
+def tex_to_dvi(tex_file, output_directory = TEX_DIR):
+    result = tex_file.replace(".tex", ".dvi")
+    if not os.path.exists(result):
+        exit_code = run_latex(tex_file, output_directory)
+        if exit_code != 0:
+            log_file = tex_file.replace(".tex", ".log")
+            raise Exception(
+                "Latex error converting to dvi. "
+                "See log output above or the log file: %s" % log_file)
+    return result
+
+def dvi_to_svg(dvi_file, svg_file = None, page = 1):
+    """
+    Converts one page of a dvi file into an svg file, written
+    next to the dvi file unless svg_file is given.
+    """
+    if svg_file is None:
+        svg_file = dvi_file.replace(".dvi", ".svg")
+    if not os.path.exists(svg_file):
+        temp_svg_file = svg_file + ".%d.temp.svg"%os.getpid()
+        commands = [
+            "dvisvgm",
+            dvi_file,
+            "--page=%d"%page,
+            "-n",
+            "-v",
+            "0",
+            "-o",
+            temp_svg_file,
+        ]
+        with open(get_null(), "w") as null:
+            sp.call(commands, stdout = null, stderr = null)
+        if os.path.exists(temp_svg_file):
+            os.rename(temp_svg_file, svg_file)
+    return svg_file
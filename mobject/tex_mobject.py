@@ -3,6 +3,7 @@ from helpers import *
 from vectorized_mobject import VMobject, VGroup, VectorizedPoint
 from svg_mobject import SVGMobject, VMobjectFromSVGPathstring
 from topics.geometry import BackgroundRectangle
+from tex_compiler import *
 
 import collections
 import sys
@@ -324,84 +325,37 @@ class BulletedList(TextMobject):
 
 ##########
 
-def tex_hash(expression, template_tex_file):
-    return str(hash(expression + template_tex_file))
-
 def tex_to_svg_file(expression, template_tex_file):
-    image_dir = os.path.join(
-        TEX_IMAGE_DIR,
-        tex_hash(expression, template_tex_file)
-    )
-    if os.path.exists(image_dir):
-        return get_sorted_image_list(image_dir)
-    tex_file = generate_tex_file(expression, template_tex_file)
-    dvi_file = tex_to_dvi(tex_file)
-    return dvi_to_svg(dvi_file)
-
-def generate_tex_file(expression, template_tex_file):
-    result = os.path.join(
-        TEX_DIR,
-        tex_hash(expression, template_tex_file)
-    ) + ".tex"
-    if not os.path.exists(result):
-        print("Writing \"%s\" to %s"%(
-            "".join(expression), result
-        ))
-        with open(template_tex_file, "r") as infile:
-            body = infile.read()
-            body = body.replace(TEX_TEXT_TO_REPLACE, expression)
-        with open(result, "w") as outfile:
-            outfile.write(body)
-    return result
+    return get_tex_compiler().compile(expression, template_tex_file)
 
-def get_null():
-    if os.name == "nt":
-        return "NUL"
-    return "/dev/null"
-
-def tex_to_dvi(tex_file):
-    result = tex_file.replace(".tex", ".dvi")
-    if not os.path.exists(result):
-        commands = [
-            "latex",
-            "-interaction=batchmode",
-            "-halt-on-error",
-            "-output-directory=" + TEX_DIR,
-            tex_file,
-            ">",
-            get_null()
-        ]
-        exit_code = os.system(" ".join(commands))
-        if exit_code != 0:
-            latex_output = ''
-            log_file = tex_file.replace(".tex", ".log")
-            if os.path.exists(log_file):
-                with open(log_file, 'r') as f:
-                    latex_output = f.read()
-            raise Exception(
-                "Latex error converting to dvi. "
-                "See log output above or the log file: %s" % log_file)
+def get_tex_expressions(tex_mobject_class, args, **kwargs):
+    """
+    Returns the (expression, template_tex_file) pairs which
+    tex_mobject_class(*args, **kwargs) would compile, without
+    compiling anything.
+    """
+    tex_mob = tex_mobject_class.__new__(tex_mobject_class)
+    digest_config(tex_mob, kwargs, {"args" : list(args)})
+    result = [(tex_mob.get_modified_expression(), tex_mob.template_tex_file)]
+    if len(args) > 1:
+        #See handle_multiple_args
+        for arg in args:
+            result += get_tex_expressions(
+                TexMobject, [arg], **tex_mobject_class.CONFIG
+            )
     return result
 
-def dvi_to_svg(dvi_file, regen_if_exists = False):
+def prefetch_tex_mobjects(tex_mobject_args, tex_mobject_class = TexMobject, **kwargs):
     """
-    Converts a dvi, which potentially has multiple slides, into a
-    directory full of enumerated pngs corresponding with these slides.
-    Returns a list of PIL Image objects for these images sorted as they
-    where in the dvi
+    Compiles, in batches, everything needed by the mobjects
+    tex_mobject_class(*args, **kwargs) for each entry of
+    tex_mobject_args, which is either a string or a list of them.
     """
-    result = dvi_file.replace(".dvi", ".svg")
-    if not os.path.exists(result):
-        commands = [
-            "dvisvgm",
-            dvi_file,
-            "-n",
-            "-v",
-            "0",
-            "-o",
-            result,
-            ">",
-            get_null()
-        ]
-        os.system(" ".join(commands))
-    return result
+    expressions_and_templates = []
+    for args in tex_mobject_args:
+        if isinstance(args, str):
+            args = [args]
+        expressions_and_templates += get_tex_expressions(
+            tex_mobject_class, args, **kwargs
+        )
+    prefetch_tex(expressions_and_templates)
@@ -1,6 +1,6 @@
 import re
 
-from mobject import Mobject
+from mobject import Mobject, style_attribute
 
 from helpers import *
 
@@ -19,6 +19,13 @@ class VMobject(Mobject):
         "make_smooth_after_applying_functions" : False,
         "background_image_file" : None,
     }
+    fill_rgb = style_attribute("fill_rgb")
+    fill_opacity = style_attribute("fill_opacity")
+    stroke_rgb = style_attribute("stroke_rgb")
+    is_subpath = style_attribute("is_subpath")
+    mark_paths_closed = style_attribute("mark_paths_closed")
+    background_image_file = style_attribute("background_image_file")
+    shade_in_3d = style_attribute("shade_in_3d")
 
     def get_group_class(self):
         return VGroup
@@ -173,8 +180,7 @@ class VMobject(Mobject):
     def start_at(self, point):
         if len(self.points) == 0:
             self.points = np.zeros((1, 3))
-        self.points[0] = point
-        return self
+        return self.write_points(0, point)
 
     def add_control_points(self, control_points):
         assert(len(control_points) % 3 == 0)
@@ -192,11 +198,12 @@ class VMobject(Mobject):
         assert(len(anchors) == len(handles1)+1)
         assert(len(anchors) == len(handles2)+1)
         total_len = 3*(len(anchors)-1) + 1
-        self.points = np.zeros((total_len, self.dim))
-        self.points[0] = anchors[0]
+        points = np.zeros((total_len, self.dim))
+        points[0] = anchors[0]
         arrays = [handles1, handles2, anchors[1:]]
         for index, array in enumerate(arrays):
-            self.points[index+1::3] = array
+            points[index+1::3] = array
+        self.points = points
         return self.points
 
     def set_points_as_corners(self, points):
@@ -324,8 +331,8 @@ class VMobject(Mobject):
         num_cubics = self.get_num_anchor_points()-1
         interpoint_alpha = num_cubics*(alpha % (1./num_cubics))
         index = min(3*int(alpha*num_cubics), 3*num_cubics)
-        cubic = bezier(self.points[index:index+4])
-        return cubic(interpoint_alpha)
+        control_points = [self.points[index:index+4]]
+        return evaluate_beziers(control_points, [interpoint_alpha])[0, 0]
 
     def get_anchors_and_handles(self):
         return [
@@ -365,7 +372,6 @@ class VMobject(Mobject):
         if curr == 1:
             self.points = np.repeat(self.points, 3*n+1, axis = 0)
             return self
-        points = np.array([self.points[0]])
         num_curves = curr-1
         #Curves in self are buckets, and we need to know 
         #how many new anchor points to put into each one.  
@@ -373,18 +379,15 @@ class VMobject(Mobject):
         #and its value tells you the appropriate index of 
         #the smaller curve.
         index_allocation = (np.arange(curr+n-1) * num_curves)/(curr+n-1)
-        for index in range(num_curves):
-            curr_bezier_points = self.points[3*index:3*index+4]
-            num_inter_curves = sum(index_allocation == index)
-            alphas = np.linspace(0, 1, num_inter_curves+1)
-            # alphas = np.arange(0, num_inter_curves+1)/float(num_inter_curves)
-            for a, b in zip(alphas, alphas[1:]):
-                new_points = partial_bezier_points(
-                    curr_bezier_points, a, b
-                )
-                points = np.append(
-                    points, new_points[1:], axis = 0
-                )
+        new_curves = subdivide_beziers(
+            get_cubic_control_points(self.points),
+            np.bincount(index_allocation, minlength = num_curves),
+        )
+        points = np.append(
+            self.points[:1],
+            new_curves[:,1:].reshape((-1, self.dim)),
+            axis = 0
+        )
         self.set_points(points)
         return self
     
@@ -398,14 +401,16 @@ class VMobject(Mobject):
             return VectorizedPoint(submobject.points[0])
         return submobject.copy()
     
-    def interpolate_color(self, mobject1, mobject2, alpha):
-        attrs = [
+    def get_style_attrs(self):
+        return [
             "stroke_rgb", 
             "stroke_width",            
             "fill_rgb", 
             "fill_opacity",
         ]
-        for attr in attrs:
+
+    def interpolate_color(self, mobject1, mobject2, alpha):
+        for attr in self.get_style_attrs():
             setattr(self, attr, interpolate(
                 getattr(mobject1, attr),
                 getattr(mobject2, attr),
@@ -61,7 +61,7 @@ class PhotonScene(Scene):
         nudge_sizes = 0.1*np.sin(2*np.pi*times)
         thick_nudge_sizes = nudge_sizes.repeat(3).reshape((len(nudge_sizes), 3))
         nudges = thick_nudge_sizes*normal_vectors
-        result.points[1:] += nudges
+        result.write_points(slice(1, None), result.points[1:] + nudges)
         return result
 
 
@@ -336,6 +336,7 @@ class ShowLightAndSlidingObject(MultilayeredScene, TryManyPaths, PhotonScene):
                 path.stretch(0.7, 1)
                 path.shift(self.top - path.get_top())
             path.rgbas[:,2] = 0
+            path.mark_style_changed()
         loop = paths.pop(1) ##Bad!
         randy = Randolph()
         randy.scale(RANDY_SCALE_FACTOR)
@@ -3112,9 +3112,11 @@ class IntroduceBlockChain(Scene):
                 0
             ])
             arrow = Arrow(end+LEFT, end, buff = SMALL_BUFF)
-            arrow.points[0] = block.get_right()
-            arrow.points[1] = block.get_right() + RIGHT
-            arrow.points[2] = end + LEFT + SMALL_BUFF*UP
+            arrow.write_points(slice(0, 3), [
+                block.get_right(),
+                block.get_right() + RIGHT,
+                end + LEFT + SMALL_BUFF*UP,
+            ])
             new_arrows.add(arrow)
 
         for i in range(3):
@@ -3305,10 +3307,11 @@ class DistributedBlockChainScene(DistributedLedgerScene):
                 b2.get_left(), b2.get_corner(UP+LEFT), 0.8
             )
             arrow.next_to(target_point, LEFT, 0.5*SMALL_BUFF)
-            arrow.points[0] = b1.get_right()
-            arrow.points[1] = b2.get_left()
-            arrow.points[2] = b1.get_corner(UP+RIGHT)
-            arrow.points[2] += SMALL_BUFF*LEFT
+            arrow.write_points(slice(0, 3), [
+                b1.get_right(),
+                b2.get_left(),
+                b1.get_corner(UP+RIGHT) + SMALL_BUFF*LEFT,
+            ])
             arrows.add(arrow)
         block_chain = VGroup(blocks, arrows)
         block_chain.blocks = blocks
@@ -4295,9 +4298,13 @@ class AliceRacesOtherMiners(DoubleSpendingAttack):
         block.target.shift(dist*DOWN)
         ff_head.target.shift(dist*UP)
         arrow.target[1].shift(dist*DOWN)
-        arrow.target.points[-2:] += dist*DOWN
+        arrow.target.write_points(
+            slice(-2, None), arrow.target.points[-2:] + dist*DOWN
+        )
         ff_arrow.target[1].shift(dist*UP)
-        ff_arrow.target.points[-2:] += dist*UP
+        ff_arrow.target.write_points(
+            slice(-2, None), ff_arrow.target.points[-2:] + dist*UP
+        )
 
         self.play(
             Broadcast(block),
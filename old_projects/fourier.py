@@ -723,7 +723,7 @@ class UnmixMixedPaint(Scene):
         mud_circle.scale(0)
 
         def update_quadrant(quadrant, alpha):
-            points = quadrant.get_anchors()
+            points = np.array(quadrant.get_anchors())
             dt = 0.03 #Hmm, this has no dependency on frame rate...
             norms = np.apply_along_axis(np.linalg.norm, 1, points)
 
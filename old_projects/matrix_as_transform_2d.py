@@ -231,7 +231,10 @@ class ShowMatrixTransform(TransformScene2D):
         if show_matrix:
             self.add(matrix_mobject(matrix).to_corner(UP+LEFT))
         def func(mobject):
-            mobject.points[:, :2] = np.dot(mobject.points[:, :2], np.transpose(matrix))
+            mobject.write_points(
+                (slice(None), slice(0, 2)),
+                np.dot(mobject.points[:, :2], np.transpose(matrix))
+            )
             return mobject
 
         self.wait()
@@ -463,7 +466,10 @@ class ShowMatrixTransformWithDot(TransformScene2D):
         if show_matrix:
             self.add(matrix_mobject(matrix).to_corner(UP+LEFT))
         def func(mobject):
-            mobject.points[:, :2] = np.dot(mobject.points[:, :2], np.transpose(matrix))
+            mobject.write_points(
+                (slice(None), slice(0, 2)),
+                np.dot(mobject.points[:, :2], np.transpose(matrix))
+            )
             return mobject
         dot = Dot((-1, 2, 0), color = "yellow")
         self.add(dot)
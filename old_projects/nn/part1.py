@@ -351,6 +351,7 @@ def make_transparent(image_mob):
     )
     image_mob.highlight(WHITE)
     image_mob.pixel_array[:,:,3] = alpha_vect
+    image_mob.mark_style_changed()
     return image_mob
 
 ###############################
@@ -1577,6 +1578,7 @@ class BreakUpMacroPatterns(IntroduceEachLayer):
             mob.save_state()
             mob.move_to(nine)
         right_line[1].pixel_array[:14,:,3] = 0
+        right_line[1].mark_style_changed()
 
         self.play(FadeIn(nine))
         self.wait()
@@ -1758,6 +1760,7 @@ class BreakUpMacroPatterns(IntroduceEachLayer):
         )
         image_mob.highlight(WHITE)
         image_mob.pixel_array[:,:,3] = alpha_vect
+        image_mob.mark_style_changed()
         return image_mob
 
 class GenerallyLoopyPattern(Scene):
@@ -1967,6 +1970,7 @@ class SecondLayerIsLittleEdgeLayer(IntroduceEachLayer):
             mob.highlight(color)
             mob.replace(self.nine[1])
         line.pixel_array[:14,:,:] = 0
+        line.mark_style_changed()
 
         self.pattern_colored_nine = Group(loop, line)
         self.pattern_colored_nine.next_to(layers[2], UP)
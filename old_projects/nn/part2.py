@@ -3670,7 +3670,10 @@ class CompareLearningCurves(GraphScene):
         )
         for decrease, p in (slow_decrease, 0.2), (faster_decrease, 0.07):
             y_vals = decrease.get_anchors()[:,1]
-            y_vals -= np.cumsum(p*np.random.random(len(y_vals)))
+            decrease.write_points(
+                (slice(None, None, 3), 1),
+                y_vals - np.cumsum(p*np.random.random(len(y_vals)))
+            )
             decrease.make_jagged()
         faster_decrease.move_to(slow_decrease, UP+LEFT)
 
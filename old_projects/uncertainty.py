@@ -265,7 +265,7 @@ class RadarPulseSingleton(ContinualAnimation):
             point_distances = np.dot(self.direction, arc.points.T)
             diffs = point_distances - self.reflection_distance
             shift_vals = np.outer(-2*np.maximum(diffs, 0), self.direction)
-            arc.points += shift_vals
+            arc.points = arc.points + shift_vals
 
             #Check if done
             arc_point = arc.get_edge_center(-self.direction)
@@ -975,8 +975,8 @@ class TwoCarsAtRedLight(Scene):
         new_frequency_graph.match_color(self.frequency_graph)
 
         def pin_freq_graph_end_points(freq_graph):
-            freq_graph.points[0] = frequency_axes.coords_to_point(0, 0)
-            freq_graph.points[-1] = frequency_axes.coords_to_point(2, 0)
+            freq_graph.write_points(0, frequency_axes.coords_to_point(0, 0))
+            freq_graph.write_points(-1, frequency_axes.coords_to_point(2, 0))
 
         self.play(LaggedStart(
             FadeOut, VGroup(
@@ -1015,8 +1015,8 @@ class DeformToInterval(ClosedLoopScene):
         self.loop.to_edge(UP)
         original_loop = self.loop.copy()
         cut_loop = self.loop.copy()
-        cut_loop.points[0] += 0.3*(UP+RIGHT)
-        cut_loop.points[-1] += 0.3*(DOWN+RIGHT)
+        cut_loop.write_points(0, cut_loop.points[0] + 0.3*(UP+RIGHT))
+        cut_loop.write_points(-1, cut_loop.points[-1] + 0.3*(DOWN+RIGHT))
 
         #Unwrap loop
         self.transform_loop(cut_loop, path_arc = np.pi)
@@ -0,0 +1,86 @@
+import numpy as np
+import threading
+import Queue
+import time
+
+from helpers import *
+
+class FrameWriter(object):
+    """
+    Feeds frames to an output stream (typically the stdin of an
+    ffmpeg process) from a background thread, so that encoding
+    overlaps with rasterization of the following frames.
+
+    Frames are handed to that thread as they are, and written to the
+    stream through the buffer protocol without any copy, so a frame
+    must not be modified once written.  Scene.get_frame returns a
+    new array each time.  When buffer_size frames are waiting to be
+    written, write blocks until the stream catches up.
+    """
+    CONFIG = {
+        "buffer_size" : 4,
+    }
+    def __init__(self, output_stream, **kwargs):
+        digest_config(self, kwargs, locals())
+        self.frame_queue = Queue.Queue(self.buffer_size)
+        self.error = None
+        self.num_frames_written = 0
+        self.max_queue_depth = 0
+        self.time_blocked = 0.
+        self.thread = threading.Thread(target = self.write_loop)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def write(self, frame):
+        self.raise_error_if_any()
+        #Only copies frames which are not contiguous
+        frame = np.ascontiguousarray(frame)
+        try:
+            self.frame_queue.put_nowait(frame)
+        except Queue.Full:
+            #Back-pressure, wait for the writing thread to catch up
+            start_time = time.time()
+            self.frame_queue.put(frame)
+            self.time_blocked += time.time() - start_time
+        self.max_queue_depth = max(
+            self.max_queue_depth, self.frame_queue.qsize()
+        )
+        return self
+
+    def write_loop(self):
+        while True:
+            frame = self.frame_queue.get()
+            if frame is None:
+                return
+            if self.error is None:
+                try:
+                    self.output_stream.write(frame.data)
+                    self.num_frames_written += 1
+                except Exception as err:
+                    #Keep draining so that the render thread
+                    #never blocks on a dead stream
+                    self.error = err
+
+    def raise_error_if_any(self):
+        if self.error is not None:
+            raise Exception(
+                "Error writing frame to movie pipe: %s"%str(self.error)
+            )
+
+    def get_queue_depth(self):
+        return self.frame_queue.qsize()
+
+    def get_stats(self):
+        return {
+            "num_frames_written" : self.num_frames_written,
+            "queue_depth" : self.get_queue_depth(),
+            "max_queue_depth" : self.max_queue_depth,
+            "buffer_size" : self.buffer_size,
+            "time_blocked" : self.time_blocked,
+        }
+
+    def close(self):
+        self.frame_queue.put(None)
+        self.thread.join()
+        self.raise_error_if_any()
+        return self
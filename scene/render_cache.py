@@ -0,0 +1,392 @@
+import numpy as np
+import hashlib
+import struct
+import types
+import zlib
+import os
+import sys
+
+from helpers import *
+from mobject import Mobject
+from animation import Animation
+from animation.continual_animation import ContinualAnimation
+from camera import Camera
+
+#Caches kept by mobjects, which say nothing about how they look
+MOBJECT_BOOKKEEPING_ATTRS = [
+    "points_version",
+    "style_version",
+    "own_bounding_box",
+    "family_bounding_box",
+    "packed_family_points",
+]
+
+#Caches kept by animations
+ANIMATION_BOOKKEEPING_ATTRS = [
+    "interpolation_plan",
+]
+
+#Bump whenever the way keys or entries are written changes
+RENDER_CACHE_VERSION = 4
+
+#Code which every scene runs on, relative to THIS_DIR.  Rather than
+#through their classes and functions, these are described by a hash
+#of their sources, so that editing any of them invalidates the cache.
+LIBRARY_PATHS = [
+    "animation", "camera", "container", "mobject", "scene", "topics",
+    "bezier_kernels.py", "constants.py", "helpers.py",
+]
+
+#Filled by get_library_hash the first time it is called
+LIBRARY_HASH = []
+
+class UnhashableStateException(Exception):
+    pass
+
+class RenderCache(object):
+    """
+    Persistent on-disk store of the frames rendered by Scene.play
+    calls, so that re-rendering a scene after editing one of its
+    animations only rasterizes the plays which actually changed.
+
+    Each entry is keyed by a hash of everything the frames of a play
+    depend on: the animations together with their mobjects (starting
+    and target data included), the camera and its configuration, the
+    frame duration, the static background image, and the code of both
+    the library and the classes the scene defines.  Frames are stored
+    zlib compressed, one file per play, and the least recently used
+    entries are evicted once the cache grows past max_size.
+    """
+    CONFIG = {
+        "directory" : RENDER_CACHE_DIR,
+        "max_size" : 2**30, #In bytes
+        "compression_level" : 1,
+    }
+    def __init__(self, **kwargs):
+        digest_config(self, kwargs)
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+
+    def get_play_key(self, scene, animations, moving_mobjects, static_image):
+        return get_state_hash(
+            scene.frame_duration,
+            scene.camera,
+            animations,
+            moving_mobjects,
+            static_image,
+        )
+
+    def get_entry_path(self, key):
+        return os.path.join(self.directory, key + ".frames")
+
+    def contains(self, key):
+        return os.path.exists(self.get_entry_path(key))
+
+    def get_frames(self, key):
+        """
+        Generator over the frames stored under key, marking
+        the entry as recently used.
+        """
+        path = self.get_entry_path(key)
+        os.utime(path, None)
+        with open(path, "rb") as entry_file:
+            header = entry_file.readline().split()
+            dtype = np.dtype(header[0])
+            shape = tuple(map(int, header[1:]))
+            while True:
+                size_bytes = entry_file.read(8)
+                if len(size_bytes) < 8:
+                    return
+                size = struct.unpack("<Q", size_bytes)[0]
+                data = zlib.decompress(entry_file.read(size))
+                yield np.frombuffer(data, dtype = dtype).reshape(shape)
+
+    def open_entry(self, key):
+        return RenderCacheEntry(self, key)
+
+    def get_entry_paths(self):
+        return [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(".frames")
+        ]
+
+    def get_size(self):
+        return sum(map(os.path.getsize, self.get_entry_paths()))
+
+    def prune(self):
+        """
+        Deletes least recently used entries until the whole
+        cache fits within max_size.
+        """
+        paths = sorted(self.get_entry_paths(), key = os.path.getmtime)
+        total_size = sum(map(os.path.getsize, paths))
+        for path in paths:
+            if total_size <= self.max_size:
+                break
+            total_size -= os.path.getsize(path)
+            os.remove(path)
+        return self
+
+    def clear(self):
+        for path in self.get_entry_paths():
+            os.remove(path)
+        return self
+
+class RenderCacheEntry(object):
+    """
+    Frames are written to a temporary file which only replaces
+    the entry under its key once close is called, so that
+    interrupted renders never leave a partial entry behind.
+    """
+    def __init__(self, cache, key):
+        self.cache = cache
+        self.key = key
+        self.path = cache.get_entry_path(key)
+        self.temp_path = self.path + ".%d.temp"%os.getpid()
+        self.file = open(self.temp_path, "wb")
+        self.frame_shape = None
+
+    def write(self, frame):
+        if self.frame_shape is None:
+            self.frame_shape = frame.shape
+            self.file.write("%s %s\n"%(
+                frame.dtype.str,
+                " ".join(map(str, frame.shape))
+            ))
+        data = zlib.compress(
+            np.ascontiguousarray(frame).tostring(),
+            self.cache.compression_level
+        )
+        self.file.write(struct.pack("<Q", len(data)))
+        self.file.write(data)
+
+    def close(self):
+        self.file.close()
+        if self.frame_shape is None:
+            os.remove(self.temp_path)
+        else:
+            os.rename(self.temp_path, self.path)
+            self.cache.prune()
+
+    def discard(self):
+        self.file.close()
+        os.remove(self.temp_path)
+
+def get_state_hash(*values):
+    hasher = hashlib.sha1()
+    memo = {}
+    for value in (RENDER_CACHE_VERSION, get_library_hash()) + values:
+        update_hash(hasher, value, memo)
+    return hasher.hexdigest()
+
+def get_library_hash():
+    if len(LIBRARY_HASH) == 0:
+        hasher = hashlib.sha1()
+        for path in sorted(get_library_source_files()):
+            hasher.update(os.path.relpath(path, THIS_DIR))
+            with open(path, "rb") as source_file:
+                hasher.update(hashlib.sha1(source_file.read()).digest())
+        LIBRARY_HASH.append(hasher.hexdigest())
+    return LIBRARY_HASH[0]
+
+def get_library_source_files():
+    result = []
+    for library_path in LIBRARY_PATHS:
+        path = os.path.join(THIS_DIR, library_path)
+        if os.path.isfile(path):
+            result.append(path)
+        for directory, dir_names, file_names in os.walk(path):
+            result += [
+                os.path.join(directory, name)
+                for name in file_names
+                if name.endswith(".py")
+            ]
+    return result
+
+def is_library_class(cls):
+    """
+    Whether cls comes from the library, or from python and the
+    packages installed for it, as opposed to from a scene file.
+    """
+    module = sys.modules.get(cls.__module__)
+    module_file = getattr(module, "__file__", None)
+    if module_file is None:
+        return True
+    module_file = os.path.realpath(module_file)
+    installed_directories = [
+        os.path.realpath(prefix)
+        for prefix in [
+            sys.prefix, sys.exec_prefix,
+            getattr(sys, "real_prefix", sys.prefix), #Within a virtualenv
+        ]
+    ]
+    if any([module_file.startswith(d + os.sep) for d in installed_directories]):
+        return True
+    if not module_file.startswith(THIS_DIR + os.sep):
+        return False
+    relative_path = os.path.relpath(module_file, THIS_DIR)
+    if relative_path.endswith(".pyc"):
+        relative_path = relative_path[:-1]
+    return any([
+        relative_path == library_path or
+        relative_path.startswith(library_path + os.sep)
+        for library_path in LIBRARY_PATHS
+    ])
+
+def get_live_state_hash(*values):
+    """
+    Like get_state_hash, except that mobjects are described only by
+    the versions of their points and style together with their
+    arrays, and arrays by a crc32 checksum.  Much cheaper, but only
+    meaningful within the current process.  Checking the arrays
+    catches in place writes into them that nothing marked.
+    """
+    hasher = hashlib.sha1()
+    memo = {}
+    for value in values:
+        update_hash(hasher, value, memo, live = True)
+    return hasher.hexdigest()
+
+def update_hash(hasher, value, memo, live = False):
+    """
+    Feeds a description of value into hasher.  Mobjects, animations,
+    continual animations and cameras are described through their
+    class and attributes, functions through their code, defaults,
+    closures and the globals they read, and classes from scene files
+    through the methods and attributes along their mro.  Library
+    classes, modules and builtin functions are described by name,
+    get_state_hash accounting for the library's code.  Objects
+    reached more than once are referred to by the order in which
+    they were first seen.  Values of any other type raise an
+    UnhashableStateException, as describing them by their type
+    alone would give the same hash to different states.
+    """
+    if isinstance(value, (types.NoneType, bool, int, long, float, str, unicode)):
+        hasher.update(repr(value))
+        return
+    if id(value) in memo:
+        hasher.update("@%d"%memo[id(value)][0])
+        return
+    #Keeping value alive guarantees its id is not reused
+    memo[id(value)] = (len(memo), value)
+    hasher.update(type(value).__name__)
+    if isinstance(value, np.ndarray):
+        hasher.update(value.dtype.str + str(value.shape))
+        if live:
+            hasher.update(str(zlib.crc32(np.ascontiguousarray(value).data)))
+        else:
+            hasher.update(np.ascontiguousarray(value).data)
+    elif isinstance(value, np.generic):
+        hasher.update(repr(value))
+    elif isinstance(value, (list, tuple)):
+        hasher.update(str(len(value)))
+        for item in value:
+            update_hash(hasher, item, memo, live)
+    elif isinstance(value, (set, frozenset)):
+        #Items are told apart by their own hash, whatever their order
+        hasher.update("".join(sorted([
+            get_item_hash(item, live) for item in value
+        ])))
+    elif isinstance(value, dict):
+        keys = sorted(value.keys())
+        update_hash(hasher, keys, memo, live)
+        for key in keys:
+            update_hash(hasher, value[key], memo, live)
+    elif isinstance(value, Color):
+        hasher.update(value.get_hex_l())
+    elif isinstance(value, types.FunctionType):
+        code = value.func_code
+        hasher.update(code.co_code)
+        update_hash(hasher, code.co_consts, memo, live)
+        update_hash(hasher, code.co_names, memo, live)
+        update_hash(hasher, value.func_defaults, memo, live)
+        update_hash(hasher, [
+            cell.cell_contents
+            for cell in (value.func_closure or [])
+        ], memo, live)
+        update_hash(hasher, [
+            value.func_globals[name]
+            for name in code.co_names
+            if name in value.func_globals
+        ], memo, live)
+    elif isinstance(value, types.MethodType):
+        update_hash(hasher, value.im_func, memo, live)
+        update_hash(hasher, value.im_self, memo, live)
+    elif isinstance(value, types.CodeType):
+        hasher.update(value.co_code)
+        update_hash(hasher, value.co_consts, memo, live)
+    elif isinstance(value, Camera):
+        update_hash(hasher, type(value), memo, live)
+        #What the camera has drawn so far is left out
+        update_hash(hasher, dict([
+            (key, attr)
+            for key, attr in value.__dict__.items()
+            if key not in [
+                "pixel_array", "canvas", "compositor",
+                "mapped_points_cache",
+            ]
+        ]), memo, live)
+    elif isinstance(value, Mobject) and live:
+        hasher.update("%d %d"%(value.points_version, value.style_version))
+        update_hash(hasher, [
+            (key, attr)
+            for key, attr in sorted(value.__dict__.items())
+            if isinstance(attr, np.ndarray)
+            and key not in MOBJECT_BOOKKEEPING_ATTRS
+        ], memo, live)
+    elif isinstance(value, Mobject):
+        update_hash(hasher, type(value), memo, live)
+        update_hash(hasher, dict([
+            (key, attr)
+            for key, attr in value.__dict__.items()
+            if key not in MOBJECT_BOOKKEEPING_ATTRS
+        ]), memo, live)
+    elif isinstance(value, (Animation, ContinualAnimation)):
+        update_hash(hasher, type(value), memo, live)
+        update_hash(hasher, dict([
+            (key, attr)
+            for key, attr in value.__dict__.items()
+            if key not in ANIMATION_BOOKKEEPING_ATTRS
+        ]), memo, live)
+    elif isinstance(value, (type, types.ClassType)):
+        hasher.update("%s.%s"%(value.__module__, value.__name__))
+        for cls in inspect.getmro(value):
+            if is_library_class(cls):
+                continue
+            hasher.update(cls.__name__)
+            update_hash(hasher, dict([
+                (key, get_class_attribute_functions(attr))
+                for key, attr in cls.__dict__.items()
+                if key not in ["__dict__", "__weakref__", "__module__", "__doc__"]
+            ]), memo, live)
+    elif isinstance(value, types.ModuleType):
+        hasher.update(value.__name__)
+    elif isinstance(value, (types.BuiltinFunctionType, np.ufunc)):
+        hasher.update("%s.%s"%(
+            getattr(value, "__module__", ""), value.__name__
+        ))
+        #Bound builtin methods, like [].append, depend on their object
+        owner = getattr(value, "__self__", None)
+        if owner is not None and not isinstance(owner, types.ModuleType):
+            update_hash(hasher, owner, memo, live)
+    else:
+        raise UnhashableStateException(
+            "Cannot describe %s in a state hash"%type(value).__name__
+        )
+
+def get_class_attribute_functions(attr):
+    """
+    The functions behind static methods, class methods and
+    properties, and attr itself otherwise.
+    """
+    if isinstance(attr, (staticmethod, classmethod)):
+        return attr.__func__
+    if isinstance(attr, property):
+        return [attr.fget, attr.fset, attr.fdel]
+    return attr
+
+def get_item_hash(value, live = False):
+    hasher = hashlib.sha1()
+    update_hash(hasher, value, {}, live)
+    return hasher.hexdigest()
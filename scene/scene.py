@@ -10,12 +10,19 @@ import copy
 from tqdm import tqdm as ProgressDisplay
 import inspect
 import subprocess as sp
+import multiprocessing as mp
+import json
 
 from helpers import *
 
 from camera import Camera
 from tk_scene import TkSceneRoot
+from frame_writer import FrameWriter
+from render_cache import RenderCache, get_state_hash, get_live_state_hash
+from render_cache import UnhashableStateException
 from mobject import Mobject, VMobject
+from mobject.mobject import get_latest_families_version
+from mobject.tex_mobject import TexMobject, TextMobject, prefetch_tex_mobjects
 from animation import Animation
 from animation.transform import MoveToTarget
 from animation.continual_animation import ContinualAnimation
@@ -41,6 +48,41 @@ class Scene(Container):
         "start_at_animation_number" : None,
         "end_at_animation_number" : None,
         "include_render_quality_in_output_directory" : True,
+        # If True, the frames of each play call are rendered by a pool
+        # of forked processes.  This is only faithful to the serial path
+        # for animations whose state is purely a function of alpha,
+        # so scenes with continual animations are always rendered serially.
+        "render_frames_in_parallel" : False,
+        "num_render_processes" : None, #Defaults to number of cpus
+        "frames_per_render_chunk" : 8,
+        # Hand frames to ffmpeg from a background thread
+        "write_frames_asynchronously" : True,
+        "frame_writer_config" : {},
+        # Reuse frames of play calls rendered in previous runs
+        # whenever nothing they depend on has changed
+        "use_render_cache" : False,
+        "render_cache_config" : {},
+        # Encode each play and wait into its own partial movie file,
+        # keyed by a hash of the scene state, and concatenate them once
+        # the scene is done.  Partial movies whose key is unchanged
+        # from a previous run are reused rather than rendered again.
+        "write_partial_movies" : False,
+        # Strings (or lists of strings, for multiple args) which
+        # construct turns into TexMobjects and TextMobjects.  They
+        # are compiled in batches before construct is called.
+        "tex_to_prefetch" : [],
+        "text_to_prefetch" : [],
+        # Reuse the image of the mobjects which stay still during a
+        # play call from the previous one, so long as the same mobjects,
+        # with the same points and style, are drawn by the same camera.
+        # This relies on anything writing into the points or style
+        # arrays of a mobject in place calling mark_points_changed or
+        # mark_style_changed.
+        "use_static_layer_cache" : True,
+        # While playing animations, only restore the region of the
+        # static image covered by the moving mobjects in the previous
+        # frame, rather than copying the whole of it for every frame
+        "use_dirty_rectangles" : True,
     }
     def __init__(self, **kwargs):
         Container.__init__(self, **kwargs) # Perhaps allow passing in a non-empty *mobjects parameter?
@@ -54,6 +96,23 @@ class Scene(Container):
         self.frame_num = 0
         self.current_scene_time = 0
         self.original_skipping_status = self.skip_animations
+        if self.use_render_cache:
+            self.render_cache = RenderCache(**self.render_cache_config)
+        else:
+            self.render_cache = None
+        self.render_cache_entry = None
+        self.partial_movie_segments = []
+        self.current_movie_segment = None
+        #Whether this run rendered the scene from start to end
+        self.rendered_whole_scene = True
+        self.static_layer_cache = None
+        self.family_members_index = None
+        #(background, bounding_box) such that the camera's pixel
+        #array matches background outside of bounding_box
+        self.dirty_region = None
+        self.background_layer_mobjects = []
+        self.background_layer_image = None
+        self.background_layer_version = 0
         if self.name is None:
             self.name = self.__class__.__name__
         if self.random_seed is not None:
@@ -61,12 +120,13 @@ class Scene(Container):
             np.random.seed(self.random_seed)
 
         self.setup()
-        if self.write_to_movie:
+        self.prefetch_tex()
+        if self.write_to_movie and not self.write_partial_movies:
             self.open_movie_pipe()
         try:
             self.construct(*self.construct_args)
         except EndSceneEarlyException:
-            pass
+            self.rendered_whole_scene = False
 
         # Always tack on one last frame, so that scenes
         # with no play calls still display something
@@ -74,7 +134,10 @@ class Scene(Container):
         self.wait(self.frame_duration)
 
         if self.write_to_movie:
-            self.close_movie_pipe()
+            if self.write_partial_movies:
+                self.combine_partial_movies()
+            else:
+                self.close_movie_pipe()
         print("Played a total of %d animations"%self.num_plays)
 
     def setup(self):
@@ -85,6 +148,14 @@ class Scene(Container):
         """
         pass
 
+    def prefetch_tex(self):
+        for tex_mobject_args, tex_mobject_class in [
+            (self.tex_to_prefetch, TexMobject),
+            (self.text_to_prefetch, TextMobject),
+        ]:
+            if len(tex_mobject_args) > 0:
+                prefetch_tex_mobjects(tex_mobject_args, tex_mobject_class)
+
     def setup_bases(self):
         for base in self.__class__.__bases__:
             base.setup(self)
@@ -121,6 +192,7 @@ class Scene(Container):
 
     def set_camera(self, camera):
         self.camera = camera
+        self.dirty_region = None
 
     def get_frame(self):
         return np.array(self.camera.get_pixel_array())
@@ -130,12 +202,29 @@ class Scene(Container):
 
     def set_camera_pixel_array(self, pixel_array):
         self.camera.set_pixel_array(pixel_array)
+        self.dirty_region = None
+
+    def restore_camera_background(self, background):
+        """
+        Same as set_camera_pixel_array(background), except that
+        when the last frame was drawn over that very background,
+        only the region it drew in is copied back.
+        """
+        if self.dirty_region is not None and self.dirty_region[0] is background:
+            self.camera.set_pixel_array_region(background, self.dirty_region[1])
+            self.dirty_region = None
+        else:
+            self.set_camera_pixel_array(background)
 
     def set_camera_background(self, background):
         self.camera.set_background(background)
 
     def reset_camera(self):
-        self.camera.reset()
+        if len(self.background_layer_mobjects) > 0:
+            self.set_camera_pixel_array(self.get_background_layer_image())
+        else:
+            self.camera.reset()
+            self.dirty_region = None
 
     def capture_mobjects_in_camera(self, mobjects, **kwargs):
         self.camera.capture_mobjects(mobjects, **kwargs)
@@ -147,7 +236,7 @@ class Scene(Container):
         include_submobjects = True,
         dont_update_when_skipping = True,
         **kwargs):
-        if self.skip_animations and dont_update_when_skipping:
+        if dont_update_when_skipping and self.is_skipping_rendering():
             return
         if mobjects is None:
             mobjects = list_update(
@@ -155,17 +244,86 @@ class Scene(Container):
                 self.foreground_mobjects,
             )
         if background is not None:
-            self.set_camera_pixel_array(background)
+            self.restore_camera_background(background)
         else:
             self.reset_camera()
 
         kwargs["include_submobjects"] = include_submobjects
         self.capture_mobjects_in_camera(mobjects, **kwargs)
+        if background is not None and self.use_dirty_rectangles:
+            bounding_box = self.camera.get_pixel_bounding_box(mobjects, **kwargs)
+            if bounding_box is not None:
+                self.dirty_region = (background, bounding_box)
+
+    def get_static_image(self, excluded_mobjects):
+        """
+        Frame showing every mobject of the scene but those in
+        excluded_mobjects, reused from the last call when nothing
+        it shows has changed since.
+        """
+        if not self.use_static_layer_cache or self.is_skipping_rendering():
+            self.update_frame(excluded_mobjects = excluded_mobjects)
+            return self.get_frame()
+        try:
+            key = get_live_state_hash(
+                self.camera,
+                self.background_layer_version,
+                self.camera.get_mobjects_to_display(
+                    list_update(self.mobjects, self.foreground_mobjects),
+                    excluded_mobjects = excluded_mobjects,
+                ),
+            )
+        except UnhashableStateException:
+            key = None
+        if key is None:
+            self.update_frame(excluded_mobjects = excluded_mobjects)
+            static_image = self.get_frame()
+            self.static_layer_cache = None
+        elif self.static_layer_cache is not None and self.static_layer_cache[0] == key:
+            static_image = self.static_layer_cache[1]
+            self.set_camera_pixel_array(static_image)
+        else:
+            self.update_frame(excluded_mobjects = excluded_mobjects)
+            static_image = self.get_frame()
+            self.static_layer_cache = (key, static_image)
+        #Callers draw over their copy of the image
+        return np.array(static_image)
+
+    def add_background_layer(self, *mobjects):
+        """
+        Mobjects drawn beneath all others, which are rasterized only
+        once, the next time a frame is drawn, rather than for every
+        play call.  Later changes to them, or to the camera, only show
+        after a call to refresh_background_layer.  They are taken out
+        of the scene's usual list of mobjects.
+        """
+        self.remove(*mobjects)
+        self.background_layer_mobjects = list_update(
+            self.background_layer_mobjects, mobjects
+        )
+        return self.refresh_background_layer()
+
+    def refresh_background_layer(self):
+        self.background_layer_image = None
+        self.background_layer_version += 1
+        return self
+
+    def clear_background_layer(self):
+        self.background_layer_mobjects = []
+        return self.refresh_background_layer()
+
+    def get_background_layer_image(self):
+        if self.background_layer_image is None:
+            self.camera.reset()
+            self.capture_mobjects_in_camera(self.background_layer_mobjects)
+            self.background_layer_image = self.get_frame()
+        return self.background_layer_image
 
     def freeze_background(self):
         self.update_frame()
         self.set_camera(Camera(self.get_frame()))
         self.clear()
+        self.clear_background_layer()
     ###
 
     def continual_update(self, dt = None):
@@ -195,14 +353,12 @@ class Scene(Container):
         # Return only those which are not in the family
         # of another mobject from the scene
         mobjects = self.get_mobjects()
-        families = [m.submobject_family() for m in mobjects]
-        def is_top_level(mobject):
-            num_families = sum([
-                (mobject in family)
-                for family in families
-            ])
-            return num_families == 1
-        return filter(is_top_level, mobjects)
+        num_families = dict([(id(m), 0) for m in mobjects])
+        for mobject in mobjects:
+            for member in mobject.submobject_family():
+                if id(member) in num_families:
+                    num_families[id(member)] += 1
+        return filter(lambda m : num_families[id(m)] == 1, mobjects)
 
     def separate_mobjects_and_continual_animations(self, mobjects_or_continual_animations):
         mobjects = []
@@ -247,7 +403,7 @@ class Scene(Container):
             mobjects_or_continual_animations
         )
 
-        to_remove = self.camera.extract_mobject_family_members(mobjects)
+        to_remove = set(self.camera.extract_mobject_family_members(mobjects))
         for list_name in "mobjects", "foreground_mobjects":
             self.restructure_mobjects(mobjects, list_name, False)
 
@@ -277,6 +433,9 @@ class Scene(Container):
         return self
 
     def get_restructured_mobject_list(self, mobjects, to_remove):
+        to_remove = set(to_remove)
+        if to_remove.isdisjoint(self.get_family_members_index(mobjects)):
+            return list(mobjects)
         new_mobjects = []
         def add_safe_mobjects_from_list(list_to_examine, set_to_remove):
             for mob in list_to_examine:
@@ -287,9 +446,27 @@ class Scene(Container):
                     add_safe_mobjects_from_list(mob.submobjects, intersect)
                 else:
                     new_mobjects.append(mob)
-        add_safe_mobjects_from_list(mobjects, set(to_remove))
+        add_safe_mobjects_from_list(mobjects, to_remove)
         return new_mobjects
 
+    def get_family_members_index(self, mobjects):
+        """
+        Set of every member of the families of mobjects.  It is kept
+        for the next call, and only extended if mobjects have just
+        been appended to since, so long as no family has changed.
+        """
+        version = get_latest_families_version()
+        ids = map(id, mobjects)
+        index = self.family_members_index
+        if index is None or index[0] != version or index[1] != ids[:len(index[1])]:
+            #Members keep the mobjects alive, so ids are not reused
+            index = (version, [], set())
+        version, indexed_ids, members = index
+        for mobject in mobjects[len(indexed_ids):]:
+            members.update(mobject.submobject_family())
+        self.family_members_index = (version, ids, members)
+        return members
+
     def add_foreground_mobjects(self, *mobjects):
         self.foreground_mobjects = list_update(
             self.foreground_mobjects,
@@ -340,23 +517,30 @@ class Scene(Container):
         ))
         return moving_mobjects
 
-    def get_time_progression(self, run_time):
+    def get_times(self, run_time):
         if self.skip_animations:
-            times = [run_time]
-        else:
-            step = self.frame_duration
-            times = np.arange(0, run_time, step)
-        time_progression = ProgressDisplay(times)
-        return time_progression
+            return [run_time]
+        return np.arange(0, run_time, self.frame_duration)
 
-    def get_animation_time_progression(self, animations):
-        run_time = np.max([animation.run_time for animation in animations])
-        time_progression = self.get_time_progression(run_time)
-        time_progression.set_description("".join([
+    def get_time_progression(self, run_time):
+        return ProgressDisplay(self.get_times(run_time))
+
+    def get_animations_run_time(self, animations):
+        return np.max([animation.run_time for animation in animations])
+
+    def get_animation_description(self, animations):
+        return "".join([
             "Animation %d: "%self.num_plays,
             str(animations[0]),
             (", etc." if len(animations) > 1 else ""),
-        ]))
+        ])
+
+    def get_animation_time_progression(self, animations):
+        run_time = self.get_animations_run_time(animations)
+        time_progression = self.get_time_progression(run_time)
+        time_progression.set_description(
+            self.get_animation_description(animations)
+        )
         return time_progression
 
     def compile_play_args_to_animation_list(self, *args):
@@ -438,30 +622,146 @@ class Scene(Container):
             # This is where kwargs to play like run_time and rate_func
             # get applied to all animations
             animation.update_config(**kwargs)
+            animation.begin()
         moving_mobjects = self.get_moving_mobjects(*animations)
+        self.begin_movie_segment(animations)
 
         # Paint all non-moving objects onto the screen, so they don't
         # have to be rendered every frame
-        self.update_frame(excluded_mobjects = moving_mobjects)
-        static_image = self.get_frame()
-        for t in self.get_animation_time_progression(animations):
-            for animation in animations:
-                animation.update(t / animation.run_time)
-            self.continual_update()
-            self.update_frame(moving_mobjects, static_image)
-            self.add_frames(self.get_frame())
+        static_image = self.get_static_image(moving_mobjects)
+        if self.should_use_render_cache():
+            self.play_frames_with_render_cache(
+                animations, moving_mobjects, static_image
+            )
+        else:
+            self.play_frames(animations, moving_mobjects, static_image)
         self.add(*moving_mobjects)
         self.mobjects_from_last_animation = moving_mobjects
         self.clean_up_animations(*animations)
         if self.skip_animations:
-            # Todo, not great that this uses a variable from
-            # a previous loop...
-            self.continual_update(t)
+            # When skipping, the animations were only updated
+            # once, at the end of their run time
+            self.continual_update(self.get_animations_run_time(animations))
         else:
             self.continual_update(0)
+        self.end_movie_segment()
         self.num_plays += 1
         return self
 
+    def play_frames(self, animations, moving_mobjects, static_image):
+        if self.should_render_frames_in_parallel():
+            self.play_frames_in_parallel(
+                animations, moving_mobjects, static_image
+            )
+        else:
+            for t in self.get_animation_time_progression(animations):
+                for animation in animations:
+                    animation.update(t / animation.run_time)
+                self.continual_update()
+                self.update_frame(moving_mobjects, static_image)
+                self.add_frames(self.get_frame())
+        return self
+
+    def should_use_render_cache(self):
+        return all([
+            self.render_cache is not None,
+            not self.is_skipping_rendering(),
+            #Continual animations depend on more than the play itself
+            not self.should_continually_update(),
+        ])
+
+    def play_frames_with_render_cache(self, animations, moving_mobjects, static_image):
+        """
+        Replays the frames of an identical play call from a previous
+        run if the render cache has them, and otherwise renders them
+        as usual while storing them under this play's key.
+        """
+        try:
+            key = self.render_cache.get_play_key(
+                self, animations, moving_mobjects, static_image
+            )
+        except UnhashableStateException as e:
+            print("%s: Not using render cache, %s"%(
+                self.get_animation_description(animations), str(e)
+            ))
+            return self.play_frames(animations, moving_mobjects, static_image)
+        if self.render_cache.contains(key):
+            print("%s: Reusing frames from render cache"%(
+                self.get_animation_description(animations)
+            ))
+            for frame in self.render_cache.get_frames(key):
+                self.add_frames(frame)
+            #Leave animations in the state the final frame shows
+            times = self.get_times(self.get_animations_run_time(animations))
+            for animation in animations:
+                animation.update(times[-1] / animation.run_time)
+            return self
+        entry = self.render_cache.open_entry(key)
+        self.render_cache_entry = entry
+        try:
+            self.play_frames(animations, moving_mobjects, static_image)
+        except:
+            entry.discard()
+            raise
+        finally:
+            self.render_cache_entry = None
+        entry.close()
+        return self
+
+    def should_render_frames_in_parallel(self):
+        return all([
+            self.render_frames_in_parallel,
+            not self.is_skipping_rendering(),
+            not self.should_continually_update(),
+            hasattr(os, "fork"), #Workers rely on inheriting scene state
+        ])
+
+    def render_frames(self, animations, moving_mobjects, static_image, times):
+        frames = []
+        for t in times:
+            for animation in animations:
+                animation.update(t / animation.run_time)
+            self.update_frame(moving_mobjects, static_image)
+            frames.append(self.get_frame())
+        return frames
+
+    def play_frames_in_parallel(self, animations, moving_mobjects, static_image):
+        """
+        Splits the times of this play call into chunks, which a pool of
+        forked processes render from a snapshot of the current animation
+        state.  Chunks are handed back in order, so the frames reach
+        add_frames exactly as they would in the serial loop.
+        """
+        times = self.get_times(self.get_animations_run_time(animations))
+        chunk_size = self.frames_per_render_chunk
+        time_chunks = [
+            times[i:i+chunk_size]
+            for i in range(0, len(times), chunk_size)
+        ]
+        progress_display = ProgressDisplay(total = len(times))
+        progress_display.set_description(
+            self.get_animation_description(animations)
+        )
+        #Forked workers inherit this snapshot, so nothing but the
+        #times and the resulting frames has to be pickled
+        PARALLEL_RENDER_STATE["args"] = (
+            self, animations, moving_mobjects, static_image
+        )
+        pool = mp.Pool(self.num_render_processes)
+        try:
+            for frames in pool.imap(render_frames_in_worker, time_chunks):
+                self.add_frames(*frames)
+                progress_display.update(len(frames))
+            pool.close()
+        except:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+            PARALLEL_RENDER_STATE.clear()
+            progress_display.close()
+        return self
+
     def clean_up_animations(self, *animations):
         for animation in animations:
             animation.clean_up(self)
@@ -474,6 +774,7 @@ class Scene(Container):
         return []
 
     def wait(self, duration = DEFAULT_WAIT_TIME):
+        self.begin_movie_segment(duration)
         if self.should_continually_update():
             for t in self.get_time_progression(duration):
                 self.continual_update()
@@ -481,10 +782,11 @@ class Scene(Container):
                 self.add_frames(self.get_frame())
         elif self.skip_animations:
             #Do nothing
-            return self
+            pass
         else:
             self.update_frame()
             self.add_frames(*[self.get_frame()]*int(duration / self.frame_duration))
+        self.end_movie_segment()
         return self
 
     def wait_to(self, time, assert_positive = True):
@@ -512,15 +814,29 @@ class Scene(Container):
         if self.skip_animations:
             return
         self.current_scene_time += len(frames)*self.frame_duration
+        if self.is_skipping_rendering():
+            #These frames are already in a reused partial movie
+            return
+        if self.render_cache_entry is not None:
+            for frame in frames:
+                self.render_cache_entry.write(frame)
         if self.write_to_movie:
             for frame in frames:
                 if self.save_pngs:
                     self.save_image("frame" + str(self.frame_num), self.pngs_mode, True)
                     self.frame_num = self.frame_num + 1
-                self.writing_process.stdin.write(frame.tostring())
+                self.write_frame_to_movie(frame)
         if self.save_frames:
             self.saved_frames += list(frames)
 
+    def write_frame_to_movie(self, frame):
+        if self.write_partial_movies:
+            self.open_movie_segment_pipe()
+        if self.frame_writer is not None:
+            self.frame_writer.write(frame)
+        else:
+            self.writing_process.stdin.write(frame.tostring())
+
     #Display methods
 
     def show_frame(self):
@@ -569,10 +885,11 @@ class Scene(Container):
             file_path += extension
         return file_path
 
-    def open_movie_pipe(self):
-        name = str(self)
-        file_path = self.get_movie_file_path(name)
-        temp_file_path = file_path.replace(name, name + "Temp")
+    def open_movie_pipe(self, file_path = None):
+        if file_path is None:
+            file_path = self.get_movie_file_path(str(self))
+        root, extension = os.path.splitext(file_path)
+        temp_file_path = root + "Temp" + extension
         print("Writing to %s"%temp_file_path)
         self.args_to_rename_file = (temp_file_path, file_path)
 
@@ -604,8 +921,17 @@ class Scene(Container):
         command += [temp_file_path]
         # self.writing_process = sp.Popen(command, stdin=sp.PIPE, shell=True)
         self.writing_process = sp.Popen(command, stdin=sp.PIPE)
+        if self.write_frames_asynchronously:
+            self.frame_writer = FrameWriter(
+                self.writing_process.stdin,
+                **self.frame_writer_config
+            )
+        else:
+            self.frame_writer = None
 
     def close_movie_pipe(self):
+        if self.frame_writer is not None:
+            self.frame_writer.close()
         self.writing_process.stdin.close()
         self.writing_process.wait()
         if os.name == 'nt':
@@ -613,9 +939,175 @@ class Scene(Container):
         else:
             os.rename(*self.args_to_rename_file)
 
+    ## Partial movies
+
+    def is_skipping_rendering(self):
+        segment = self.current_movie_segment
+        return self.skip_animations or (
+            segment is not None and segment["reused"]
+        )
+
+    def get_partial_movie_directory(self):
+        movie_file_path = self.get_movie_file_path()
+        directory = os.path.join(
+            os.path.dirname(movie_file_path),
+            "partial_movies",
+            os.path.splitext(os.path.basename(movie_file_path))[0],
+        )
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        return directory
+
+    def get_partial_movie_manifest_path(self):
+        return os.path.join(
+            self.get_partial_movie_directory(),
+            "manifest.json"
+        )
+
+    def begin_movie_segment(self, *values):
+        """
+        Starts the partial movie for the play or wait call about to
+        happen, keyed by a hash of values together with the state of
+        the scene.  If a previous run already wrote a partial movie
+        under that key, it is reused and this segment's frames are
+        not rendered, though animations are still updated as usual.
+        """
+        if not (self.write_to_movie and self.write_partial_movies):
+            return
+        self.end_movie_segment()
+        if self.skip_animations:
+            self.rendered_whole_scene = False
+            return
+        index = len(self.partial_movie_segments)
+        try:
+            key = get_state_hash(
+                self.frame_duration,
+                self.movie_file_extension,
+                self.camera,
+                self.mobjects,
+                self.foreground_mobjects,
+                self.continual_animations,
+                values,
+            )
+        except UnhashableStateException:
+            #Such segments are rendered afresh on every run
+            key = None
+        self.start_movie_segment(index, key)
+
+    def start_movie_segment(self, index, key = None):
+        if key is None:
+            #Frames added outside of play and wait are never reused
+            file_name = "unkeyed_%05d"%index
+        else:
+            file_name = key
+        file_path = os.path.join(
+            self.get_partial_movie_directory(),
+            file_name + self.movie_file_extension
+        )
+        self.current_movie_segment = {
+            "index" : index,
+            "key" : key,
+            "file_path" : file_path,
+            "reused" : key is not None and os.path.exists(file_path),
+            "pipe_is_open" : False,
+        }
+        self.partial_movie_segments.append(self.current_movie_segment)
+
+    def open_movie_segment_pipe(self):
+        if self.current_movie_segment is None:
+            self.start_movie_segment(len(self.partial_movie_segments))
+        segment = self.current_movie_segment
+        if not segment["pipe_is_open"]:
+            self.open_movie_pipe(segment["file_path"])
+            segment["pipe_is_open"] = True
+
+    def end_movie_segment(self):
+        segment = self.current_movie_segment
+        if segment is None:
+            return
+        self.current_movie_segment = None
+        if segment["pipe_is_open"]:
+            self.close_movie_pipe()
+        elif not segment["reused"]:
+            #No frames were written
+            self.partial_movie_segments.remove(segment)
+        self.write_partial_movie_manifest()
+
+    def write_partial_movie_manifest(self):
+        manifest = {
+            "movie_file_path" : self.get_movie_file_path(),
+            "segments" : [
+                {
+                    "index" : segment["index"],
+                    "key" : segment["key"],
+                    "file" : os.path.basename(segment["file_path"]),
+                }
+                for segment in self.partial_movie_segments
+            ],
+        }
+        with open(self.get_partial_movie_manifest_path(), "w") as fp:
+            json.dump(manifest, fp, indent = 4)
+
+    def combine_partial_movies(self):
+        """
+        Stitches the partial movies of this run together with ffmpeg's
+        concat demuxer, without re-encoding.  Once a run has rendered
+        the whole scene, the partial movies none of its segments refer
+        to are deleted.  Runs which skipped some plays, like those
+        started with -n, leave them be, as the plays they skipped
+        may still need them.
+        """
+        self.end_movie_segment()
+        directory = self.get_partial_movie_directory()
+        file_paths = [
+            segment["file_path"]
+            for segment in self.partial_movie_segments
+        ]
+        if self.rendered_whole_scene:
+            self.remove_unused_partial_movies(file_paths)
+        if len(file_paths) == 0:
+            return
+        list_file_path = os.path.join(directory, "partial_movie_file_list.txt")
+        with open(list_file_path, "w") as fp:
+            for file_path in file_paths:
+                fp.write("file '%s'\n"%file_path.replace("'", "'\\''"))
+        movie_file_path = self.get_movie_file_path()
+        print("Combining %d partial movies into %s"%(
+            len(file_paths), movie_file_path
+        ))
+        command = [
+            FFMPEG_BIN,
+            '-y', # overwrite output file if it exists
+            '-f', 'concat',
+            '-safe', '0',
+            '-i', list_file_path,
+            '-c', 'copy',
+            '-loglevel', 'error',
+            movie_file_path,
+        ]
+        sp.check_call(command)
+
+    def remove_unused_partial_movies(self, used_file_paths):
+        directory = self.get_partial_movie_directory()
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.endswith(self.movie_file_extension) and path not in used_file_paths:
+                os.remove(path)
+
 class EndSceneEarlyException(Exception):
     pass
 
+# Populated by Scene.play_frames_in_parallel just before forking
+# its pool of workers
+PARALLEL_RENDER_STATE = {}
+
+def render_frames_in_worker(times):
+    scene, animations, moving_mobjects, static_image = \
+        PARALLEL_RENDER_STATE["args"]
+    return scene.render_frames(
+        animations, moving_mobjects, static_image, times
+    )
+
 
 
 
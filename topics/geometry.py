@@ -597,9 +597,6 @@ class Arrow(Line):
             self.set_rectangular_stem_points()
         return self
 
-    def copy(self):
-        return self.deepcopy()
-
 class Vector(Arrow):
     CONFIG = {
         "color" : YELLOW,
@@ -1,12 +1,80 @@
 
 from mobject.vectorized_mobject import VMobject, VGroup, VectorizedPoint
-from mobject.tex_mobject import TexMobject
+from mobject.tex_mobject import TexMobject, prefetch_tex_mobjects
 from animation import Animation
 from animation.continual_animation import ContinualAnimation
 from topics.geometry import BackgroundRectangle
 from scene import Scene
 from helpers import *
 
+#Characters of formatted numbers, compiled together the first
+#time any glyph of a given configuration is needed
+DECIMAL_CHARACTERS = list("0123456789.-+i")
+
+#Maps a tex string and TexMobject configuration to a TexMobject,
+#which is only ever handed out as copies
+GLYPH_ATLAS = {}
+
+def get_glyph_key(tex, tex_config):
+    return (tex, tuple(sorted([
+        (key, repr(value))
+        for key, value in tex_config.items()
+    ])))
+
+def get_glyphs(texs, **tex_config):
+    """
+    Same as [TexMobject(tex, **tex_config) for tex in texs], except
+    that each glyph is built only once, and afterwards copied.
+    """
+    missing = [
+        tex for tex in texs
+        if get_glyph_key(tex, tex_config) not in GLYPH_ATLAS
+    ]
+    if len(missing) > 0:
+        prefetch_tex_mobjects(
+            list(set(missing + DECIMAL_CHARACTERS)), **tex_config
+        )
+    result = []
+    for tex in texs:
+        key = get_glyph_key(tex, tex_config)
+        if key not in GLYPH_ATLAS:
+            GLYPH_ATLAS[key] = TexMobject(tex, **tex_config)
+        result.append(GLYPH_ATLAS[key].copy())
+    return result
+
+def get_glyph(tex, **tex_config):
+    return get_glyphs([tex], **tex_config)[0]
+
+def become_in_place(mobject, target):
+    """
+    Gives mobject the points and style of target, reusing every member
+    of its family which matches the corresponding member of target's
+    family in class and tex string.  The others are replaced by those
+    of target.
+    """
+    mobject.points = target.points
+    for attr in "stroke_rgb", "stroke_width", "fill_rgb", "fill_opacity":
+        if hasattr(target, attr):
+            setattr(mobject, attr, getattr(target, attr))
+    submobjects = list(mobject.submobjects)
+    new_submobjects = []
+    for i, target_submob in enumerate(target.submobjects):
+        if i < len(submobjects) and is_same_glyph(submobjects[i], target_submob):
+            become_in_place(submobjects[i], target_submob)
+            new_submobjects.append(submobjects[i])
+        else:
+            new_submobjects.append(target_submob)
+    if map(id, new_submobjects) != map(id, submobjects):
+        mobject.submobjects[:] = new_submobjects
+    return mobject
+
+def is_same_glyph(mobject1, mobject2):
+    return all([
+        mobject1.__class__ is mobject2.__class__,
+        getattr(mobject1, "tex_string", None) == getattr(mobject2, "tex_string", None),
+        len(mobject1.submobjects) == len(mobject2.submobjects),
+    ])
+
 class DecimalNumber(VMobject):
     CONFIG = {
         "num_decimal_points" : 2,
@@ -14,6 +82,8 @@ class DecimalNumber(VMobject):
         "show_ellipsis" : False,
         "unit" : None, #Aligned to bottom unless it starts with "^"
         "include_background_rectangle" : False,
+        #ChangingDecimal rebuilds numbers from their initial_config
+        "track_initial_config" : True,
     }
     def __init__(self, number, **kwargs):
         VMobject.__init__(self, **kwargs)
@@ -32,14 +102,11 @@ class DecimalNumber(VMobject):
             negative_zero_string = "-%.*f"%(ndp, 0.)
             if num_string == negative_zero_string:
                 num_string = num_string[1:]
-        self.add(*[
-            TexMobject(char, **kwargs)
-            for char in num_string
-        ])
+        self.add(*get_glyphs(list(num_string), **kwargs))
 
         #Add non-numerical bits
         if self.show_ellipsis:
-            self.add(TexMobject("\\dots"))
+            self.add(get_glyph("\\dots"))
 
 
         if num_string.startswith("-"):
@@ -50,7 +117,7 @@ class DecimalNumber(VMobject):
             )
 
         if self.unit != None:
-            self.unit_sign = TexMobject(self.unit)
+            self.unit_sign = get_glyph(self.unit)
             self.add(self.unit_sign)
 
         self.arrange_submobjects(
@@ -122,7 +189,9 @@ class ChangingDecimal(Animation):
         new_decimal.move_to(decimal)
         new_decimal.match_style(decimal)
 
-        decimal.submobjects = new_decimal.submobjects
+        #Glyphs which did not change are kept, rather than
+        #reallocating the whole family every frame
+        become_in_place(decimal, new_decimal)
         decimal.number = new_number
 
     def update_position(self):
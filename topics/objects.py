@@ -363,6 +363,11 @@ class ClockPassesTime(Animation):
         )
         Animation.__init__(self, clock, **kwargs)
 
+    def init_starting_state(self):
+        for rotation in self.hour_rotation, self.minute_rotation:
+            rotation.begin()
+        Animation.init_starting_state(self)
+
     def update_mobject(self, alpha):
         for rotation in self.hour_rotation, self.minute_rotation:
             rotation.update_mobject(alpha)
@@ -571,7 +576,7 @@ class MoveCar(ApplyMethod):
     }
     def __init__(self, car, target_point, **kwargs):
         ApplyMethod.__init__(self, car.move_to, target_point, **kwargs)
-        displacement = self.target_mobject.get_right()-self.starting_mobject.get_right()
+        displacement = self.target_mobject.get_right()-car.get_right()
         distance = np.linalg.norm(displacement)
         if not self.moving_forward:
             distance *= -1
@@ -36,6 +36,9 @@ class ThreeDCamera(CameraWithPerspective):
     def __init__(self, *args, **kwargs):
         Camera.__init__(self, *args, **kwargs)
         self.unit_sun_vect = self.sun_vect/np.linalg.norm(self.sun_vect)
+        #Colors of the faces being drawn, filled in for the duration
+        #of display_multiple_vectorized_mobjects
+        self.shaded_face_rgbs = {}
         ## rotation_mobject lives in the phi-theta-distance space
         self.rotation_mobject = VectorizedPoint()
         ## moving_center lives in the x-y-z space
@@ -50,9 +53,13 @@ class ThreeDCamera(CameraWithPerspective):
             return rgb
 
     def get_stroke_rgb(self, vmobject):
+        if id(vmobject) in self.shaded_face_rgbs:
+            return self.shaded_face_rgbs[id(vmobject)][0]
         return self.modified_rgb(vmobject, vmobject.get_stroke_rgb())
 
     def get_fill_rgb(self, vmobject):
+        if id(vmobject) in self.shaded_face_rgbs:
+            return self.shaded_face_rgbs[id(vmobject)][1]
         return self.modified_rgb(vmobject, vmobject.get_fill_rgb())
 
     def get_shaded_rgb(self, rgb, normal_vect):
@@ -64,6 +71,16 @@ class ThreeDCamera(CameraWithPerspective):
             alpha = -self.shading_factor*brightness
             return interpolate(rgb, np.zeros(3), alpha)
 
+    def get_shaded_rgbs(self, rgbs, unit_normals):
+        """
+        get_shaded_rgb for arrays of rgbs and normals at once.  As
+        brightness is a square, it never darkens, so only the first
+        case of get_shaded_rgb applies.
+        """
+        brightness = np.dot(unit_normals, self.unit_sun_vect)**2
+        alphas = (self.shading_factor*brightness)[:, np.newaxis]
+        return interpolate(rgbs, np.ones(3), alphas)
+
     def get_unit_normal_vect(self, vmobject):
         anchors = vmobject.get_anchors()
         if len(anchors) < 3:
@@ -76,30 +93,77 @@ class ThreeDCamera(CameraWithPerspective):
             return OUT
         return normal/length
 
+    def get_face_centers_and_unit_normals(self, faces):
+        """
+        Centers and unit normals of a list of vmobjects with points,
+        as given by get_center and get_unit_normal_vect, computed
+        for all of them from one array of their anchors.
+        """
+        anchors_list = [face.get_anchors() for face in faces]
+        num_anchors = np.array(map(len, anchors_list))
+        starts = np.cumsum(num_anchors) - num_anchors
+        anchors = np.concatenate(anchors_list)
+
+        centers = (
+            np.maximum.reduceat(anchors, starts) + \
+            np.minimum.reduceat(anchors, starts)
+        )/2
+        #Bounding boxes also cover submobjects, so the few
+        #faces which have any are left to get_center
+        for index, face in enumerate(faces):
+            if len(face.submobjects) > 0:
+                centers[index] = face.get_center()
+
+        unit_normals = np.repeat([OUT], len(faces), axis = 0).astype('float')
+        has_normal = num_anchors >= 3
+        firsts = anchors[starts[has_normal]]
+        seconds = anchors[starts[has_normal]+1]
+        thirds = anchors[starts[has_normal]+2]
+        normals = np.cross(seconds - firsts, thirds - seconds)
+        normals[normals[:,2] < 0] *= -1
+        lengths = np.sqrt((normals**2).sum(1))
+        nonzero = lengths > 0
+        normals[nonzero] /= lengths[nonzero, np.newaxis]
+        normals[~nonzero] = OUT
+        unit_normals[has_normal] = normals
+        return centers, unit_normals
+
     def display_multiple_vectorized_mobjects(self, vmobjects):
-        camera_point = self.spherical_coords_to_point(
-            *self.get_spherical_coords()
-        )
-        def z_cmp(*vmobs):
-            # Compare to three dimensional mobjects based on 
-            # how close they are to the camera
-            # return cmp(*[
-            #     -np.linalg.norm(vm.get_center()-camera_point)
-            #     for vm in vmobs
-            # ])
-            three_d_status = map(should_shade_in_3d, vmobs)
-            has_points = [vm.get_num_points() > 0 for vm in vmobs]
-            if all(three_d_status) and all(has_points):
-                cmp_vect = self.get_unit_normal_vect(vmobs[1])
-                return cmp(*[
-                    np.dot(vm.get_center(), cmp_vect)
-                    for vm in vmobs
-                ])
-            else:
-                return 0
-        Camera.display_multiple_vectorized_mobjects(
-            self, sorted(vmobjects, cmp = z_cmp)
-        )
+        """
+        Vmobjects shaded in 3d are drawn back to front, ordered by
+        the depth of their centers along the viewing direction, in
+        the slots they already occupy among vmobjects.  Everything
+        else is drawn in the order given.  Depths and shaded colors
+        of all faces are computed together before drawing.
+        """
+        vmobjects = list(vmobjects)
+        face_indices = [
+            index
+            for index, vm in enumerate(vmobjects)
+            if should_shade_in_3d(vm) and vm.get_num_points() > 0
+        ]
+        if len(face_indices) > 0:
+            faces = [vmobjects[index] for index in face_indices]
+            centers, unit_normals = self.get_face_centers_and_unit_normals(faces)
+            #Third row of the view transformation points towards the camera
+            view_vect = self.get_view_transformation_matrix()[2]
+            order = np.argsort(np.dot(centers, view_vect), kind = "mergesort")
+            for index, face_index in zip(face_indices, order):
+                vmobjects[index] = faces[face_index]
+            stroke_rgbs = self.get_shaded_rgbs(
+                np.array([face.get_stroke_rgb() for face in faces]), unit_normals
+            )
+            fill_rgbs = self.get_shaded_rgbs(
+                np.array([face.get_fill_rgb() for face in faces]), unit_normals
+            )
+            self.shaded_face_rgbs = dict([
+                (id(face), (stroke_rgb, fill_rgb))
+                for face, stroke_rgb, fill_rgb in zip(faces, stroke_rgbs, fill_rgbs)
+            ])
+        try:
+            Camera.display_multiple_vectorized_mobjects(self, vmobjects)
+        finally:
+            self.shaded_face_rgbs = {}
 
     def get_spherical_coords(self, phi = None, theta = None, distance = None):
         curr_phi, curr_theta, curr_d = self.rotation_mobject.points[0]
@@ -156,6 +220,9 @@ class ThreeDCamera(CameraWithPerspective):
             rotation_about_z(-self.get_theta() - np.pi/2),
         )
 
+    def get_point_depths(self, points):
+        return np.dot(points, self.get_view_transformation_matrix()[2])
+
     def points_to_pixel_coords(self, points):
         matrix = self.get_view_transformation_matrix()
         new_points = np.dot(points, matrix.T)